@@ -38,7 +38,16 @@ from paderbox.io.yaml_module import (
     dumps_yaml_unsafe,
 )
 from paderbox.io.csv_module import load_csv, loads_csv
-from paderbox.io.audioread import load_audio, recursive_load_audio
+from paderbox.io.audioread import (
+    load_audio,
+    recursive_load_audio,
+    iter_audio_blocks,
+)
+from paderbox.io.audio_index import AudioIndex, set_audio_index
+from paderbox.io.audio_handle_pool import (
+    AudioHandlePool,
+    set_audio_handle_pool,
+)
 from paderbox.io.audiowrite import dump_audio, dumps_audio
 from paderbox.io.file_handling import (
     mkdir_p,
@@ -51,6 +60,11 @@ from .wrapper_dump import dump
 __all__ = [
     "load_audio",
     "recursive_load_audio",
+    "iter_audio_blocks",
+    "AudioIndex",
+    "set_audio_index",
+    "AudioHandlePool",
+    "set_audio_handle_pool",
     "dump_audio",
     "dumps_audio",
     "load_json",
@@ -0,0 +1,222 @@
+"""
+Pool of open soundfile handles, so that repeated partial reads of the same
+file (e.g. `load_audio('session.wav::[a:b]')` for many segments of a
+meeting) do not open the file and parse the header on each call.
+
+The pool is opt-in. When a pool is registered with `set_audio_handle_pool`
+(or the context manager `audio_handle_pool`), `load_audio` uses it:
+
+>>> import tempfile
+>>> import numpy as np
+>>> from pathlib import Path
+>>> from paderbox.io import dump_audio, load_audio
+>>> tmp_dir = tempfile.TemporaryDirectory()
+>>> file = Path(tmp_dir.name) / 'session.wav'
+>>> dump_audio(np.zeros(16000), file, normalize=False)
+>>> with audio_handle_pool(maxsize=8) as pool:
+...     for start in range(0, 16000, 1000):
+...         _ = load_audio(f'{file}::[{start}:{start + 1000}]')
+...     pool.stats()
+{'hits': 15, 'misses': 1, 'evictions': 0, 'idle': 1}
+>>> tmp_dir.cleanup()
+
+Note: A handle keeps reading the file, that was opened. When a file is
+rewritten, call `close` to drop the idle handles.
+"""
+import collections
+import contextlib
+import os
+import threading
+import weakref
+
+import soundfile
+
+
+__all__ = [
+    'AudioHandlePool',
+    'get_audio_handle_pool',
+    'set_audio_handle_pool',
+    'audio_handle_pool',
+]
+
+
+class AudioHandlePool:
+    def __init__(self, maxsize=32):
+        """Bounded LRU pool of open `soundfile.SoundFile` objects.
+
+        A handle is removed from the pool while it is used, hence each
+        handle is used by only one thread at a time. When several threads
+        read the same file concurrently, each gets its own handle.
+        After a fork, the child process closes its copies of the idle
+        handles (they share the file offset with the parent) and starts
+        with a new lock and fresh stats, even when another thread of the
+        parent held the lock during the fork.
+
+        Args:
+            maxsize: Maximum number of idle handles. The least recently used
+                handles are closed, when the pool is full.
+
+        >>> pool = AudioHandlePool(maxsize=2)
+        >>> pool
+        AudioHandlePool(maxsize=2)
+        >>> pool.stats()
+        {'hits': 0, 'misses': 0, 'evictions': 0, 'idle': 0}
+        """
+        self.maxsize = maxsize
+        self._reset()
+        _POOLS.add(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(maxsize={self.maxsize})'
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._idle = collections.OrderedDict()  # path -> [SoundFile, ...]
+        self._num_idle = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _after_fork_in_child(self):
+        # Only the forking thread exists in the child, i.e. the lock is not
+        # released, when another thread held it during the fork.
+        idle = self._idle
+        self._reset()
+        for handles in idle.values():
+            for f in handles:
+                # Closes only the file descriptor of the child.
+                f.close()
+
+    def _acquire(self, path):
+        with self._lock:
+            handles = self._idle.get(path)
+            if handles:
+                f = handles.pop()
+                self._num_idle -= 1
+                if not handles:
+                    del self._idle[path]
+                self._hits += 1
+                return f
+            self._misses += 1
+        return soundfile.SoundFile(path, 'r')
+
+    def _release(self, path, f):
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(path, []).append(f)
+            self._idle.move_to_end(path)
+            self._num_idle += 1
+            while self._num_idle > self.maxsize:
+                oldest, handles = next(iter(self._idle.items()))
+                evicted.append(handles.pop(0))
+                if not handles:
+                    del self._idle[oldest]
+                self._num_idle -= 1
+                self._evictions += 1
+        for handle in evicted:
+            handle.close()
+
+    @contextlib.contextmanager
+    def open(self, path):
+        """Yields an open `soundfile.SoundFile` for path (reading only).
+
+        The position of the handle is undefined, i.e. seek before reading.
+        When the block raises an exception, the handle is closed instead of
+        returned to the pool.
+        """
+        path = os.fspath(path)
+        f = self._acquire(path)
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            raise
+        else:
+            self._release(path, f)
+
+    def stats(self):
+        """Number of reused handles (hits), opened files (misses), closed
+        handles because the pool was full (evictions) and idle handles."""
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'idle': self._num_idle,
+            }
+
+    def close(self):
+        """Closes all idle handles. Handles that are in use at the moment
+        are returned to the pool, when they are released."""
+        with self._lock:
+            idle, self._idle = self._idle, collections.OrderedDict()
+            self._num_idle = 0
+        for handles in idle.values():
+            for f in handles:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# All pools, to reset them in a forked child process.
+_POOLS = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    for pool in list(_POOLS):
+        pool._after_fork_in_child()
+
+
+if hasattr(os, 'register_at_fork'):  # Not available on Windows
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+_AUDIO_HANDLE_POOL = None
+
+
+def get_audio_handle_pool():
+    """Returns the AudioHandlePool that is currently used or None."""
+    return _AUDIO_HANDLE_POOL
+
+
+def set_audio_handle_pool(pool):
+    """Sets the AudioHandlePool, that `load_audio` uses in this process.
+
+    Args:
+        pool: AudioHandlePool or None to disable the pool.
+
+    Returns:
+        The previous pool.
+    """
+    global _AUDIO_HANDLE_POOL
+    previous, _AUDIO_HANDLE_POOL = _AUDIO_HANDLE_POOL, pool
+    return previous
+
+
+@contextlib.contextmanager
+def audio_handle_pool(maxsize=32):
+    """Context manager, that temporarily uses a new AudioHandlePool and
+    closes it at the end.
+
+    Note: The pool is a process wide setting, i.e. it affects also other
+    threads.
+    """
+    pool = AudioHandlePool(maxsize)
+    previous = set_audio_handle_pool(pool)
+    try:
+        yield pool
+    finally:
+        set_audio_handle_pool(previous)
+        pool.close()
+
+
+def _open_sound_file(path):
+    """Context manager for a SoundFile from the registered pool or a new
+    SoundFile."""
+    if _AUDIO_HANDLE_POOL is not None and isinstance(path, str):
+        return _AUDIO_HANDLE_POOL.open(path)
+    return soundfile.SoundFile(path, 'r')
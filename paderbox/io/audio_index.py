@@ -0,0 +1,393 @@
+"""
+Persistent index of audio metadata (number of frames, channels and sample
+rate).
+
+Reading the length of many audio files (e.g. to sort them by duration) opens
+each file with libsndfile, which is slow on network filesystems.
+`AudioIndex` stores the metadata in an SQLite database, keyed by the path and
+validated with the size and modification time of the file. Missing entries
+are read with a header-only WAV/FLAC parser (libsndfile as fallback).
+
+When an index is registered with `set_audio_index` (or the context manager
+`audio_index`), `audio_length`, `audio_channels`, `audio_shape` and
+`load_audio(..., unit='seconds')` use it transparently:
+
+>>> import tempfile
+>>> import numpy as np
+>>> from paderbox.io import dump_audio, load_audio
+>>> from paderbox.io.audioread import audio_length
+>>> tmp_dir = tempfile.TemporaryDirectory()
+>>> file = Path(tmp_dir.name) / 'audio.wav'
+>>> dump_audio(np.zeros((2, 8000)), file, normalize=False)
+>>> with audio_index(Path(tmp_dir.name) / 'index.sqlite') as index:
+...     index.update([file])
+...     audio_length(file, unit='seconds')
+1
+0.5
+>>> tmp_dir.cleanup()
+"""
+import concurrent.futures
+import contextlib
+import os
+import sqlite3
+import struct
+import threading
+import typing
+import weakref
+from pathlib import Path
+
+import soundfile
+
+
+__all__ = [
+    'AudioInfo',
+    'AudioIndex',
+    'read_audio_info',
+    'get_audio_index',
+    'set_audio_index',
+    'audio_index',
+]
+
+
+class AudioInfo(typing.NamedTuple):
+    frames: int
+    channels: int
+    sample_rate: int
+
+
+class _WavHeader(typing.NamedTuple):
+    format_tag: int  # 1: PCM, 3: IEEE float
+    channels: int
+    sample_rate: int
+    bits: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frames(self):
+        return self.data_size // (self.channels * self.bits // 8)
+
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _read_wav_header(fd, file_size):
+    """Parses the RIFF chunks of a PCM or float WAV file up to the data chunk.
+
+    Returns None for everything that is not a plain PCM or float WAV file
+    (e.g. RF64, compressed formats or an inconsistent data chunk size), so
+    that the caller can fall back to libsndfile.
+    """
+    riff = fd.read(12)
+    if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:] != b'WAVE':
+        return None
+    fmt = None
+    offset = 12
+    while True:
+        fd.seek(offset)
+        chunk = fd.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            if chunk_size < 16:
+                return None
+            body = fd.read(min(chunk_size, 40))
+            format_tag, channels, sample_rate, _, block_align, bits = \
+                struct.unpack('<HHIIHH', body[:16])
+            if format_tag == _WAVE_FORMAT_EXTENSIBLE:
+                if len(body) < 40:
+                    return None
+                # The first two bytes of the SubFormat GUID are the format.
+                format_tag, = struct.unpack('<H', body[24:26])
+            if (
+                    format_tag not in (
+                        _WAVE_FORMAT_PCM, _WAVE_FORMAT_IEEE_FLOAT)
+                    or bits not in (8, 16, 24, 32, 64)
+                    or channels == 0
+                    or block_align != channels * bits // 8
+            ):
+                return None
+            fmt = format_tag, channels, sample_rate, bits
+        elif chunk_id == b'data':
+            data_offset = offset + 8
+            if (
+                    fmt is None
+                    or chunk_size == 0
+                    or chunk_size > file_size - data_offset
+            ):
+                return None
+            return _WavHeader(*fmt, data_offset, chunk_size)
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+
+def _read_flac_info(fd):
+    """Reads the STREAMINFO block, that is always the first metadata block.
+
+    Returns None when the number of samples is unknown.
+    """
+    head = fd.read(42)
+    if len(head) < 42 or head[:4] != b'fLaC' or head[4] & 0x7F != 0:
+        return None
+    # 20 bits sample rate, 3 bits channels - 1, 5 bits bits per sample - 1
+    # and 36 bits total samples.
+    packed = int.from_bytes(head[18:26], 'big')
+    frames = packed & (2 ** 36 - 1)
+    if frames == 0:
+        return None
+    return AudioInfo(frames, ((packed >> 41) & 7) + 1, packed >> 44)
+
+
+def read_audio_info(path):
+    """Reads the number of frames, channels and the sample rate of an audio
+    file.
+
+    WAV and FLAC files are parsed from the header without libsndfile, all
+    other files (and unusual headers) are opened with libsndfile.
+
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from paderbox.io import dump_audio
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     file = Path(tmp_dir) / 'audio.flac'
+    ...     dump_audio(
+    ...         np.zeros((3, 1234)), file, sample_rate=8000, normalize=False)
+    ...     read_audio_info(file)
+    AudioInfo(frames=1234, channels=3, sample_rate=8000)
+    """
+    path = os.fspath(path)
+    with open(path, 'rb') as fd:
+        magic = fd.read(4)
+        fd.seek(0)
+        if magic == b'RIFF':
+            header = _read_wav_header(fd, os.fstat(fd.fileno()).st_size)
+            if header is not None:
+                return AudioInfo(
+                    header.frames, header.channels, header.sample_rate)
+        elif magic == b'fLaC':
+            info = _read_flac_info(fd)
+            if info is not None:
+                return info
+    with soundfile.SoundFile(path) as f:
+        return AudioInfo(len(f), f.channels, f.samplerate)
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class AudioIndex:
+    def __init__(self, database=':memory:'):
+        """Metadata index for audio files, stored in an SQLite database.
+
+        The entries are keyed by the absolute path. An entry is only used,
+        when size and modification time of the file match, otherwise the
+        metadata is read again.
+
+        The index can be shared between threads and processes (SQLite
+        handles the locking). A forked process opens its own connection and
+        gets a new lock, the connection of the parent is never used or
+        closed in the child.
+
+        Args:
+            database: Path of the SQLite file. The default ':memory:' keeps
+                the index only for the lifetime of this object.
+
+        >>> import tempfile
+        >>> import numpy as np
+        >>> from paderbox.io import dump_audio
+        >>> tmp_dir = tempfile.TemporaryDirectory()
+        >>> files = [Path(tmp_dir.name) / f'{i}.wav' for i in range(3)]
+        >>> for i, file in enumerate(files):
+        ...     dump_audio(np.zeros(100 * (i + 1)), file, normalize=False)
+        >>> index = AudioIndex()
+        >>> index.update(files)
+        3
+        >>> index.update(files)  # Nothing to read
+        0
+        >>> index.info(files[1])
+        AudioInfo(frames=200, channels=1, sample_rate=16000)
+        >>> len(index)
+        3
+        >>> index.close()
+        >>> tmp_dir.cleanup()
+        """
+        if database != ':memory:':
+            database = os.fspath(database)
+        self.database = database
+        self._lock = threading.Lock()
+        self._connection = None
+        _INDEXES.add(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.database!r})'
+
+    def _after_fork_in_child(self):
+        # Only the forking thread exists in the child, i.e. the lock is not
+        # released, when another thread held it during the fork.
+        self._lock = threading.Lock()
+        if self._connection is not None:
+            # Closing (or garbage collecting) the connection of the parent
+            # could roll back a transaction of the parent.
+            _PARENT_CONNECTIONS.append(self._connection)
+            self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.database, timeout=60, check_same_thread=False)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS audio ('
+                'path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, '
+                'frames INTEGER, channels INTEGER, sample_rate INTEGER)'
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _get(self, path, key):
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT size, mtime, frames, channels, sample_rate '
+                'FROM audio WHERE path = ?', (path,)
+            ).fetchone()
+        if row is None or tuple(row[:2]) != key:
+            return None
+        return AudioInfo(*row[2:])
+
+    def _put(self, rows):
+        with self._lock:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO audio VALUES (?, ?, ?, ?, ?, ?)',
+                    rows,
+                )
+
+    def info(self, path):
+        """Returns the AudioInfo of path, reads and stores it if necessary.
+        """
+        path = os.path.abspath(os.fspath(path))
+        key = _stat(path)
+        info = self._get(path, key)
+        if info is None:
+            info = read_audio_info(path)
+            self._put([(path, *key, *info)])
+        return info
+
+    def update(self, paths, workers=8):
+        """Adds the metadata of all paths, that are missing or outdated.
+
+        The files are read in parallel with a thread pool, file access
+        releases the GIL.
+
+        Args:
+            paths: Iterable of audio files.
+            workers: Number of threads.
+
+        Returns:
+            The number of files that were read.
+        """
+        paths = list(dict.fromkeys(
+            os.path.abspath(os.fspath(path)) for path in paths))
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            keys = list(executor.map(_stat, paths))
+            missing = [
+                (path, key) for path, key in zip(paths, keys)
+                if self._get(path, key) is None
+            ]
+            infos = executor.map(read_audio_info, [p for p, _ in missing])
+            self._put([
+                (path, *key, *info)
+                for (path, key), info in zip(missing, infos)
+            ])
+        return len(missing)
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM audio').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# All indexes, to reset them in a forked child process.
+_INDEXES = weakref.WeakSet()
+# Connections of the parent process, that are kept alive in a child process.
+_PARENT_CONNECTIONS = []
+
+
+def _after_fork_in_child():
+    for index in list(_INDEXES):
+        index._after_fork_in_child()
+
+
+if hasattr(os, 'register_at_fork'):  # Not available on Windows
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+_AUDIO_INDEX = None
+
+
+def get_audio_index():
+    """Returns the AudioIndex that is currently used or None."""
+    return _AUDIO_INDEX
+
+
+def set_audio_index(index):
+    """Sets the AudioIndex for this process.
+
+    Args:
+        index: AudioIndex, path of an SQLite database or None to disable the
+            index.
+
+    Returns:
+        The previous index.
+    """
+    global _AUDIO_INDEX
+    if isinstance(index, (str, Path)):
+        index = AudioIndex(index)
+    previous, _AUDIO_INDEX = _AUDIO_INDEX, index
+    return previous
+
+
+@contextlib.contextmanager
+def audio_index(index=':memory:'):
+    """Context manager to temporarily use an AudioIndex.
+
+    Note: The index is a process wide setting, i.e. it affects also other
+    threads. An index that is created from a path is closed at the end.
+
+    Args:
+        index: See set_audio_index.
+    """
+    previous = set_audio_index(index)
+    try:
+        yield get_audio_index()
+    finally:
+        current = set_audio_index(previous)
+        if current is not index and current is not None:
+            current.close()
+
+
+def _audio_info(path):
+    """AudioInfo from the registered index or from libsndfile."""
+    if _AUDIO_INDEX is not None and isinstance(path, (str, Path)):
+        return _AUDIO_INDEX.info(path)
+    if isinstance(path, Path):
+        path = str(path)
+    with soundfile.SoundFile(path) as f:
+        return AudioInfo(len(f), f.channels, f.samplerate)
@@ -15,6 +15,8 @@ import soundfile
 
 import paderbox.utils.process_caller as pc
 from paderbox.io.path_utils import normalize_path
+from paderbox.io.audio_index import _audio_info, _read_wav_header
+from paderbox.io.audio_handle_pool import _open_sound_file
 
 UTILS_DIR = os.path.join(os.path.dirname(__file__), 'utils')
 
@@ -31,6 +33,7 @@ def load_audio(
         expected_sample_rate=None,
         unit='samples',
         return_sample_rate=False,
+        mmap=False,
 ):
     """
     WIP will deprecate audioread in the future
@@ -93,7 +96,9 @@ def load_audio(
             ``np.array([42.6], dtype='float32')``, you will read
             ``np.array([43], dtype='int32')`` for ``dtype='int32'``.
     unit: 'samples' or 'seconds'
-        The unit of `start`, `stop` and `frames` values
+        The unit of `start`, `stop` and `frames` values. For 'seconds' the
+        sample rate is taken from the registered `AudioIndex`, if any
+        (see `paderbox.io.audio_index.set_audio_index`).
     expected_sample_rate: int, optional
         The expected sample rate of the loaded audio file. This function raises
         a ValueError when the sample rate of the file differs from
@@ -104,6 +109,14 @@ def load_audio(
         `fill_value` is not specified, a smaller array is returned.
     return_sample_rate: bool
         Whether to return the sample rate as a second element
+    mmap: bool
+        Whether to memory map PCM (16 or 32 bit) and float WAV files instead
+        of decoding them with soundfile. The requested samples and channels
+        are a strided view on the file, only this region is converted to
+        `dtype`. When `dtype` is None or matches the file, the returned
+        array is a read-only `np.memmap` view without any copy.
+        Other files, other conversions and `fill_value` fall back to
+        soundfile.
 
     Returns
     -------
@@ -192,9 +205,7 @@ def load_audio(
         if stop is not None:
             if stop < 0:
                 raise NotImplementedError(unit, stop)
-        with soundfile.SoundFile(path) as f:
-            # total_samples = len(f)
-            samplerate = f.samplerate
+        samplerate = _audio_info(path).sample_rate
         start = int(np.round(start * samplerate))
         if frames > 0:
             frames = int(np.round(frames * samplerate))
@@ -203,8 +214,17 @@ def load_audio(
     else:
         raise ValueError(unit)
 
+    mapped = None
+    if mmap and isinstance(path, str) and fill_value is None:
+        mapped = _load_wav_mmap(
+            path, frames=frames, start=start, stop=stop, channel=channel,
+            dtype=dtype,
+        )
+
     try:
-        if isinstance(path, (str, Path)) and (Path(path).suffix == '.m4a'):
+        if mapped is not None:
+            signal, sample_rate = mapped
+        elif isinstance(path, (str, Path)) and (Path(path).suffix == '.m4a'):
             import audioread
             assert (start == 0 and stop is None), \
                 'audioread does not support partial loading of audio files'
@@ -219,10 +239,8 @@ def load_audio(
                         np.frombuffer(buf, "<i2").astype(np.float64) * scale)
                 signal = np.concatenate(data)
         else:
-            with soundfile.SoundFile(
-                    path,
-                    'r',
-            ) as f:
+            # Reuses an open file, when an AudioHandlePool is registered.
+            with _open_sound_file(path) as f:
                 if dtype is None:
                     from paderbox.utils.mapping import Dispatcher
                     mapping = Dispatcher({
@@ -264,22 +282,82 @@ def load_audio(
                 f'audiofile has {sample_rate!r}'
             )
 
-    # When signal is multichannel, then soundfile returns (samples, channels)
-    # At NT it is more common to have the shape (channels, samples)
-    # => transpose
-    signal = signal.T
+    # _load_wav_mmap already returns (channels, samples) and selects the
+    # channels.
+    if mapped is None:
+        # When signal is multichannel, then soundfile returns
+        # (samples, channels). At NT it is more common to have the shape
+        # (channels, samples) => transpose
+        signal = signal.T
+
+        # Slice along channel dimension if channel_slice is given
+        if channel is not None:
+            assert signal.ndim == 2, (signal.shape, channel)
+            signal = signal[channel, ]
+            if signal.size == 0:
+                raise ValueError('Returned signal would be empty')
+
+    if return_sample_rate:
+        return signal, sample_rate
+    else:
+        return signal
+
+
+_WAV_MMAP_DTYPES = {
+    # (format_tag, bits): dtype
+    (1, 16): np.dtype('<i2'),
+    (1, 32): np.dtype('<i4'),
+    (3, 32): np.dtype('<f4'),
+    (3, 64): np.dtype('<f8'),
+}
+
+
+def _load_wav_mmap(path, *, frames, start, stop, channel, dtype):
+    """Memory mapped version of load_audio for PCM and float WAV files.
 
-    # Slice along channel dimension if channel_slice is given
+    Returns the signal with shape (channels, samples) and the sample rate
+    or None, when the file or the conversion to dtype is not supported.
+    The conversion matches libsndfile, i.e. integer samples are scaled with
+    2 ** -(bits - 1).
+    """
+    with open(path, 'rb') as fd:
+        header = _read_wav_header(fd, os.fstat(fd.fileno()).st_size)
+    if header is None:
+        return None
+    file_dtype = _WAV_MMAP_DTYPES.get((header.format_tag, header.bits))
+    if file_dtype is None:
+        return None
+    if dtype is None or np.dtype(dtype) == file_dtype:
+        scale = None
+    elif np.dtype(dtype).kind == 'f':
+        scale = 1 if file_dtype.kind == 'f' else 2. ** -(header.bits - 1)
+    else:
+        return None
+
+    # Same semantic as soundfile.SoundFile._prepare_read
+    if frames >= 0 and stop is not None:
+        raise TypeError('Only one of {frames, stop} may be used')
+    start, stop, _ = slice(start, stop).indices(header.frames)
+    stop = max(stop, start)
+    if frames >= 0:
+        stop = min(start + frames, header.frames)
+
+    signal = np.memmap(
+        path, dtype=file_dtype, mode='r', offset=header.data_offset,
+        shape=(header.frames, header.channels),
+    )[start:stop].T
     if channel is not None:
-        assert signal.ndim == 2, (signal.shape, channel)
         signal = signal[channel, ]
         if signal.size == 0:
             raise ValueError('Returned signal would be empty')
+    elif header.channels == 1:
+        signal = signal[0]
 
-    if return_sample_rate:
-        return signal, sample_rate
-    else:
-        return signal
+    if scale is not None:
+        signal = signal.astype(dtype)
+        if scale != 1:
+            signal *= scale
+    return signal, header.sample_rate
 
 
 # https://jex.im/regulex/#!flags=&re=%5C%5B(%5Cd%2B)%3F%3A(%5Cd%2B)%3F(%3F%3A%2C(%3F%3A(%5Cd%2B)%3F%3A(%5Cd%2B)%3F%7C(%5Cd%2B)%3F))%3F%5C%5D
@@ -343,6 +421,76 @@ def _parse_audio_slice(
     return _path, start, stop, channel
 
 
+def iter_audio_blocks(
+        path,
+        blocksize,
+        *,
+        overlap=0,
+        start=0,
+        stop=None,
+        channel=None,
+        dtype=np.float64,
+        fill_value=None,
+):
+    """
+    Reads an audio file block by block, e.g. to process long recordings with
+    constant memory. The file stays open until the generator is exhausted or
+    closed.
+
+    Args:
+        path: The file to read from. Supports the same slice notation
+            (e.g. `.../file.wav::[8000:16000,0]`) as `load_audio`.
+        blocksize: Number of samples of each block (including the overlap).
+        overlap: Number of samples, that successive blocks share.
+        start: See `load_audio`.
+        stop: See `load_audio`.
+        channel: See `load_audio`.
+        dtype: See `load_audio`.
+        fill_value: If given, the last block is padded with this value to
+            blocksize. Otherwise the last block can be shorter.
+
+    Yields:
+        Blocks with the shape (channels, samples) or (samples,) for single
+        channel files, i.e. the same layout as `load_audio`.
+
+    >>> import tempfile
+    >>> from paderbox.io import dump_audio
+    >>> tmp_dir = tempfile.TemporaryDirectory()
+    >>> path = Path(tmp_dir.name) / 'audio.wav'
+    >>> dump_audio(np.zeros((3, 1000)), path, normalize=False)
+    >>> [b.shape for b in iter_audio_blocks(path, 400)]
+    [(3, 400), (3, 400), (3, 200)]
+    >>> [b.shape for b in iter_audio_blocks(path, 400, overlap=100)]
+    [(3, 400), (3, 400), (3, 400)]
+    >>> [b.shape for b in iter_audio_blocks(
+    ...     str(path) + '::[100:900,1]', 300, fill_value=0)]
+    [(300,), (300,), (300,)]
+    >>> tmp_dir.cleanup()
+    """
+    path = normalize_path(path, as_str=True)
+
+    # Set start and stop when encoded in the filename
+    if isinstance(path, str) and '::' in path:
+        path, start, stop, channel = _parse_audio_slice(
+            path, start, stop, channel
+        )
+
+    with soundfile.SoundFile(path, 'r') as f:
+        frames = f._prepare_read(start=start, stop=stop, frames=-1)
+        for block in f.blocks(
+                blocksize=blocksize, overlap=overlap, frames=frames,
+                dtype=dtype, always_2d=channel is not None,
+                fill_value=fill_value,
+        ):
+            # soundfile returns (samples, channels)
+            block = block.T
+            if channel is not None:
+                block = block[channel, ]
+                if block.size == 0:
+                    raise ValueError('Returned signal would be empty')
+            yield block
+
+
 def recursive_load_audio(
         path,
         *,
@@ -354,6 +502,8 @@ def recursive_load_audio(
         expected_sample_rate=None,
         unit='samples',
         return_sample_rate=False,
+        workers=None,
+        executor=None,
 ):
     """
     Recursively loads all leafs (i.e. tuple/list entry or dict value) in the
@@ -363,6 +513,11 @@ def recursive_load_audio(
 
     For an explanation of the arguments, see `load_audio`.
 
+    With `workers` (number of threads) or `executor` (a
+    `concurrent.futures.Executor`) the files are loaded concurrently
+    (libsndfile releases the GIL). The result is the same as for a
+    sequential load. See `paderbox.io.wrapper_load.recursive_load`.
+
     >>> from paderbox.testing.testfile_fetcher import get_file_path
     >>> from paderbox.notebook import pprint
     >>> path1 = get_file_path('speech.wav')
@@ -378,13 +533,35 @@ def recursive_load_audio(
      'b': array(shape=(49600,), dtype=float64)}
     >>> pprint(recursive_load_audio([path1, (path2, path2)]))
     [array(shape=(49600,), dtype=float64), array(shape=(2, 38520), dtype=float64)]
+    >>> pprint(recursive_load_audio([path1, (path2, path2)], workers=4))
+    [array(shape=(49600,), dtype=float64), array(shape=(2, 38520), dtype=float64)]
 
     """
     kwargs = locals().copy()
     path = kwargs.pop('path')
+    workers = kwargs.pop('workers')
+    executor = kwargs.pop('executor')
+    load = functools.partial(load_audio, **kwargs)
+
+    if workers is not None or executor is not None:
+        from paderbox.io.wrapper_load import _parallel_recursive_load
+        # The nested object is traversed twice, hence consume generators.
+        path = _recursive_load_audio(path, lambda leaf: leaf, to_array=False)
+        return _parallel_recursive_load(
+            path,
+            lambda leaf_loader: _recursive_load_audio(path, leaf_loader),
+            load,
+            workers=workers,
+            executor=executor,
+        )
+    return _recursive_load_audio(path, load)
+
 
+def _recursive_load_audio(path, load, to_array=True):
     if isinstance(path, (tuple, list, types.GeneratorType)):
-        data = [recursive_load_audio(a, **kwargs) for a in path]
+        data = [_recursive_load_audio(a, load, to_array) for a in path]
+        if not to_array:
+            return data
 
         try:
             np_data = np.array(data)
@@ -397,9 +574,12 @@ def recursive_load_audio(
             else:
                 return data
     elif isinstance(path, dict):
-        return {k: recursive_load_audio(v, **kwargs) for k, v in path.items()}
+        return {
+            k: _recursive_load_audio(v, load, to_array)
+            for k, v in path.items()
+        }
     else:
-        return load_audio(path, **kwargs)
+        return load(path)
 
 
 def audioread(path, offset=0.0, duration=None, expected_sample_rate=None):
@@ -523,11 +703,10 @@ def audio_length(path, unit='samples'):
     # return int(params.samplerate * params.duration)
 
     if unit == 'samples':
-        with soundfile.SoundFile(str(path)) as f:
-            return len(f)
+        return _audio_info(path).frames
     elif unit == 'seconds':
-        with soundfile.SoundFile(str(path)) as f:
-            return len(f) / f.samplerate
+        info = _audio_info(path)
+        return info.frames / info.sample_rate
     else:
         return ValueError(unit)
 
@@ -547,8 +726,7 @@ def audio_channels(path):
     >>> audio_channels(path)  # correct for multichannel
     6
     """
-    with soundfile.SoundFile(str(path)) as f:
-        return f.channels
+    return _audio_info(path).channels
 
 
 def audio_shape(path):
@@ -568,12 +746,11 @@ def audio_shape(path):
     >>> audioread(path)[0].shape
     (6, 38520)
     """
-    with soundfile.SoundFile(str(path)) as f:
-        channels = f.channels
-        if channels == 1:
-            return len(f)
-        else:
-            return channels, len(f)
+    info = _audio_info(path)
+    if info.channels == 1:
+        return info.frames
+    else:
+        return info.channels, info.frames
 
 
 def is_nist_sphere_file(path):
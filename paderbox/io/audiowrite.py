@@ -209,6 +209,10 @@ def dump_audio(
     else:
         raise TypeError(dtype)
 
+    if sf_args['mode'] == 'r+':
+        # In 'r+' mode, the subtype is defined by the existing file.
+        sf_args.pop('subtype', None)
+
     with soundfile.SoundFile(path, **sf_args) as f:
         if start is not None:
             f.seek(start)
@@ -3,6 +3,7 @@ import gzip
 import json
 import pickle
 import functools
+import concurrent.futures
 from pathlib import Path
 
 from paderbox.io.path_utils import normalize_path
@@ -146,12 +147,127 @@ class Loader:
             f'  could have been tampered with.'
         )
 
+
+# BaseException.add_note is new in Python 3.11.
+_HAS_ADD_NOTE = hasattr(BaseException, 'add_note')
+
+
+def _iter_leafs_with_key_path(obj, key_path=''):
+    """
+    Yields the key path (e.g. "['c']['d'][1]") and the leaf for each leaf of
+    a nested object of dict, list and tuple, in iteration order.
+
+    >>> list(_iter_leafs_with_key_path({'a': 'x', 'b': ['y', ('z',)]}))
+    [("['a']", 'x'), ("['b'][0]", 'y'), ("['b'][1][0]", 'z')]
+    """
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield from _iter_leafs_with_key_path(v, f'{key_path}[{k!r}]')
+    elif isinstance(obj, (list, tuple)):
+        for i, v in enumerate(obj):
+            yield from _iter_leafs_with_key_path(v, f'{key_path}[{i}]')
+    else:
+        yield key_path, obj
+
+
+def _with_note(exception, note):
+    """
+    Returns an exception with the note, that should be raised from
+    `exception`.
+
+    On Python 3.11+ the note is added to `exception`. On older versions a
+    new exception with the note in the message is created. Its type is the
+    type of `exception` or, when that type cannot be created from a message
+    (e.g. json.JSONDecodeError), the nearest base class that can.
+    """
+    if _HAS_ADD_NOTE:
+        exception.add_note(note)
+        return exception
+    for cls in type(exception).__mro__:
+        try:
+            return cls(f'{exception}\n{note}')
+        except Exception:
+            pass
+
+
+def _parallel_recursive_load(
+        obj, traverse, loader, workers=None, executor=None):
+    """
+    Loads the leafs of a nested object concurrently.
+
+    `traverse(leaf_loader)` has to call `leaf_loader` for each leaf of `obj`
+    in iteration order (leafs, that are not loaded, can be skipped) and
+    build the nested object from the returned values.
+    The first traversal submits `loader(leaf)` to the executor, the second
+    traversal builds the nested object from the results. Hence the
+    structure, the order and all conversions (e.g. list to np.array) are
+    the same as for a sequential load.
+
+    The exception of the first failing leaf (in traversal order) is raised
+    and the remaining loads are cancelled. The leaf and its key path in
+    `obj` are added as note to the exception (see `_with_note` for Python
+    < 3.11). When `obj` is a single leaf, it is loaded in the calling thread.
+
+    Args:
+        obj: The nested object of dict, list and tuple.
+        traverse: See above.
+        loader: Callable that loads a single leaf.
+        workers: Number of threads, when no executor is given.
+        executor: A `concurrent.futures.Executor`. It is not shut down.
+    """
+    futures = []
+    leafs_with_key_path = _iter_leafs_with_key_path(obj)
+
+    def submit(leaf):
+        for key_path, candidate in leafs_with_key_path:
+            if candidate is leaf:
+                break
+        else:
+            key_path = None
+        futures.append((leaf, key_path, executor.submit(loader, leaf)))
+
+    def result(_):
+        leaf, key_path, future = next(results)
+        try:
+            return future.result()
+        except Exception as e:
+            for _, _, f in futures:
+                f.cancel()
+            note = f'Raised while loading {leaf!r}'
+            if key_path:
+                note += f' at {key_path}'
+            exception = _with_note(e, note + '.')
+            if exception is e:
+                raise
+            raise exception from e
+
+    if not isinstance(obj, (dict, list, tuple)):
+        # A single leaf, nothing to parallelize.
+        return traverse(loader)
+
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            return _parallel_recursive_load(
+                obj, traverse, loader, executor=executor)
+
+    try:
+        traverse(submit)
+    except BaseException:
+        for _, _, f in futures:
+            f.cancel()
+        raise
+    results = iter(futures)
+    return traverse(result)
+
+
 def recursive_load(
         obj,
         *,
         loader,
         list_to='dict',
         ignore_type_error=False,
+        workers=None,
+        executor=None,
 ):
     """
     Args:
@@ -167,12 +283,33 @@ def recursive_load(
         list_to:
         ignore_type_error:
         Whether to ignore
+        workers:
+            If given, load the leafs concurrently with this number of
+            threads. File reads (e.g. libsndfile, h5py and numpy) release
+            the GIL.
+        executor:
+            A `concurrent.futures.Executor` to load the leafs concurrently.
+            For a ProcessPoolExecutor the loader has to be picklable.
 
     Returns:
 
     """
     import numpy as np
 
+    if workers is not None or executor is not None:
+        return _parallel_recursive_load(
+            obj,
+            lambda leaf_loader: recursive_load(
+                obj,
+                loader=leaf_loader,
+                list_to=list_to,
+                ignore_type_error=ignore_type_error,
+            ),
+            loader,
+            workers=workers,
+            executor=executor,
+        )
+
     self_call = functools.partial(
         recursive_load,
         loader=loader,
@@ -207,6 +344,8 @@ def load(
         ext=None,
         ignore_type_error=False,
         unsafe=False,
+        workers=None,
+        executor=None,
         **kwargs,
 ):
     """
@@ -248,6 +387,11 @@ def load(
         unsafe:
             Flag, to indicate, if you want to allow the loading from
             unsecure files, e.g. pickle.
+        workers:
+            If given, load the files concurrently with this number of
+            threads. See `recursive_load`.
+        executor:
+            A `concurrent.futures.Executor` to load the files concurrently.
         **kwargs:
             kwargs for the specific loader.
 
@@ -282,6 +426,8 @@ def load(
         loader=loader,
         list_to=list_to,
         ignore_type_error=ignore_type_error,
+        workers=workers,
+        executor=executor,
     )
 
 
@@ -1,7 +1,7 @@
 import numpy as np
 
 
-def wrap(angle):
+def wrap(angle, out=None):
     """ Normalize angle to be in the range of [-np.pi, np.pi[.
 
     Beware! Every possible method treats the corner case -pi differently.
@@ -10,13 +10,47 @@ def wrap(angle):
     -3.141592653589793
     >>> wrap(np.pi)
     3.141592653589793
+    >>> angle = np.array([-4, 0, 4.])
+    >>> wrap(angle, out=angle)
+    array([ 2.28318531,  0.        , -2.28318531])
+    >>> angle
+    array([ 2.28318531,  0.        , -2.28318531])
 
     :param angle: Angle as numpy array in radian
+    :param out: Optional output array, e.g. angle for an in-place
+        normalization (see wrap_with_rint).
     :return: Angle in the range of
     """
+    if out is not None:
+        return wrap_with_rint(angle, out=out)
     return wrap_with_angle_exp(angle)
 
 
+def wrap_with_rint(angle, out=None):
+    """ Normalize angle to be in the range of [-np.pi, np.pi[.
+
+    Beware! Every possible method treats the corner case -pi differently.
+    Subtracts the rounded number of turns, i.e. no complex intermediate is
+    needed and with out the normalization can be done in place.
+
+    >>> wrap_with_rint(-np.pi)
+    -3.141592653589793
+    >>> wrap_with_rint(np.pi)
+    3.141592653589793
+
+    :param angle: Angle as numpy array in radian
+    :param out: Optional output array
+    :return: Angle in the range of
+    """
+    turns = np.divide(angle, 2 * np.pi)
+    if isinstance(turns, np.ndarray):
+        np.rint(turns, out=turns)
+    else:
+        turns = np.rint(turns)
+    turns *= 2 * np.pi
+    return np.subtract(angle, turns, out=out)
+
+
 def wrap_with_modulo(angle):
     """ Normalize angle to be in the range of [-np.pi, np.pi[.
 
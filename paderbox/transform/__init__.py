@@ -4,13 +4,26 @@ This module deals with all sorts of acoustic features and transforms.
 from .module_stft import (
     stft,
     istft,
+    stft_batch,
+    istft_batch,
+    multi_resolution_stft,
+    stft_to_file,
+    istft_to_file,
     STFT,
+    StreamingSTFT,
+    StreamingISTFT,
     spectrogram,
     stft_to_spectrogram,
     spectrogram_to_energy_per_frame,
     get_stft_center_frequencies,
 )
 
+from .module_fft import (
+    fft_backend,
+    get_fft_backend,
+    set_fft_backend,
+)
+
 from .module_filter import (
     preemphasis,
     inverse_preemphasis,
@@ -19,6 +32,11 @@ from .module_filter import (
 )
 
 from .module_fbank import fbank, logfbank
-from .module_mfcc import mfcc, mfcc_velocity_acceleration
-from .module_normalize import normalize_mean_variance
-from .module_resample import resample_sox
+from .module_mfcc import (
+    mfcc,
+    mfcc_velocity_acceleration,
+    FeatureExtractor,
+    StreamingFeatureExtractor,
+)
+from .module_normalize import normalize_mean_variance, RunningMeanVariance
+from .module_resample import resample_sox, resample_poly, SoxResampler
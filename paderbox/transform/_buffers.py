@@ -0,0 +1,27 @@
+"""Reusable work buffers for the transforms in this package."""
+import numpy as np
+
+
+def get_buffer(buffers, name, shape, dtype):
+    """Returns a contiguous view with shape on the flat buffer `name`.
+    The buffer is only reallocated, when it is too small or has another
+    dtype.
+
+    >>> buffers = {}
+    >>> a = get_buffer(buffers, 'a', (2, 3), np.float32)
+    >>> b = get_buffer(buffers, 'a', (4,), np.float32)
+    >>> np.shares_memory(a, b), b.shape
+    (True, (4,))
+    >>> c = get_buffer(buffers, 'a', (4,), np.float64)
+    >>> np.shares_memory(a, c), c.dtype
+    (False, dtype('float64'))
+    """
+    size = int(np.prod(shape))
+    dtype = np.dtype(dtype)
+    if (
+            name not in buffers
+            or buffers[name].size < size
+            or buffers[name].dtype != dtype
+    ):
+        buffers[name] = np.empty(size, dtype=dtype)
+    return buffers[name][:size].reshape(shape)
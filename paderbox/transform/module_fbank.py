@@ -2,6 +2,7 @@
 Provides fbank features and the fbank filterbank.
 """
 
+import functools
 from typing import Optional, Union, Callable
 
 from cached_property import cached_property
@@ -30,6 +31,7 @@ class MelTransform:
             *,
             warping_fn: Optional[Callable] = None,
             independent_axis: tuple = (0,),
+            warp_quantization_step: Optional[float] = None,
     ):
         """Transforms linear spectrogram to (log) mel spectrogram.
 
@@ -46,6 +48,13 @@ class MelTransform:
             warping_fn: function to (randomly) remap fbank center frequencies
             independent_axis: independent axis for which independently warped
                 filter banks are used.
+            warp_quantization_step: Optional step for a grid of warping
+                parameters (only for HzWarping and MelWarping). The sampled
+                warp factors and boundary frequency ratios are rounded to
+                multiples of this step and the banded filterbanks of the
+                grid points are kept in a process wide LRU cache (see
+                `warped_fbanks_cache_info`), i.e. they are not recomputed
+                for each batch. None (default) uses the exact parameters.
 
         >>> sample_rate = 16000
         >>> highest_frequency = sample_rate/2
@@ -83,29 +92,70 @@ class MelTransform:
             [independent_axis] if np.isscalar(independent_axis)
             else independent_axis
         )
+        self.warp_quantization_step = warp_quantization_step
 
     @cached_property
-    def fbanks(self):
-        """Create filterbank matrix according to member variables."""
-        fbanks = get_fbanks(
+    def _mel_filterbank(self):
+        return _get_cached_mel_filterbank(
             sample_rate=self.sample_rate,
             stft_size=self.stft_size,
             number_of_filters=self.number_of_filters,
             lowest_frequency=self.lowest_frequency,
             highest_frequency=self.highest_frequency,
             htk_mel=self.htk_mel,
+            eps=self.eps,
         )
-        fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
-        return fbanks.T
 
-    @cached_property
+    @property
+    def fbanks(self):
+        """Filterbank matrix according to member variables.
+
+        The returned array is shared with other MelTransform instances and
+        hence read-only. Assigning a new matrix replaces the filterbank of
+        this instance only (the shared cache is not changed):
+
+        >>> mel_transform = MelTransform(16000, 512, 40, log=False)
+        >>> x = np.random.rand(2, 257)
+        >>> y = mel_transform(x)
+        >>> mel_transform.fbanks = 2 * mel_transform.fbanks
+        >>> np.allclose(mel_transform(x), 2 * y)
+        True
+        >>> np.allclose(MelTransform(16000, 512, 40, log=False)(x), y)
+        True
+        """
+        return self._mel_filterbank.fbanks
+
+    @fbanks.setter
+    def fbanks(self, fbanks):
+        self._mel_filterbank = _MelFilterbank(np.array(fbanks))
+
+    @property
     def ifbanks(self):
-        """Create (pseudo)-inverse of filterbank matrix."""
-        return np.linalg.pinv(self.fbanks.T).T
+        """(Pseudo)-inverse of filterbank matrix (read-only, see fbanks).
+        Assigning a new matrix replaces the inverse of this instance only.
+        """
+        return self._mel_filterbank.ifbanks
+
+    @ifbanks.setter
+    def ifbanks(self, ifbanks):
+        mel_filterbank = _MelFilterbank(self.fbanks)
+        mel_filterbank.ifbanks = _read_only(np.array(ifbanks))
+        mel_filterbank.ifbanks_gram = None
+        self._mel_filterbank = mel_filterbank
+
+    @property
+    def banded_fbanks(self):
+        """Banded representation of fbanks for the matrix multiplications.
+        """
+        return self._mel_filterbank.banded_fbanks
+
+    @property
+    def _ifbanks_gram(self):
+        return self._mel_filterbank.ifbanks_gram
 
     def __call__(self, x: np.ndarray):
         if self.warping_fn is None:
-            x = x @ self.fbanks
+            x = self.banded_fbanks(x)
         else:
             independent_axis = [ax if ax >= 0 else x.ndim+ax for ax in self.independent_axis]
             assert all([0 <= ax < x.ndim-1 for ax in independent_axis]), self.independent_axis
@@ -113,7 +163,12 @@ class MelTransform:
                 x.shape[i] if i in independent_axis else 1
                 for i in range(x.ndim-1)
             ]
-            fbanks = get_fbanks(
+            if self.warp_quantization_step is not None:
+                x = self._apply_quantized_warping(x, tuple(size))
+                if self.log:
+                    x = np.log(x + self.eps)
+                return x
+            onsets, centers, offsets = _get_filter_edges(
                 sample_rate=self.sample_rate,
                 stft_size=self.stft_size,
                 number_of_filters=self.number_of_filters,
@@ -122,23 +177,491 @@ class MelTransform:
                 htk_mel=self.htk_mel,
                 warping_fn=self.warping_fn,
                 size=tuple(size),
-            ).astype(np.float32)
-            fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
-            fbanks = fbanks.swapaxes(-2, -1)
-            # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
-            if fbanks.shape[-3] == 1:
-                x = x @ fbanks.squeeze(-3)
-            else:
-                x = (x[..., None, :] @ fbanks).squeeze(-2)
+            )
+            x = BandedFilterbank.from_triangular_edges(
+                onsets, centers, offsets, num_bins=self.stft_size // 2 + 1,
+                eps=self.eps,
+            )(x)
         if self.log:
             x = np.log(x + self.eps)
         return x
 
+    def _apply_quantized_warping(self, x, size):
+        """Samples the warping parameters with the shape size, rounds them
+        to the grid and applies the cached filterbank of each grid point to
+        the examples, that use it."""
+        warping_fn = self.warping_fn
+        if not isinstance(warping_fn, HzWarping):
+            raise TypeError(
+                'warp_quantization_step requires a HzWarping or MelWarping '
+                f'warping_fn, got {warping_fn!r}.'
+            )
+        step = self.warp_quantization_step
+        # Same order of the random draws as in HzWarping.__call__
+        warp_factor = warping_fn.warp_factor_sampling_fn(size)
+        ratio = warping_fn.boundary_frequency_ratio_sampling_fn(size)
+        grid = np.stack(np.broadcast_arrays(
+            np.rint(np.broadcast_to(warp_factor, size) / step),
+            np.rint(np.broadcast_to(ratio, size) / step),
+        ), axis=-1).astype(int).reshape(-1, 2)
+        points, labels = np.unique(grid, axis=0, return_inverse=True)
+        labels = np.broadcast_to(labels.reshape(size), x.shape[:-1])
+
+        warping_fields = tuple(
+            (field.name, getattr(warping_fn, field.name))
+            for field in dataclasses.fields(warping_fn)
+            if field.name not in _WARPING_SAMPLING_FNS
+        )
+        out = np.empty(
+            (*x.shape[:-1], self.number_of_filters),
+            dtype=np.result_type(x.dtype, np.float32),
+        )
+        for label, (warp_index, ratio_index) in enumerate(points):
+            filterbank = _get_cached_warped_filterbank(
+                self.sample_rate, self.stft_size, self.number_of_filters,
+                self.lowest_frequency, self.highest_frequency, self.htk_mel,
+                self.eps, type(warping_fn), warping_fields,
+                warp_index * step, ratio_index * step,
+            )
+            if len(points) == 1:
+                return filterbank(x, out=out)
+            mask = labels == label
+            out[mask] = filterbank(x[mask])
+        return out
+
     def inverse(self, x: np.ndarray):
         """Invert the mel-filterbank transform."""
         if self.log:
             x = np.exp(x)
-        return np.maximum(np.dot(x, self.ifbanks), 0.)
+        if self._ifbanks_gram is None:
+            x = x @ self.ifbanks
+        else:
+            x = self.banded_fbanks.apply_transposed(x @ self._ifbanks_gram)
+        return np.maximum(x, 0., out=x)
+
+
+class _MelFilterbank:
+    """The filterbank matrix of a MelTransform and the matrices, that are
+    derived from it. The instances are shared by all MelTransform
+    instances with the same parameters (see `_get_cached_mel_filterbank`),
+    hence all arrays are read-only."""
+    def __init__(self, fbanks):
+        self.fbanks = _read_only(fbanks)
+
+    @classmethod
+    def from_parameters(
+            cls, sample_rate, stft_size, number_of_filters,
+            lowest_frequency, highest_frequency, htk_mel, eps,
+    ):
+        """The normalized mel filterbank with shape
+        (stft_size//2+1, number_of_filters)."""
+        fbanks = get_fbanks(
+            sample_rate=sample_rate,
+            stft_size=stft_size,
+            number_of_filters=number_of_filters,
+            lowest_frequency=lowest_frequency,
+            highest_frequency=highest_frequency,
+            htk_mel=htk_mel,
+        )
+        fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + eps)
+        return cls(fbanks.T)
+
+    @cached_property
+    def ifbanks(self):
+        return _read_only(np.linalg.pinv(self.fbanks.T).T)
+
+    @cached_property
+    def banded_fbanks(self):
+        return BandedFilterbank(self.fbanks)
+
+    @cached_property
+    def ifbanks_gram(self):
+        """Matrix C with `ifbanks == C @ fbanks.T`, i.e. the inverse can use
+        the banded fbanks.
+
+        The rows of pinv(A).T lie in the row space of A, hence
+        `pinv(A).T == pinv(A).T @ pinv(A) @ A`.
+        For ill-conditioned filterbanks (e.g. more filters than frequency
+        bins at low frequencies), this factorization is numerically not
+        accurate and None is returned, i.e. the dense ifbanks are used.
+        """
+        gram = self.ifbanks @ self.ifbanks.T
+        error = np.max(np.abs(
+            self.banded_fbanks.apply_transposed(gram) - self.ifbanks))
+        if error > 1e-12 * np.max(np.abs(self.ifbanks)):
+            return None
+        return _read_only(gram)
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+# Number of mel filterbanks that are kept in memory.
+_FBANKS_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=_FBANKS_CACHE_SIZE)
+def _get_mel_filterbank_lru(*args):
+    return _MelFilterbank.from_parameters(*args)
+
+
+def _get_cached_mel_filterbank(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, eps,
+):
+    """Cached `_MelFilterbank`.
+
+    `fbank`, `logfbank` and `mfcc` create a new MelTransform for each
+    call. Hence, the filterbanks are kept in a process wide bounded LRU
+    cache (thread safe), that is shared by all MelTransform instances.
+    Use `fbanks_cache_info` to get the hits and misses.
+
+    >>> fbanks_cache_clear()
+    >>> a = MelTransform(16000, 512, 40).fbanks
+    >>> b = MelTransform(16000, 512, 40).fbanks
+    >>> a is b, a.flags.writeable
+    (True, False)
+    >>> fbanks_cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=32, currsize=1)
+    """
+    args = (
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, eps,
+    )
+    try:
+        return _get_mel_filterbank_lru(*args)
+    except TypeError:
+        # unhashable argument
+        return _MelFilterbank.from_parameters(*args)
+
+
+def fbanks_cache_info():
+    """Hits and misses of the process wide cache of the mel filterbanks of
+    `MelTransform` (used by fbank, logfbank and mfcc).
+    See `functools.lru_cache`."""
+    return _get_mel_filterbank_lru.cache_info()
+
+
+def fbanks_cache_clear():
+    """Clears the cache of the mel filterbanks. See `fbanks_cache_info`."""
+    _get_mel_filterbank_lru.cache_clear()
+
+
+# Fields of HzWarping, that sample the random warping parameters.
+_WARPING_SAMPLING_FNS = (
+    'warp_factor_sampling_fn', 'boundary_frequency_ratio_sampling_fn')
+
+# Number of warped filterbanks (grid points) that are kept in memory.
+_WARPED_FBANKS_CACHE_SIZE = 256
+
+
+def _get_warped_filterbank(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, eps, warping_cls, warping_fields,
+        warp_factor, boundary_frequency_ratio,
+):
+    """BandedFilterbank of a single (deterministic) HzWarping/MelWarping."""
+    warping_fn = warping_cls(
+        **dict(warping_fields),
+        warp_factor_sampling_fn=functools.partial(
+            np.full, fill_value=warp_factor),
+        boundary_frequency_ratio_sampling_fn=functools.partial(
+            np.full, fill_value=boundary_frequency_ratio),
+    )
+    edges = _get_filter_edges(
+        sample_rate=sample_rate,
+        stft_size=stft_size,
+        number_of_filters=number_of_filters,
+        lowest_frequency=lowest_frequency,
+        highest_frequency=highest_frequency,
+        htk_mel=htk_mel,
+        warping_fn=warping_fn,
+        size=(),
+    )
+    return BandedFilterbank.from_triangular_edges(
+        *edges, num_bins=stft_size // 2 + 1, eps=eps)
+
+
+_get_warped_filterbank_lru = functools.lru_cache(
+    maxsize=_WARPED_FBANKS_CACHE_SIZE)(_get_warped_filterbank)
+
+
+def _get_cached_warped_filterbank(*args):
+    """Cached `_get_warped_filterbank`, see MelTransform's
+    warp_quantization_step."""
+    try:
+        return _get_warped_filterbank_lru(*args)
+    except TypeError:
+        # unhashable argument
+        return _get_warped_filterbank(*args)
+
+
+def warped_fbanks_cache_info():
+    """Hits and misses of the process wide cache of the warped filterbanks
+    of `MelTransform` with warp_quantization_step.
+    See `functools.lru_cache`.
+
+    >>> from paderbox.utils.random_utils import Uniform
+    >>> warped_fbanks_cache_clear()
+    >>> mel_transform = MelTransform(
+    ...     16000, 512, 40, warp_quantization_step=0.05,
+    ...     warping_fn=HzWarping(
+    ...         warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+    ...         boundary_frequency_ratio_sampling_fn=lambda size: 0.7,
+    ...         highest_frequency=8000,
+    ...     ),
+    ... )
+    >>> for _ in range(10):
+    ...     _ = mel_transform(np.ones((8, 100, 257)))
+    >>> warped_fbanks_cache_info().currsize  # warp factors 0.9, 0.95, ...
+    5
+    """
+    return _get_warped_filterbank_lru.cache_info()
+
+
+def warped_fbanks_cache_clear():
+    """Clears the cache of the warped filterbanks.
+    See `warped_fbanks_cache_info`."""
+    _get_warped_filterbank_lru.cache_clear()
+
+
+def _filterbank_matmul(x, fbanks, out=None):
+    """x @ fbanks, where fbanks may have independent axes in front of the
+    last two axes, that are broadcasted with the axes of x (without the
+    last axis of x)."""
+    if fbanks.ndim == 2:
+        return np.matmul(x, fbanks, out=out)
+    # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
+    elif fbanks.shape[-3] == 1:
+        return np.matmul(x, fbanks.squeeze(-3), out=out)
+    else:
+        if out is not None:
+            out = out[..., None, :]
+        return np.matmul(x[..., None, :], fbanks, out=out).squeeze(-2)
+
+
+class BandedFilterbank:
+    def __init__(self, fbanks: np.ndarray, max_overhead: float = 4.):
+        """Banded representation of a filterbank matrix.
+
+        Each (e.g. triangular mel) filter is only nonzero in a few frequency
+        bins, i.e. most entries of the dense matrix are zero. This
+        representation stores for each filter the first (`start`) and the
+        last + 1 (`stop`) nonzero bin and the weights in between.
+        Multiplications are done blockwise: Neighbouring filters are grouped,
+        so that the dense blocks `fbanks[..., lo:hi, a:b]` contain at most
+        `max_overhead` times the number of banded weights. Each block is a
+        small dense (BLAS) matmul, so the result is the same as with the
+        dense matrix (up to rounding).
+
+        Args:
+            fbanks: Filterbank with shape (..., stft_size//2+1, number_of_filters),
+                e.g. `MelTransform.fbanks`. Independent axes in front of the
+                last two axes (e.g. for warped filterbanks) share the
+                band limits, i.e. the union of the bands is used.
+            max_overhead: Maximum ratio between the size of a block and the
+                number of weights in the block.
+
+        >>> fbanks = MelTransform(16000, 512, 40).fbanks
+        >>> banded = BandedFilterbank(fbanks)
+        >>> banded.start[:5], banded.stop[:5]
+        (array([2, 4, 5, 7, 9]), array([ 5,  7,  9, 10, 12]))
+        >>> banded.weights.shape
+        (40, 32)
+        >>> np.array_equal(banded.to_dense(), fbanks)
+        True
+        >>> x = np.random.rand(3, 100, 257)
+        >>> np.allclose(banded(x), x @ fbanks)
+        True
+        >>> y = np.random.rand(3, 100, 40)
+        >>> np.allclose(banded.apply_transposed(y), y @ fbanks.T)
+        True
+        """
+        fbanks = np.asarray(fbanks)
+        *independent, num_bins, number_of_filters = fbanks.shape
+        nonzero = np.any(fbanks != 0, axis=tuple(range(fbanks.ndim - 2)))
+        empty = ~np.any(nonzero, axis=0)
+        start = np.argmax(nonzero, axis=0)
+        stop = num_bins - np.argmax(nonzero[::-1], axis=0)
+        self._init_bands(start, stop, empty, num_bins, tuple(independent))
+        self._blocks = [
+            (lo, hi, a, b, np.ascontiguousarray(fbanks[..., lo:hi, a:b]))
+            for lo, hi, a, b in self._group_filters(max_overhead)
+        ]
+
+    def _init_bands(self, start, stop, empty, num_bins, independent_shape):
+        self.num_bins = num_bins
+        self.independent_shape = independent_shape
+        # Empty filters get an empty band at the end of the previous band
+        # to keep the bands sorted.
+        end_of_previous = np.maximum.accumulate(np.where(empty, 0, stop))
+        self.start = np.where(empty, end_of_previous, start)
+        self.stop = np.where(empty, end_of_previous, stop)
+
+    def _group_filters(self, max_overhead):
+        """Yields (lo, hi, a, b), i.e. the bins lo:hi and filters a:b of each
+        block."""
+        start, stop = self.start, self.stop
+        width = stop - start
+        a = 0
+        while a < self.number_of_filters:
+            lo, hi, nnz = start[a], stop[a], width[a]
+            b = a + 1
+            while b < self.number_of_filters:
+                lo_, hi_ = min(lo, start[b]), max(hi, stop[b])
+                if (hi_ - lo_) * (b + 1 - a) > max_overhead * (nnz + width[b]):
+                    break
+                lo, hi, nnz = lo_, hi_, nnz + width[b]
+                b += 1
+            yield lo, hi, a, b
+            a = b
+
+    @classmethod
+    def from_triangular_edges(
+            cls, onsets, centers, offsets, num_bins, eps=1e-18,
+            max_overhead: float = 4.,
+    ):
+        """Banded representation of normalized triangular filters, e.g.
+        warped mel filters for VTLP.
+
+        Equal to `BandedFilterbank(fbanks)` with
+        `fbanks = get_fbanks(...).astype(np.float32)`, normalized to sum one
+        (+ eps) and transposed, but the weights are computed only inside the
+        blocks. Hence, for warped filterbanks (independent edges for each
+        example) no dense matrix per example is materialized.
+
+        Args:
+            onsets, centers, offsets: Soft bin indices with shape
+                (..., number_of_filters), see _get_filter_edges.
+            num_bins: stft_size//2+1
+            eps: Added to the normalization, see MelTransform.
+            max_overhead: See BandedFilterbank.
+
+        >>> from paderbox.utils.random_utils import Uniform
+        >>> warping_fn = HzWarping(
+        ...     warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+        ...     boundary_frequency_ratio_sampling_fn=Uniform(low=.6, high=.7),
+        ...     highest_frequency=8000,
+        ... )
+        >>> np.random.seed(0)
+        >>> edges = _get_filter_edges(
+        ...     16000, 512, 40, 0., None, True, warping_fn, size=(3, 1))
+        >>> banded = BandedFilterbank.from_triangular_edges(*edges, 257)
+        >>> np.random.seed(0)
+        >>> fbanks = get_fbanks(
+        ...     16000, 512, 40, warping_fn=warping_fn, size=(3, 1)
+        ... ).astype(np.float32)
+        >>> fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + 1e-18)
+        >>> np.allclose(banded.to_dense(), fbanks.swapaxes(-2, -1))
+        True
+        >>> np.array_equal(
+        ...     banded.weights, BandedFilterbank(banded.to_dense()).weights)
+        True
+        """
+        onsets, centers, offsets = np.broadcast_arrays(
+            onsets, centers, offsets)
+        *independent, number_of_filters = onsets.shape
+        axis = tuple(range(onsets.ndim - 1))
+        # Filter n is nonzero in the bins onset < k < offset.
+        start = np.clip(
+            np.floor(np.min(onsets, axis=axis)).astype(int) + 1, 0, num_bins)
+        stop = np.clip(
+            np.ceil(np.max(offsets, axis=axis)).astype(int), 0, num_bins)
+        self = cls.__new__(cls)
+        self._init_bands(
+            start, stop, start >= stop, num_bins, tuple(independent))
+
+        self._blocks = []
+        for lo, hi, a, b in self._group_filters(max_overhead):
+            idx = np.arange(lo, hi)[:, None]
+            onset = onsets[..., None, a:b]
+            center = centers[..., None, a:b]
+            offset = offsets[..., None, a:b]
+            block = np.maximum(
+                np.minimum(
+                    (idx - onset) / (center - onset),
+                    (idx - offset) / (center - offset)
+                ),
+                0
+            ).astype(np.float32)
+            self._blocks.append((lo, hi, a, b, block))
+        # Each block contains the complete support of its filters.
+        norm = np.zeros((*independent, 1, number_of_filters), np.float32)
+        for lo, hi, a, b, block in self._blocks:
+            norm[..., a:b] = block.sum(axis=-2, keepdims=True)
+        norm += eps
+        for lo, hi, a, b, block in self._blocks:
+            block /= norm[..., a:b]
+        return self
+
+    @cached_property
+    def weights(self):
+        """The weights between start and stop with shape
+        (..., number_of_filters, max(stop - start))."""
+        width = self.stop - self.start
+        offset = np.arange(max(np.max(width, initial=0), 1))
+        weights = np.zeros(
+            (*self.independent_shape, self.number_of_filters, len(offset)),
+            dtype=self.dtype,
+        )
+        for lo, hi, a, b, block in self._blocks:
+            index = np.minimum(
+                self.start[a:b, None] - lo + offset, max(hi - lo - 1, 0))
+            if hi > lo:
+                weights[..., a:b, :] = np.take_along_axis(
+                    block.swapaxes(-2, -1),
+                    np.broadcast_to(index, (*block.shape[:-2], *index.shape)),
+                    axis=-1,
+                )
+        return np.where(offset < width[:, None], weights, 0)
+
+    @property
+    def dtype(self):
+        return self._blocks[0][-1].dtype
+
+    @property
+    def number_of_filters(self):
+        return len(self.start)
+
+    def to_dense(self):
+        """Returns the dense filterbank matrix with shape
+        (..., stft_size//2+1, number_of_filters)."""
+        fbanks = np.zeros(
+            (*self.independent_shape, self.num_bins, self.number_of_filters),
+            dtype=self.dtype,
+        )
+        for lo, hi, a, b, block in self._blocks:
+            fbanks[..., lo:hi, a:b] = block
+        return fbanks
+
+    def __call__(self, x: np.ndarray, out: np.ndarray = None):
+        """Computes `x @ fbanks`, where x has the shape
+        (..., stft_size//2+1). The result is written into `out`, if given.
+        """
+        assert x.shape[-1] == self.num_bins, (x.shape, self.num_bins)
+        for lo, hi, a, b, block in self._blocks:
+            if out is None:
+                y = _filterbank_matmul(x[..., lo:hi], block)
+                out = np.empty(
+                    (*y.shape[:-1], self.number_of_filters), dtype=y.dtype)
+                out[..., a:b] = y
+            else:
+                _filterbank_matmul(x[..., lo:hi], block, out=out[..., a:b])
+        return out
+
+    def apply_transposed(self, x: np.ndarray):
+        """Computes `x @ fbanks.T`, where x has the shape
+        (..., number_of_filters)."""
+        assert x.shape[-1] == self.number_of_filters, (
+            x.shape, self.number_of_filters)
+        return self.transposed(x)
+
+    @cached_property
+    def transposed(self):
+        """The banded representation of `fbanks.swapaxes(-2, -1)`."""
+        return BandedFilterbank(self.to_dense().swapaxes(-2, -1))
 
 
 def get_fbanks(
@@ -193,6 +716,39 @@ def get_fbanks(
         )).shape
     (2, 3, 10, 17)
 
+    """
+    onsets, centers, offsets = _get_filter_edges(
+        sample_rate=sample_rate,
+        stft_size=stft_size,
+        number_of_filters=number_of_filters,
+        lowest_frequency=lowest_frequency,
+        highest_frequency=highest_frequency,
+        htk_mel=htk_mel,
+        warping_fn=warping_fn,
+        size=size,
+    )
+    onsets = onsets[..., None]
+    centers = centers[..., None]
+    offsets = offsets[..., None]
+    idx = np.arange(stft_size // 2 + 1)
+    fbanks = np.maximum(
+        np.minimum(
+            (idx-onsets)/(centers-onsets),
+            (idx-offsets)/(centers-offsets)
+        ),
+        0
+    )
+    return np.broadcast_to(fbanks, (*size, *fbanks.shape[-2:]))
+
+
+def _get_filter_edges(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, warping_fn, size,
+):
+    """Returns the (soft) fft bin indices of the onsets, centers and offsets
+    of the triangular mel filters. See get_fbanks for the arguments.
+    The returned arrays have the shape (..., number_of_filters), where ...
+    is size, if warping_fn is not None.
     """
     highest_frequency = sample_rate / 2 if highest_frequency is None else highest_frequency
     if highest_frequency < 0:
@@ -208,18 +764,10 @@ def get_fbanks(
     if warping_fn is not None:
         f = warping_fn(f, size=size)
     k = hz2bin(f, sample_rate, stft_size)
-    centers = k[..., 1:-1, None]
-    onsets = np.minimum(k[..., :-2, None], centers - 1)
-    offsets = np.maximum(k[..., 2:, None], centers + 1)
-    idx = np.arange(stft_size // 2 + 1)
-    fbanks = np.maximum(
-        np.minimum(
-            (idx-onsets)/(centers-onsets),
-            (idx-offsets)/(centers-offsets)
-        ),
-        0
-    )
-    return np.broadcast_to(fbanks, (*size, *fbanks.shape[-2:]))
+    centers = k[..., 1:-1]
+    onsets = np.minimum(k[..., :-2], centers - 1)
+    offsets = np.maximum(k[..., 2:], centers + 1)
+    return onsets, centers, offsets
 
 
 def hz2mel(frequency: Union[float, np.ndarray], htk_mel=True):
@@ -0,0 +1,214 @@
+"""
+Selects the FFT implementation that is used by the transforms in this
+package (e.g. stft, istft, STFT, fbank and mfcc).
+
+The default backend is `numpy.fft`. It is single threaded and always returns
+complex128. Alternatives are `scipy.fft` (supports `workers` for
+multithreading on a single large array) and pyFFTW (optional dependency,
+with cached FFTW plans and wisdom).
+
+The backend can be changed globally with `set_fft_backend` or temporarily
+with the context manager `fft_backend`:
+
+>>> import numpy as np
+>>> from paderbox.transform import stft
+>>> x = np.random.normal(size=(8, 16000))
+>>> with fft_backend('scipy', workers=2):
+...     X = stft(x)
+>>> np.testing.assert_allclose(X, stft(x))
+>>> get_fft_backend()
+NumpyFFTBackend()
+"""
+import contextlib
+import dataclasses
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from paderbox.utils.mapping import Dispatcher
+
+
+__all__ = [
+    'NumpyFFTBackend',
+    'ScipyFFTBackend',
+    'PyFFTWBackend',
+    'get_fft_backend',
+    'set_fft_backend',
+    'fft_backend',
+    'rfft',
+    'irfft',
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class NumpyFFTBackend:
+    """numpy.fft: Single threaded, returns always complex128/float64."""
+
+    def rfft(self, a, n=None, axis=-1):
+        return np.fft.rfft(a, n=n, axis=axis)
+
+    def irfft(self, a, n=None, axis=-1):
+        return np.fft.irfft(a, n=n, axis=axis)
+
+
+@dataclasses.dataclass(frozen=True)
+class ScipyFFTBackend:
+    """scipy.fft: Keeps single precision and supports multiple threads.
+
+    Attributes:
+        workers: Number of threads. Negative values wrap around
+            os.cpu_count(), e.g. -1 means all cores. See scipy.fft.rfft.
+    """
+    workers: int = None
+
+    def rfft(self, a, n=None, axis=-1):
+        import scipy.fft
+        return scipy.fft.rfft(a, n=n, axis=axis, workers=self.workers)
+
+    def irfft(self, a, n=None, axis=-1):
+        import scipy.fft
+        return scipy.fft.irfft(a, n=n, axis=axis, workers=self.workers)
+
+
+@dataclasses.dataclass(frozen=True)
+class PyFFTWBackend:
+    """pyFFTW: FFTW with cached plans and multiple threads.
+
+    Requires `pip install pyfftw`.
+
+    Attributes:
+        workers: Number of threads. Negative values wrap around
+            os.cpu_count(), e.g. -1 means all cores.
+        wisdom_file: Optional file with FFTW wisdom. The wisdom is loaded,
+            when the backend is created, if the file exists. Use
+            `save_wisdom` to store the accumulated wisdom.
+        planner_effort: See pyfftw.interfaces.
+    """
+    workers: int = None
+    wisdom_file: str = None
+    planner_effort: str = 'FFTW_ESTIMATE'
+
+    def __post_init__(self):
+        import pyfftw
+        # Keep the FFTW objects alive between calls with the same shape.
+        pyfftw.interfaces.cache.enable()
+        if self.wisdom_file is not None and Path(self.wisdom_file).exists():
+            with open(self.wisdom_file, 'rb') as fd:
+                pyfftw.import_wisdom(pickle.load(fd))
+
+    @property
+    def _threads(self):
+        if self.workers is None:
+            return 1
+        elif self.workers < 0:
+            return max(os.cpu_count() + 1 + self.workers, 1)
+        else:
+            return self.workers
+
+    def save_wisdom(self, wisdom_file=None):
+        """Stores the FFTW wisdom, so that later processes can reuse the
+        plans."""
+        import pyfftw
+        wisdom_file = self.wisdom_file if wisdom_file is None else wisdom_file
+        if wisdom_file is None:
+            raise ValueError('No wisdom_file given.')
+        with open(wisdom_file, 'wb') as fd:
+            pickle.dump(pyfftw.export_wisdom(), fd)
+
+    def rfft(self, a, n=None, axis=-1):
+        import pyfftw.interfaces.numpy_fft
+        return pyfftw.interfaces.numpy_fft.rfft(
+            a, n=n, axis=axis, threads=self._threads,
+            planner_effort=self.planner_effort,
+        )
+
+    def irfft(self, a, n=None, axis=-1):
+        import pyfftw.interfaces.numpy_fft
+        return pyfftw.interfaces.numpy_fft.irfft(
+            a, n=n, axis=axis, threads=self._threads,
+            planner_effort=self.planner_effort,
+        )
+
+
+_backend_dispatcher = Dispatcher({
+    'numpy': NumpyFFTBackend,
+    'scipy': ScipyFFTBackend,
+    'pyfftw': PyFFTWBackend,
+})
+
+_BACKEND = NumpyFFTBackend()
+
+
+def get_fft_backend():
+    """Returns the FFT backend that is currently used."""
+    return _BACKEND
+
+
+def set_fft_backend(backend='numpy', **kwargs):
+    """Sets the FFT backend for this process.
+
+    Args:
+        backend: Name of the backend ('numpy', 'scipy' or 'pyfftw') or a
+            backend object, i.e. an object with rfft and irfft methods.
+        **kwargs: Arguments for the backend, e.g. workers.
+
+    Returns:
+        The previous backend.
+
+    >>> previous = set_fft_backend('scipy', workers=-1)
+    >>> get_fft_backend()
+    ScipyFFTBackend(workers=-1)
+    >>> set_fft_backend(previous)
+    ScipyFFTBackend(workers=-1)
+    >>> set_fft_backend('cupy')
+    Traceback (most recent call last):
+    ...
+    paderbox.utils.mapping.DispatchError: Invalid option 'cupy'.
+    Close matches: ['scipy', 'numpy', 'pyfftw'].
+    """
+    global _BACKEND
+    if isinstance(backend, str):
+        backend = _backend_dispatcher[backend](**kwargs)
+    elif kwargs:
+        raise ValueError(
+            f'kwargs are only supported for backend names, got {kwargs} for '
+            f'{backend}.'
+        )
+    previous, _BACKEND = _BACKEND, backend
+    return previous
+
+
+@contextlib.contextmanager
+def fft_backend(backend='numpy', **kwargs):
+    """Context manager to temporarily change the FFT backend.
+
+    Note: The backend is a process wide setting, i.e. it affects also other
+    threads.
+
+    Args:
+        backend: See set_fft_backend.
+        **kwargs: See set_fft_backend.
+
+    >>> with fft_backend('scipy', workers=4) as backend:
+    ...     backend
+    ScipyFFTBackend(workers=4)
+    >>> get_fft_backend()
+    NumpyFFTBackend()
+    """
+    previous = set_fft_backend(backend, **kwargs)
+    try:
+        yield get_fft_backend()
+    finally:
+        set_fft_backend(previous)
+
+
+def rfft(a, n=None, axis=-1):
+    """`rfft` of the current backend. See numpy.fft.rfft."""
+    return _BACKEND.rfft(a, n=n, axis=axis)
+
+
+def irfft(a, n=None, axis=-1):
+    """`irfft` of the current backend. See numpy.fft.irfft."""
+    return _BACKEND.irfft(a, n=n, axis=axis)
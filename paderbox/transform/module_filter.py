@@ -30,22 +30,44 @@ def inverse_preemphasis(time_signal, p=0.95):
     return lfilter([1], [1., -p], time_signal)
 
 
-def offset_compensation(time_signal):
+def offset_compensation(time_signal, zi=None):
     """ Offset compensation filter.
+
+    :param zi: Optional initial filter state, e.g. the final state of the
+        previous chunk (see preemphasis_with_offset_compensation).
+    :return: The filtered input signal and, if zi is given, the final
+        filter state.
     """
-    return lfilter([1., -1], [1., -0.999], time_signal)
+    if zi is None:
+        return lfilter([1., -1], [1., -0.999], time_signal)
+    return lfilter([1., -1], [1., -0.999], time_signal, zi=zi)
 
 
-def preemphasis_with_offset_compensation(time_signal, p=0.95):
+def preemphasis_with_offset_compensation(time_signal, p=0.95, zi=None):
     """Combined filter to add pre-emphasis and compensate the offset.
 
     This approach offers increased numerical accuracy.
 
     :param time signal: The input signal to be filtered.
     :param p: preemphasis coefficient
-    :return: The filtered input signal
+    :param zi: Optional initial filter state with shape (..., 2) for chunked
+        processing. Start with zeros and pass the returned final state to the
+        next chunk.
+    :return: The filtered input signal and, if zi is given, the final
+        filter state.
+
+    >>> import numpy as np
+    >>> x = np.random.normal(size=(2, 100))
+    >>> y1, zf = preemphasis_with_offset_compensation(
+    ...     x[:, :30], zi=np.zeros((2, 2)))
+    >>> y2, zf = preemphasis_with_offset_compensation(x[:, 30:], zi=zf)
+    >>> np.allclose(np.concatenate([y1, y2], axis=-1),
+    ...             preemphasis_with_offset_compensation(x))
+    True
     """
-    return lfilter([1, -(1+p), p], [1, -0.999], time_signal)
+    if zi is None:
+        return lfilter([1, -(1+p), p], [1, -0.999], time_signal)
+    return lfilter([1, -(1+p), p], [1, -0.999], time_signal, zi=zi)
 
 
 def median(input_signal, window_size=3):
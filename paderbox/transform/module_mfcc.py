@@ -1,6 +1,14 @@
+from cached_property import cached_property
 import numpy as np
 from paderbox.transform.module_stft import stft
+from paderbox.transform.module_stft import _get_cached_window
+from paderbox.transform.module_stft import StreamingSTFT
 from paderbox.transform.module_fbank import logfbank
+from paderbox.transform.module_fbank import MelTransform
+from paderbox.transform.module_fft import rfft
+from paderbox.transform.module_filter import preemphasis_with_offset_compensation
+from paderbox.transform.module_normalize import RunningMeanVariance
+from paderbox.transform._buffers import get_buffer
 from paderbox.array import segment_axis
 import scipy.signal
 from scipy.fftpack import dct
@@ -94,8 +102,8 @@ def mfcc_velocity_acceleration(time_signal, *args, **kwargs):
     :return: Stacked features
     """
     mfcc_signal = mfcc(time_signal, *args, **kwargs)
-    delta_mfcc_signal = delta(mfcc_signal, order=1)
-    delta_delta_mfcc_signal = delta(mfcc_signal, order=2)
+    delta_mfcc_signal, delta_delta_mfcc_signal = delta(
+        mfcc_signal, order=(1, 2))
     return np.concatenate(
         (mfcc_signal, delta_mfcc_signal, delta_delta_mfcc_signal),
         axis=1
@@ -115,9 +123,11 @@ def delta(data, width=9, order=1, axis=-1, trim=True):
     width     : int >= 3, odd [scalar]
         Number of frames over which to compute the delta feature
 
-    order     : int > 0 [scalar]
+    order     : int > 0 [scalar] or sequence of int > 0
         the order of the difference operator.
         1 for first derivative, 2 for second, etc.
+        If a sequence (e.g. (1, 2)) is given, all orders are computed in
+        one pass and stacked along a new first axis.
 
     axis      : int [scalar]
         the axis along which to compute deltas.
@@ -129,8 +139,13 @@ def delta(data, width=9, order=1, axis=-1, trim=True):
     Returns
     -------
     delta_data   : np.ndarray [shape=(d, t) or (d, t + window)]
-        delta matrix of `data`.
+        delta matrix of `data`. With shape (len(order), d, t) or
+        (len(order), d, t + window), if order is a sequence.
 
+    >>> data = np.random.rand(2, 100, 13)
+    >>> velocity, acceleration = delta(data, order=(1, 2), axis=-2)
+    >>> np.allclose(acceleration, delta(data, order=2, axis=-2))
+    True
     '''
 
     data = np.atleast_1d(data)
@@ -138,7 +153,10 @@ def delta(data, width=9, order=1, axis=-1, trim=True):
     if width < 3 or np.mod(width, 2) != 1:
         raise ValueError('width must be an odd integer >= 3')
 
-    if order <= 0 or not isinstance(order, int):
+    orders = (order,) if np.isscalar(order) else tuple(order)
+    if len(orders) == 0 or not all(
+            isinstance(o, int) and o > 0 for o in orders
+    ):
         raise ValueError('order must be a positive integer')
 
     half_length = 1 + int(width // 2)
@@ -147,22 +165,59 @@ def delta(data, width=9, order=1, axis=-1, trim=True):
     # Normalize the window so we're scale-invariant
     window /= np.sum(np.abs(window)**2)
 
-    # Pad out the data by repeating the border values (delta=0)
-    padding = [(0, 0)] * data.ndim
+    # Filtering `order` times with the window (lfilter with zero initial
+    # state) is a cascade of FIR filters, i.e. order k is the window applied
+    # to order k - 1. Hence, all orders are computed from one buffer, where
+    # the time axis is the first axis. Only the part of each stage, that
+    # is needed for the requested output, is computed.
     width = int(width)
-    padding[axis] = (width, width)
-    delta_x = np.pad(data, padding, mode='edge')
-
-    for _ in range(order):
-        delta_x = scipy.signal.lfilter(window, 1, delta_x, axis=axis)
-
-    # Cut back to the original shape of the input data
+    half = width // 2
+    num_frames = data.shape[axis]
+    x = np.moveaxis(data, axis, 0)
     if trim:
-        idx = [slice(None)] * delta_x.ndim
-        idx[axis] = slice(- half_length - data.shape[axis], - half_length)
-        delta_x = delta_x[idx]
-
-    return delta_x
+        # The filter has a delay of `half` frames.
+        start, length = width + half, num_frames
+    else:
+        start, length = 0, num_frames + 2 * width
+    max_order = max(orders)
+
+    # Pad out the data by repeating the border values (delta=0) and with
+    # zeros in front for the initial state of the filter.
+    zeros = max(max_order * (width - 1) - start, 0)
+    dtype = np.result_type(x.dtype, window.dtype)
+    stage = np.zeros((zeros + num_frames + 2 * width, *x.shape[1:]), dtype)
+    stage[zeros:zeros + width] = x[:1]
+    stage[zeros + width:zeros + width + num_frames] = x
+    stage[zeros + width + num_frames:] = x[-1:]
+    first = -zeros  # Index of stage[0] in the padded data
+
+    deltas = {}
+    tmp = None
+    for k in range(1, max_order + 1):
+        new_first = start - (max_order - k) * (width - 1)
+        new_stage = np.zeros(
+            (start + length - new_first, *x.shape[1:]), dtype)
+        if tmp is None:
+            tmp = np.empty_like(new_stage)
+        tmp_ = tmp[:len(new_stage)]
+        base = new_first - first
+        # The window is antisymmetric: window[j] == -window[width - 1 - j]
+        for j in range(half):
+            np.subtract(
+                stage[base - j:base - j + len(new_stage)],
+                stage[base - 2 * half + j:base - 2 * half + j + len(new_stage)],
+                out=tmp_,
+            )
+            tmp_ *= window[j]
+            new_stage += tmp_
+        stage, first = new_stage, new_first
+        if k in orders:
+            deltas[k] = stage[start - first:]
+
+    if np.isscalar(order):
+        return np.moveaxis(deltas[order], 0, axis)
+    return np.moveaxis(
+        np.stack([deltas[o] for o in orders]), 1, axis % data.ndim + 1)
 
 
 def modmfcc(
@@ -224,3 +279,472 @@ def modmfcc(
             axis=-3)
         x = np.mean(x, axis=-3)
     return x
+
+
+class FeatureExtractor:
+    def __init__(
+            self,
+            feature: str = 'mfcc',
+            sample_rate: int = 16000,
+            window_length: int = 400,
+            stft_shift: int = 160,
+            number_of_filters: int = None,
+            stft_size: int = 512,
+            lowest_frequency: float = 0.,
+            highest_frequency: float = None,
+            preemphasis_factor: float = 0.97,
+            window=scipy.signal.windows.hamming,
+            denoise: bool = False,
+            eps: float = 1e-18,
+            numcep: int = 13,
+            ceplifter: int = 22,
+            delta_order: int = 0,
+            delta_width: int = 9,
+            delta_axis: int = -1,
+            normalizer: RunningMeanVariance = None,
+    ):
+        """Fused fbank, logfbank or MFCC feature extraction.
+
+        Computes the same features as `fbank`, `logfbank`, `mfcc` and
+        `mfcc_velocity_acceleration`, but the processing chain (filter,
+        windowing, FFT, power spectrum, mel filterbank, log, DCT and lifter)
+        writes into scratch buffers, that are allocated once and reused for
+        all following calls with at most the same size. The DCT and the
+        lifter are fused into one matrix multiplication. The mel filterbank
+        and the window are shared with the other functions through their
+        caches.
+
+        Note: Because of the buffers, an instance should not be used from
+            multiple threads at the same time.
+
+        Args:
+            feature: 'fbank', 'logfbank' or 'mfcc'.
+            number_of_filters: Default is 23 for 'fbank' and 'logfbank'
+                and 26 for 'mfcc' (as the functions).
+            delta_order: If larger than 0, the deltas up to this order are
+                concatenated to the features along the last axis, e.g. 2 for
+                `mfcc_velocity_acceleration`.
+            delta_width, delta_axis: See `delta`. The default axis is the
+                same as in `mfcc_velocity_acceleration`, use -2 for deltas
+                over time.
+            normalizer: Optional RunningMeanVariance (e.g. dataset-level
+                CMVN statistics of this feature extractor) to normalize the
+                features in place. The key for the statistics (e.g. the
+                speaker) is an argument of `__call__`.
+            For the other arguments see `fbank`, `logfbank` and `mfcc`.
+
+        >>> x = np.random.normal(size=(2, 16000))
+        >>> feature_extractor = FeatureExtractor('mfcc')
+        >>> feature_extractor(x).shape
+        (2, 99, 13)
+        >>> np.allclose(feature_extractor(x), mfcc(x))
+        True
+        >>> out = np.empty((99, 39))
+        >>> _ = FeatureExtractor('mfcc', delta_order=2)(x[0], out=out)
+        >>> np.allclose(out, mfcc_velocity_acceleration(x[0]))
+        True
+        >>> from paderbox.transform.module_fbank import fbank
+        >>> np.allclose(FeatureExtractor('fbank')(x), fbank(x))
+        True
+        """
+        if feature not in ['fbank', 'logfbank', 'mfcc']:
+            raise ValueError(
+                f'feature has to be fbank, logfbank or mfcc, got {feature!r}')
+        if number_of_filters is None:
+            number_of_filters = 26 if feature == 'mfcc' else 23
+        self.feature = feature
+        self.sample_rate = sample_rate
+        self.window_length = window_length
+        self.stft_shift = stft_shift
+        self.number_of_filters = number_of_filters
+        self.stft_size = stft_size
+        self.lowest_frequency = lowest_frequency
+        self.highest_frequency = highest_frequency or sample_rate / 2
+        self.preemphasis_factor = preemphasis_factor
+        self.window = window
+        self.denoise = denoise
+        self.eps = eps
+        self.numcep = numcep
+        self.ceplifter = ceplifter
+        self.delta_order = delta_order
+        self.delta_width = delta_width
+        self.delta_axis = delta_axis
+        self.normalizer = normalizer
+        self._buffers = {}
+
+    @cached_property
+    def _window(self):
+        return _get_cached_window(
+            window=self.window,
+            symmetric_window=False,
+            window_length=self.window_length,
+        )
+
+    @cached_property
+    def _mel_transform(self):
+        return MelTransform(
+            sample_rate=self.sample_rate,
+            stft_size=self.stft_size,
+            number_of_filters=self.number_of_filters,
+            lowest_frequency=self.lowest_frequency,
+            highest_frequency=self.highest_frequency,
+            log=False,
+        )
+
+    @cached_property
+    def _dct_matrix(self):
+        """DCT-II (orthonormal) matrix, truncated to numcep and multiplied
+        with the lifter, i.e. `x @ _dct_matrix == _lifter(dct(x)[:numcep])`.
+        """
+        matrix = dct(
+            np.eye(self.number_of_filters), type=2, axis=-1, norm='ortho',
+        )[:, :self.numcep]
+        return np.ascontiguousarray(_lifter(matrix, self.ceplifter))
+
+    @property
+    def feature_size(self):
+        """The size of the last axis of the output."""
+        size = self.numcep if self.feature == 'mfcc' else self.number_of_filters
+        return size * (self.delta_order + 1)
+
+    def _frames(self, time_signal):
+        """Pads the signal like `segment_axis(..., end='pad')` and returns
+        the frames."""
+        num_samples = time_signal.shape[-1]
+        length, shift = self.window_length, self.stft_shift
+        if num_samples < length:
+            padded = length
+        else:
+            padded = num_samples + (-(num_samples + shift - length)) % shift
+        if padded != num_samples:
+            signal = get_buffer(
+                self._buffers, 'signal', (*time_signal.shape[:-1], padded),
+                time_signal.dtype)
+            signal[..., :num_samples] = time_signal
+            signal[..., num_samples:] = 0
+            time_signal = signal
+        return segment_axis(time_signal, length, shift, axis=-1, end='cut')
+
+    def _stft(self, frames):
+        *independent, num_frames, length = frames.shape
+        # Zero padding to stft_size in the buffer avoids a copy in the FFT.
+        size = max(self.stft_size, self.window_length)
+        windowed = get_buffer(
+            self._buffers, 'windowed', (*independent, num_frames, size),
+            frames.dtype)
+        np.multiply(frames, self._window, out=windowed[..., :length])
+        windowed[..., length:] = 0
+        return rfft(windowed, n=self.stft_size, axis=-1)
+
+    def _spectrogram(self, stft_signal):
+        """`stft_to_spectrogram(stft_signal) / stft_size` in a buffer."""
+        # real ** 2 + imag ** 2
+        real_dtype = stft_signal.real.dtype
+        squared = get_buffer(
+            self._buffers, 'squared', (*stft_signal.shape, 2), real_dtype)
+        np.square(stft_signal.view(real_dtype).reshape(squared.shape),
+                  out=squared)
+        spectrogram = get_buffer(
+            self._buffers, 'spectrogram', stft_signal.shape, real_dtype)
+        np.add(squared[..., 0], squared[..., 1], out=spectrogram)
+        spectrogram /= self.stft_size
+        return spectrogram
+
+    def _features(self, spectrogram, out):
+        """Computes the features without deltas from the spectrogram and
+        writes them into out."""
+        if self.feature == 'mfcc':
+            mel = get_buffer(
+                self._buffers, 'mel',
+                (*spectrogram.shape[:-1], self.number_of_filters),
+                spectrogram.dtype)
+        else:
+            mel = out
+        self._mel_transform.banded_fbanks(spectrogram, out=mel)
+        if self.denoise:
+            mel -= np.min(mel, axis=0)
+        if self.feature != 'fbank':
+            mel += self.eps
+            np.log(mel, out=mel)
+        if self.feature == 'mfcc':
+            np.matmul(mel, self._dct_matrix, out=out)
+        return out
+
+    def _normalize(self, feature, key):
+        if self.normalizer is not None:
+            self.normalizer.apply(feature, key=key)
+        return feature
+
+    def _get_out(self, out, shape, dtype):
+        if out is None:
+            return np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(
+                f'out has the shape {out.shape}, expected {shape}.')
+        return out
+
+    def __call__(
+            self, time_signal: np.ndarray, out: np.ndarray = None, key=None,
+    ):
+        """Computes the features.
+
+        Args:
+            time_signal: Signal with shape (..., samples), e.g.
+                (channels, samples).
+            out: Optional array with shape (..., frames, feature_size) for
+                the result.
+            key: Key of the normalizer statistics, e.g. the speaker.
+
+        Returns:
+            The features with shape (..., frames, feature_size).
+        """
+        time_signal = preemphasis_with_offset_compensation(
+            time_signal, self.preemphasis_factor)
+        spectrogram = self._spectrogram(self._stft(self._frames(time_signal)))
+        out = self._get_out(
+            out, (*spectrogram.shape[:-1], self.feature_size),
+            spectrogram.dtype,
+        )
+        size = self.feature_size // (self.delta_order + 1)
+        feature = self._features(spectrogram, out[..., :size])
+        if self.delta_order > 0:
+            deltas = delta(
+                feature, width=self.delta_width,
+                order=tuple(range(1, self.delta_order + 1)),
+                axis=self.delta_axis,
+            )
+            for order, delta_ in enumerate(deltas, start=1):
+                out[..., order * size:(order + 1) * size] = delta_
+        return self._normalize(out, key)
+
+
+def _delta_kernel(width, order):
+    """The FIR kernel of `delta`, i.e. the `order` times convolved window.
+
+    >>> _delta_kernel(3, 1)
+    array([ 0.5,  0. , -0.5])
+    >>> _delta_kernel(3, 2)
+    array([ 0.25,  0.  , -0.5 ,  0.  ,  0.25])
+    """
+    half_length = 1 + int(width // 2)
+    window = np.arange(half_length - 1., -half_length, -1.)
+    window /= np.sum(np.abs(window)**2)
+    kernel = np.ones(1)
+    for _ in range(order):
+        kernel = np.convolve(kernel, window)
+    return kernel
+
+
+class _StreamingDelta:
+    """Streaming version of `delta` along the frame axis (-2) for the orders
+    1 to `max_order`.
+
+    `delta` pads the features with `width` copies of the first and last
+    frame, filters causally (zero initial state) and cuts the output at a
+    fixed offset. Hence, the delta of frame t depends on the frames up to
+    t + width // 2 (look-ahead) and the padded signal is reproduced here
+    chunk by chunk.
+    """
+    def __init__(self, width, max_order):
+        self.width = width
+        self.kernels = [
+            _delta_kernel(width, order) for order in range(1, max_order + 1)
+        ]
+        # Index of the padded signal, that corresponds to output frame 0.
+        self._offset = 2 * width - 1 - width // 2
+        self._history = max([len(k) - 1 for k in self.kernels], default=0)
+        self.reset()
+
+    @property
+    def look_ahead(self):
+        return self._offset - self.width
+
+    def reset(self):
+        self._buffer = None  # padded frames from index self._start
+        self._start = 0
+        self._num_frames = 0  # number of input frames
+        self._emitted = 0  # number of output frames
+
+    def _emit(self, stop):
+        """Returns the deltas of the output frames up to stop."""
+        start, stop = self._emitted, max(stop, self._emitted)
+        deltas = []
+        for kernel in self.kernels:
+            lo = start + self._offset - (len(kernel) - 1) - self._start
+            # Correlation with the flipped kernel as a sum of shifted slices
+            delta_ = np.zeros(
+                (*self._buffer.shape[:-2], stop - start,
+                 self._buffer.shape[-1]), dtype=self._buffer.dtype)
+            for k, weight in enumerate(kernel[::-1]):
+                if weight != 0:
+                    delta_ += weight * self._buffer[
+                        ..., lo + k:lo + k + stop - start, :]
+            deltas.append(delta_)
+        self._emitted = stop
+        drop = stop + self._offset - self._history - self._start
+        if drop > 0:
+            self._buffer = self._buffer[..., drop:, :]
+            self._start += drop
+        return deltas
+
+    def push(self, features):
+        """Appends the frames (..., frames, D) and returns the list of the
+        deltas (one per order) of the new complete frames."""
+        if self._buffer is None:
+            if features.shape[-2] == 0:
+                return [features.copy() for _ in self.kernels]
+            first = features[..., :1, :]
+            self._start = -self._history
+            self._buffer = np.concatenate([
+                np.zeros_like(first, shape=(
+                    *first.shape[:-2], self._history, first.shape[-1])),
+                np.repeat(first, self.width, axis=-2),
+            ], axis=-2)
+        self._buffer = np.concatenate([self._buffer, features], axis=-2)
+        self._num_frames += features.shape[-2]
+        return self._emit(self._num_frames - self.look_ahead)
+
+    def flush(self):
+        """Returns the deltas of the remaining frames and resets the state.
+        At least one frame has to be pushed before."""
+        assert self._buffer is not None, 'No frames were pushed.'
+        last = self._buffer[..., -1:, :]
+        self._buffer = np.concatenate(
+            [self._buffer, np.repeat(last, self.width, axis=-2)], axis=-2)
+        ret = self._emit(self._num_frames)
+        self.reset()
+        return ret
+
+
+class StreamingFeatureExtractor(FeatureExtractor):
+    """
+    Stateful FeatureExtractor for chunked (e.g. real-time) processing.
+
+    Each call of `push` filters a chunk of samples and returns only the
+    feature frames, that are complete. The preemphasis/offset compensation
+    filter state, the STFT overlap (see StreamingSTFT) and the context of the
+    deltas are kept for the next call. `flush` finishes the signal and
+    returns the remaining frames. The concatenation of all returned frames
+    is the same as `__call__` (and hence `fbank`, `logfbank`, `mfcc` or
+    `mfcc_velocity_acceleration`) of the concatenated chunks.
+
+    Deltas along the frame axis (`delta_axis=-2`) need `look_ahead` future
+    frames, i.e. the features of a frame are returned `look_ahead` frames
+    later. Deltas along the feature axis (the default) have no latency.
+
+    The arguments are the same as for FeatureExtractor, except that
+    `denoise` is not supported, because it needs the complete signal.
+
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> streaming = StreamingFeatureExtractor(
+    ...     'mfcc', delta_order=2, delta_axis=-2)
+    >>> streaming.look_ahead
+    4
+    >>> streaming.push(x[:, :1000]).shape
+    (2, 0, 39)
+    >>> streaming.push(x[:, 1000:]).shape
+    (2, 44, 39)
+    >>> streaming.flush().shape
+    (2, 5, 39)
+    >>> streaming(x).shape
+    (2, 49, 39)
+    """
+    def __init__(self, feature: str = 'mfcc', **kwargs):
+        super().__init__(feature, **kwargs)
+        if self.denoise:
+            raise ValueError(
+                'denoise needs the complete signal and is not supported by '
+                'the StreamingFeatureExtractor.')
+        self._streaming_stft = StreamingSTFT(
+            size=self.stft_size,
+            shift=self.stft_shift,
+            window=self.window,
+            window_length=self.window_length,
+            fading=None,
+        )
+        self._streaming_delta = _StreamingDelta(
+            self.delta_width, self.delta_order)
+        self.reset()
+
+    @property
+    def look_ahead(self):
+        """Number of frames, that are delayed by the deltas along the frame
+        axis."""
+        if self.delta_order > 0 and self.delta_axis == -2:
+            return self._streaming_delta.look_ahead
+        return 0
+
+    def reset(self):
+        """Drops the internal state, i.e. the next chunk starts a new
+        signal."""
+        self._zi = None
+        self._pending = None
+        self._streaming_stft.reset()
+        self._streaming_delta.reset()
+
+    def _process(self, stft_signal, key, flush=False):
+        spectrogram = self._spectrogram(stft_signal)
+        size = self.feature_size // (self.delta_order + 1)
+        feature = self._features(
+            spectrogram,
+            np.empty((*spectrogram.shape[:-1], size), spectrogram.dtype),
+        )
+        if self.delta_order == 0:
+            return self._normalize(feature, key)
+
+        delta_axis = self.delta_axis % feature.ndim
+        if delta_axis == feature.ndim - 2:
+            # Keep the features until their deltas are complete.
+            deltas = self._streaming_delta.push(feature)
+            if flush:
+                deltas = [
+                    np.concatenate([d, d_], axis=-2)
+                    for d, d_ in zip(deltas, self._streaming_delta.flush())
+                ]
+            if self._pending is not None:
+                feature = np.concatenate([self._pending, feature], axis=-2)
+            frames = deltas[0].shape[-2]
+            feature, self._pending = (
+                feature[..., :frames, :], feature[..., frames:, :])
+        elif feature.size == 0:
+            deltas = [feature] * self.delta_order
+        else:
+            deltas = list(delta(
+                feature, width=self.delta_width,
+                order=tuple(range(1, self.delta_order + 1)),
+                axis=self.delta_axis,
+            ))
+        return self._normalize(
+            np.concatenate([feature, *deltas], axis=-1), key)
+
+    def push(self, chunk, key=None):
+        """
+        Args:
+            chunk: Time signal with shape (..., samples).
+            key: Key of the normalizer statistics, e.g. the speaker.
+
+        Returns:
+            The new complete feature frames with shape
+            (..., frames, feature_size).
+        """
+        chunk = np.asarray(chunk)
+        if self._zi is None:
+            self._zi = np.zeros((*chunk.shape[:-1], 2))
+        if chunk.shape[-1] == 0:
+            # lfilter returns an uninitialized state for empty signals.
+            return self._process(self._streaming_stft.push(chunk), key)
+        time_signal, self._zi = preemphasis_with_offset_compensation(
+            chunk, self.preemphasis_factor, zi=self._zi)
+        return self._process(self._streaming_stft.push(time_signal), key)
+
+    def flush(self, key=None):
+        """
+        Returns the remaining feature frames with shape
+        (..., frames, feature_size). Afterwards, the object is reset.
+
+        Args:
+            key: Key of the normalizer statistics, e.g. the speaker.
+        """
+        ret = self._process(self._streaming_stft.flush(), key, flush=True)
+        self.reset()
+        return ret
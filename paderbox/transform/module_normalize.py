@@ -10,3 +10,178 @@ def normalize_mean_variance(data, axis=0, eps=1e-6):
     """
     return ((data - np.mean(data, axis=axis, keepdims=True)) /
             (np.std(data, axis=axis, keepdims=True) + eps))
+
+
+class RunningMeanVariance:
+    def __init__(self, axis=0, eps=1e-6):
+        """Mean and variance statistics, that are accumulated online.
+
+        Computes the statistics of `normalize_mean_variance` for data, that
+        does not fit into the memory (e.g. dataset-level CMVN): Each
+        `update` merges the statistics of a batch with the accumulated ones
+        (Welford's algorithm in the batched form of Chan et al.), i.e. the
+        result is the same as for the concatenated batches (up to
+        rounding). The statistics of different processes can be combined
+        with `merge` and transferred with `serialize`/`deserialize`.
+
+        The statistics are kept per feature dimension (all axes, that are
+        not in `axis`) and per key (e.g. speaker). The key None is used,
+        when no key is given.
+
+        Args:
+            axis: The axis or axes to reduce, e.g. the time axis. All
+                updates and the data for `apply` must have the same number
+                of dimensions.
+            eps: See normalize_mean_variance.
+
+        >>> data = np.random.normal(size=(1000, 20))
+        >>> statistics = RunningMeanVariance()
+        >>> for batch in np.split(data, [100, 150, 600]):
+        ...     _ = statistics.update(batch)
+        >>> np.allclose(statistics.mean(), np.mean(data, axis=0))
+        True
+        >>> np.allclose(
+        ...     statistics.apply(data.copy()), normalize_mean_variance(data))
+        True
+
+        Per key statistics (e.g. speakers) from different processes:
+        >>> a = RunningMeanVariance().update(data[:300], key='spk1')
+        >>> b = RunningMeanVariance().update(data[300:], key='spk2')
+        >>> sorted(b.update(data[:10], key='spk1').merge(a).keys())
+        ['spk1', 'spk2']
+        >>> b.count('spk1')
+        310
+        >>> c = RunningMeanVariance.deserialize(b.serialize())
+        >>> np.array_equal(c.variance('spk2'), b.variance('spk2'))
+        True
+        """
+        self.axis = axis
+        self.eps = eps
+        self._statistics = {}
+
+    def _axis(self, ndim):
+        axis = (self.axis,) if np.isscalar(self.axis) else self.axis
+        return tuple(sorted(a % ndim for a in axis))
+
+    def _merge_statistics(self, key, count, mean, m2):
+        if count == 0:
+            return
+        if key not in self._statistics:
+            self._statistics[key] = (count, mean, m2)
+            return
+        count_a, mean_a, m2_a = self._statistics[key]
+        if mean_a.shape != mean.shape:
+            raise ValueError(
+                f'The statistics for {key!r} have the shape {mean_a.shape}, '
+                f'but the new statistics have the shape {mean.shape}.'
+            )
+        total = count_a + count
+        delta = mean - mean_a
+        self._statistics[key] = (
+            total,
+            mean_a + delta * (count / total),
+            m2_a + m2 + delta ** 2 * (count_a * count / total),
+        )
+
+    def update(self, batch, key=None):
+        """Adds the statistics of batch.
+
+        Args:
+            batch: Array, that is reduced along axis.
+            key: Hashable key, e.g. the speaker ID.
+
+        Returns:
+            self
+        """
+        batch = np.asarray(batch)
+        axis = self._axis(batch.ndim)
+        count = int(np.prod([batch.shape[a] for a in axis]))
+        if count > 0:
+            mean = np.mean(batch, axis=axis, dtype=np.float64, keepdims=True)
+            m2 = np.sum(
+                np.square(batch - mean, dtype=np.float64), axis=axis)
+            self._merge_statistics(key, count, np.squeeze(mean, axis), m2)
+        return self
+
+    def merge(self, other: 'RunningMeanVariance'):
+        """Adds the statistics of all keys of other.
+
+        Returns:
+            self
+        """
+        for key, (count, mean, m2) in other._statistics.items():
+            self._merge_statistics(key, count, mean, m2)
+        return self
+
+    def keys(self):
+        return list(self._statistics.keys())
+
+    def count(self, key=None):
+        """The number of reduced values per feature dimension."""
+        return self._statistics[key][0]
+
+    def mean(self, key=None):
+        return self._statistics[key][1]
+
+    def variance(self, key=None):
+        count, _, m2 = self._statistics[key]
+        return m2 / count
+
+    def std(self, key=None):
+        return np.sqrt(self.variance(key))
+
+    def apply(self, data, key=None):
+        """Normalizes data with the statistics of key in place (if data is a
+        writeable float array), i.e. `normalize_mean_variance` with the
+        accumulated statistics.
+
+        Returns:
+            The normalized data.
+        """
+        if not (
+                isinstance(data, np.ndarray)
+                and np.issubdtype(data.dtype, np.floating)
+                and data.flags.writeable
+        ):
+            data = np.array(data, dtype=np.float64)
+        axis = self._axis(data.ndim)
+        mean = np.expand_dims(self.mean(key), axis)
+        scale = np.expand_dims(self.std(key) + self.eps, axis)
+        data -= mean.astype(data.dtype, copy=False)
+        data /= scale.astype(data.dtype, copy=False)
+        return data
+
+    def serialize(self):
+        """Returns the statistics as a dict of builtin types (e.g. for json
+        or pickle). The keys have to be serializable, too."""
+        return {
+            'axis': self.axis,
+            'eps': self.eps,
+            'statistics': [
+                {
+                    'key': key,
+                    'count': count,
+                    'mean': mean.tolist(),
+                    'm2': m2.tolist(),
+                }
+                for key, (count, mean, m2) in self._statistics.items()
+            ],
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        """Inverse of `serialize`."""
+        axis = data['axis']
+        self = cls(
+            axis=axis if np.isscalar(axis) else tuple(axis), eps=data['eps'])
+        for entry in data['statistics']:
+            key = entry['key']
+            if isinstance(key, list):
+                # json converts tuples to lists
+                key = tuple(key)
+            self._statistics[key] = (
+                entry['count'],
+                np.array(entry['mean'], dtype=np.float64),
+                np.array(entry['m2'], dtype=np.float64),
+            )
+        return self
@@ -1,49 +1,109 @@
-from copy import deepcopy
-
 import numpy as np
 import paderbox.math.directional as directional
 
 
-def transform_to_baseband(X, size, shift):
+def _baseband_phase_ramp(frames, bins, size, shift):
+    """Phase `2 pi t f shift / size` of the baseband transform for the
+    frames t and the frequency bins f, reduced to [0, 2 pi).
+
+    For integer size and shift the product is reduced with integer
+    arithmetic, hence the angle is exact also for long signals.
+
+    >>> _baseband_phase_ramp(3, 3, 4, 1) / np.pi
+    array([[0. , 0. , 0. ],
+           [0. , 0.5, 1. ],
+           [0. , 1. , 0. ]])
+    """
+    t = np.arange(frames)[:, None]
+    f = np.arange(bins)
+    if float(size).is_integer() and float(shift).is_integer():
+        size, shift = int(size), int(shift)
+        return (2 * np.pi / size) * ((t * shift % size) * f % size)
+    return 2 * np.pi * (t * f * shift / size % 1)
+
+
+def transform_to_baseband(X, size, shift, *, time_axis=-3, out=None):
     """Assumes linear frequency dependency.
 
     Then phase is more consistent over frequencies.
 
+    Multiplies each STFT bin with `exp(-2j pi t f shift / size)`, where t is
+    the frame index and f the frequency bin index.
+
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (..., T, C, F), the frequency axis is the
+            last axis.
+        size: STFT size
+        shift: STFT shift
+        time_axis: The frame axis of X, e.g. -2 for (..., T, F).
+        out: Optional array for the result, e.g. X for an in-place
+            transformation.
 
     Returns:
+        The baseband STFT with the same shape as X.
 
+    >>> X = np.ones((3, 1, 3), dtype=np.complex128)
+    >>> np.round(transform_to_baseband(X, 4, 1)[:, 0, :], 10)
+    array([[ 1.+0.j,  1.+0.j,  1.+0.j],
+           [ 1.+0.j,  0.-1.j, -1.-0.j],
+           [ 1.+0.j, -1.-0.j,  1.+0.j]])
+    >>> transform_to_baseband(np.ones((2, 5, 3, 4, 9)), 16, 4).shape
+    (2, 5, 3, 4, 9)
     """
-    X = deepcopy(X)
-    T, _, F = X.shape
-    for t in range(T):
-        for f in range(F):
-            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
-    return X
+    X = np.asarray(X)
+    ramp = np.exp(-1j * _baseband_phase_ramp(
+        X.shape[time_axis], X.shape[-1], size, shift))
+    time_axis = time_axis % X.ndim
+    ramp = ramp.reshape(
+        ramp.shape[:1] + (1,) * (X.ndim - time_axis - 2) + ramp.shape[1:])
+    return np.multiply(X, ramp, out=out)
 
 
-def get_phase_features(X, size, shift):
+def get_phase_features(X, size, shift, *, time_axis=-3):
     """Experimental phase features for SPP estimation.
 
     These experimental features were originally used because the phase
     differences, at least when small STFT shifts are used, correspond better
     to SPP than the phase itself.
 
+    The phase of the baseband STFT is computed as the angle of X minus the
+    phase ramp of `transform_to_baseband` (no complex baseband signal is
+    needed) and the three features are written into one array.
+
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (..., T, C, F), the frequency axis is the
+            last axis.
+        size: STFT size
+        shift: STFT shift
+        time_axis: The frame axis of X, e.g. -2 for (..., T, F).
 
     Returns:
+        phase, delta and delta_delta (the wrapped phase difference and its
+        difference between neighbouring frames) with the shape of X.
+        They are views on one array with shape (3, *X.shape).
 
+    >>> X = np.random.normal(size=(10, 2, 5)) + 1j
+    >>> phase, delta, delta_delta = get_phase_features(X, 8, 2)
+    >>> np.allclose(phase, np.angle(transform_to_baseband(X, 8, 2)))
+    True
+    >>> delta[0, 0]
+    array([0., 0., 0., 0., 0.])
     """
-    X_base = transform_to_baseband(X, size, shift)
-    phase = np.angle(X_base)
-    delta = np.zeros_like(phase)
-    delta[1:, ...] = directional.minus(phase[1:, ...], phase[:-1, ...])
-    delta_delta = np.zeros_like(phase)
-    delta_delta[1:, ...] = delta[1:, ...] - delta[:-1, ...]
-    return phase, delta, delta_delta
+    X = np.asarray(X)
+    time_axis = time_axis % X.ndim
+    features = np.empty((3, *X.shape), dtype=X.real.dtype)
+    phase, delta, delta_delta = np.moveaxis(features, time_axis + 1, 1)
+
+    np.arctan2(X.imag, X.real, out=features[0])
+    # phase has the frame axis in front and the frequency axis at the end.
+    ramp = _baseband_phase_ramp(X.shape[time_axis], X.shape[-1], size, shift)
+    phase -= ramp.reshape(
+        ramp.shape[:1] + (1,) * (X.ndim - 2) + ramp.shape[1:])
+    directional.wrap(phase, out=phase)
+
+    delta[0] = 0
+    np.subtract(phase[1:], phase[:-1], out=delta[1:])
+    directional.wrap(delta[1:], out=delta[1:])
+    delta_delta[0] = 0
+    np.subtract(delta[1:], delta[:-1], out=delta_delta[1:])
+    return features[0], features[1], features[2]
@@ -1,5 +1,23 @@
+import typing
+
 import numpy as np
+from paderbox.array import segment_axis
+from paderbox.transform._buffers import get_buffer
+from paderbox.transform.module_fft import rfft, irfft
 from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import _fading_pad_width
+from paderbox.transform.module_stft import _get_cached_synthesis_window
+from paderbox.transform.module_stft import _get_cached_window
+from paderbox.transform.module_stft import _overlap_add
+from paderbox.transform.module_stft import _stft_frames_to_samples
+
+
+def _get_rng(rng):
+    """None means the global legacy random state (np.random), otherwise see
+    np.random.default_rng."""
+    if rng is None:
+        return np.random
+    return np.random.default_rng(rng)
 
 
 def _griffin_lim_step(
@@ -17,7 +35,7 @@ def _griffin_lim_step(
     return reconstruction_stft, audio
 
 
-def griffin_lim(x, stft: STFT, iterations=100, verbose=False):
+def griffin_lim(x, stft: STFT, iterations=100, verbose=False, rng=None):
     """
     Reconstructs phase from magnitudes using Griffin-Lim algorithm and returns
     audio signal in time domain.
@@ -27,6 +45,8 @@ def griffin_lim(x, stft: STFT, iterations=100, verbose=False):
         stft:
         iterations:
         verbose:
+        rng: Seed or `np.random.Generator` for the initialization.
+            None uses the global `np.random`.
 
     Returns: audio signal
 
@@ -42,7 +62,7 @@ def griffin_lim(x, stft: STFT, iterations=100, verbose=False):
     nframes = x.shape[-2]
     nsamples = int(stft.frames_to_samples(nframes))
     # Initialize the reconstructed signal.
-    audio = np.random.randn(nsamples)
+    audio = _get_rng(rng).standard_normal(nsamples)
     reconstruction_stft = stft(audio)
     for n in range(iterations):
         reconstruction_stft, audio = _griffin_lim_step(
@@ -69,6 +89,7 @@ def fast_griffin_lim(
     alpha=0.99,
     iterations=100,
     verbose=False,
+    rng=None,
 ):
     """Griffin-Lim algorithm with momentum for phase retrieval [1, 2].
 
@@ -89,6 +110,8 @@ def fast_griffin_lim(
         iterations: Number of optimization iterations
         verbose: If True, print the reconstruction error after each iteration
             step
+        rng: Seed or `np.random.Generator` for the random phase
+            initialization. None uses the global `np.random`.
 
     >>> f_0 = 200
     >>> f_s = 16_000
@@ -109,7 +132,7 @@ def fast_griffin_lim(
         raise ValueError(f'alpha must be in [0, 1], but is {alpha}.')
 
     # Random phase initialization
-    angle = np.random.uniform(low=-np.pi, high=np.pi, size=x.shape)
+    angle = _get_rng(rng).uniform(low=-np.pi, high=np.pi, size=x.shape)
     reconstruction_stft = x * np.exp(1.0j * angle)
 
     y = reconstruction_stft  # Stores accelerated STFT reconstruction
@@ -130,3 +153,235 @@ def fast_griffin_lim(
             )
 
     return audio
+
+
+def griffin_lim_batch(
+    x: typing.Sequence[np.ndarray],
+    stft: STFT,
+    alpha=0.,
+    iterations=100,
+    tolerance=None,
+    verbose=False,
+    rng=None,
+    batch_size=4,
+):
+    """Griffin-Lim for a ragged batch of magnitude spectrograms.
+
+    The magnitudes are sorted by length and processed in batches of
+    `batch_size` signals, that are zero padded to the longest one in the
+    batch. Each iteration does a single (vectorized) istft and stft for the
+    whole batch. The windows are computed once and the buffers for the
+    overlap-add, the windowed frames and the STFT estimates are allocated
+    once and reused for all iterations and batches. The result is the same
+    as `[fast_griffin_lim(x_, stft, alpha, iterations, rng=rng) for x_ in x]`,
+    when rng is a `np.random.Generator`.
+
+    Args:
+        x: List of magnitude spectrograms with shape
+            (*, num_frames_i, stft.size//2+1). Only num_frames may differ.
+        stft: paderbox.transform.module_stft.STFT instance
+        alpha: Momentum (see fast_griffin_lim), where 0 <= alpha <= 1.
+            0 is the original Griffin-Lim algorithm.
+        iterations: Maximum number of iterations. For 0, the istft of the
+            random initialization is returned.
+        tolerance: If not None, the iterations of a signal stop, when its
+            spectral convergence
+            `||x - |STFT(audio)|||_F / ||x||_F` is below tolerance.
+            The finished signals are removed from the batch.
+        verbose: If True, print the reconstruction error after each iteration
+            step
+        rng: Seed or `np.random.Generator` for the random phase
+            initialization. None uses the global `np.random`.
+        batch_size: Number of signals that are processed together. Larger
+            batches reduce the python overhead for short signals, but the
+            intermediate arrays should fit into the CPU caches.
+
+    Returns:
+        List of audio signals with shape (*, num_samples_i).
+
+    >>> stft = STFT(200, 1024, window_length=800, fading=False, pad=True)
+    >>> t = np.arange(16_000) / 16_000
+    >>> x = [np.abs(stft(np.sin(2*np.pi*f*t[:n])))
+    ...      for f, n in [(200, 16_000), (300, 8_000)]]
+    >>> [a.shape for a in x]
+    [(77, 513), (37, 513)]
+    >>> audio = griffin_lim_batch(x, stft, alpha=0.99, iterations=5, rng=0)
+    >>> [a.shape for a in audio]
+    [(16000,), (8000,)]
+    """
+    if not 0. <= alpha <= 1.:
+        raise ValueError(f'alpha must be in [0, 1], but is {alpha}.')
+
+    x = [np.asarray(x_) for x_ in x]
+    real_dtype = np.float64 if stft.dtype is None else np.dtype(stft.dtype)
+    complex_dtype = np.result_type(real_dtype, np.complex64)
+
+    # Random phase initialization, drawn per signal in the same order and
+    # way as fast_griffin_lim.
+    rng = _get_rng(rng)
+    initial_stft = [
+        (x_ * np.exp(1.0j * rng.uniform(
+            low=-np.pi, high=np.pi, size=x_.shape
+        ))).astype(complex_dtype, copy=False)
+        for x_ in x
+    ]
+    if iterations < 1:
+        return [stft.inverse(initial_stft_) for initial_stft_ in initial_stft]
+
+    window = _get_cached_window(
+        stft.window, stft.symmetric_window, stft.window_length
+    ).astype(real_dtype, copy=False)
+    synthesis_window = _get_cached_synthesis_window(
+        stft.window, stft.symmetric_window, stft.window_length, stft.shift
+    ).astype(real_dtype, copy=False)
+
+    buffers = {}
+    audio = [None] * len(x)
+    order = np.argsort([x_.shape[-2] for x_ in x], kind='stable')
+    for start in range(0, len(order), batch_size):
+        index = order[start:start + batch_size]
+        audio_ = _griffin_lim_batch(
+            [x[i] for i in index],
+            [initial_stft[i] for i in index],
+            stft=stft,
+            window=window,
+            synthesis_window=synthesis_window,
+            alpha=alpha,
+            iterations=iterations,
+            tolerance=tolerance,
+            verbose=verbose,
+            buffers=buffers,
+        )
+        for i, a in zip(index, audio_):
+            audio[i] = a
+    return audio
+
+
+def _griffin_lim_batch(
+    x, initial_stft, stft, window, synthesis_window, alpha, iterations,
+    tolerance, verbose, buffers,
+):
+    frames = np.array([x_.shape[-2] for x_ in x], dtype=int)
+    num_samples = np.array(
+        _stft_frames_to_samples(
+            frames, stft.window_length, stft.shift, fading=stft.fading),
+        dtype=int,
+    )
+    real_dtype = window.dtype
+    complex_dtype = initial_stft[0].dtype
+    size, shift, window_length = stft.size, stft.shift, stft.window_length
+
+    independent = x[0].shape[:-2]
+    shape = (len(x), *independent, np.max(frames), size // 2 + 1)
+    ones = (1,) * len(independent)
+
+    magnitude = np.zeros(shape, dtype=real_dtype)
+    reconstruction_stft = np.zeros(shape, dtype=complex_dtype)
+    for i, (x_, initial_stft_) in enumerate(zip(x, initial_stft)):
+        magnitude[i, ..., :x_.shape[-2], :] = x_
+        reconstruction_stft[i, ..., :x_.shape[-2], :] = initial_stft_
+    y = get_buffer(buffers, 'y', shape, complex_dtype)
+    y[...] = reconstruction_stft
+
+    # The istft signal before the removal of the fading, i.e. the stft of the
+    # (zero padded) audio is a strided view on this buffer.
+    left = _fading_pad_width(window_length, shift, stft.fading)[0]
+    time_length = shape[-2] * shift + window_length - shift
+    sample_mask = (
+        np.arange(time_length) - left
+        < num_samples.reshape(-1, *ones, 1)
+    ) & (np.arange(time_length) >= left)
+    frame_mask = (
+        np.arange(shape[-2]) < frames.reshape(-1, *ones, 1)
+    )[..., None]
+
+    norm = np.sqrt(np.sum(
+        magnitude ** 2, axis=tuple(range(1, magnitude.ndim))
+    )) + 1e-5
+    index = np.arange(len(x))  # Position of each active signal in x
+    audio = [None] * len(x)
+
+    for n in range(iterations):
+        active = len(index)
+        y = y[:active]
+        time_signal = get_buffer(
+            buffers, 'time_signal', (active, *shape[1:-2], time_length),
+            real_dtype,
+        )
+        windowed = get_buffer(
+            buffers, 'windowed', (active, *shape[1:-1], window_length),
+            real_dtype,
+        )
+        abs_ = get_buffer(buffers, 'abs', (active, *shape[1:]), real_dtype)
+        proposal = get_buffer(
+            buffers, 'proposal', (active, *shape[1:]), complex_dtype)
+
+        # Discard magnitude part of the reconstruction and use the supplied
+        # magnitude spectrogram instead, i.e. x * exp(1j * angle(y)).
+        np.abs(y, out=abs_)
+        np.divide(y, abs_, out=proposal, where=abs_ != 0)
+        proposal[abs_ == 0] = 1
+        proposal *= magnitude
+
+        # istft
+        np.multiply(
+            irfft(proposal, n=size)[..., :window_length],
+            synthesis_window, out=windowed,
+        )
+        time_signal.fill(0)
+        _overlap_add(windowed, shift, time_signal)
+        # Remove the fading and cut the signal
+        time_signal *= sample_mask
+
+        # stft
+        np.multiply(
+            segment_axis(time_signal, window_length, shift, end='cut'),
+            window, out=windowed,
+        )
+        rec_stft = rfft(windowed, n=size, axis=-1).astype(
+            complex_dtype, copy=False)
+        rec_stft *= frame_mask
+
+        # Momentum: y = rec + alpha * (rec - reconstruction_stft)
+        np.subtract(rec_stft, reconstruction_stft, out=y)
+        y *= alpha
+        y += rec_stft
+        reconstruction_stft = rec_stft
+
+        if verbose or tolerance is not None:
+            np.abs(reconstruction_stft, out=abs_)
+            abs_ -= magnitude
+            # Spectral Convergence
+            diff = np.sqrt(np.sum(
+                abs_ ** 2, axis=tuple(range(1, abs_.ndim))
+            )) / norm
+            if verbose:
+                print(
+                    'Reconstruction iteration: {}/{} SC: {} dB'.format(
+                        n, iterations, 10 * np.log10(diff)
+                    )
+                )
+
+        if n == iterations - 1:
+            finished = np.ones(active, dtype=bool)
+        elif tolerance is not None:
+            finished = diff < tolerance
+        else:
+            continue
+
+        for i in np.flatnonzero(finished):
+            audio[index[i]] = time_signal[
+                i, ..., left:left + num_samples[index[i]]].copy()
+        if np.any(finished):
+            keep = ~finished
+            if not np.any(keep):
+                break
+            index = index[keep]
+            magnitude = magnitude[keep]
+            reconstruction_stft = reconstruction_stft[keep]
+            y[:len(index)] = y[keep]
+            norm = norm[keep]
+            sample_mask = sample_mask[keep]
+            frame_mask = frame_mask[keep]
+
+    return audio
@@ -1,7 +1,15 @@
 """
 This module contains resampling methods.
 """
+import collections
+import concurrent.futures
+import functools
+import os
 import subprocess
+import threading
+import time
+from fractions import Fraction
+
 import numpy as np
 
 
@@ -147,4 +155,252 @@ def resample_sox(signal: np.ndarray, *, in_rate, out_rate, normalize=True):
 
     return signal_resampled
 
+
+# Number of filters (one per resampling ratio), that are kept in memory.
+_FILTER_CACHE_SIZE = 16
+
+
+@functools.lru_cache(maxsize=_FILTER_CACHE_SIZE)
+def _get_resample_filter(up, down, bandwidth, attenuation):
+    """Linear phase lowpass (Kaiser window) for the polyphase resampling
+    with the factors up and down.
+
+    The passband ends at `bandwidth` times the lower Nyquist frequency and
+    the stopband (`attenuation` dB) starts at the lower Nyquist frequency
+    (i.e. no aliasing), similar to the default ("high") quality of SoX.
+    The design of long filters (e.g. 16 kHz -> 44.1 kHz) is expensive,
+    hence the filters are cached. The returned array is read-only.
+
+    >>> h = _get_resample_filter(1, 2, 0.95, 120)
+    >>> h.shape
+    (627,)
+    >>> h is _get_resample_filter(1, 2, 0.95, 120)
+    True
+    """
+    import scipy.signal
+    cutoff = 1 / max(up, down)  # relative to the Nyquist frequency
+    numtaps, beta = scipy.signal.kaiserord(
+        attenuation, (1 - bandwidth) * cutoff)
+    numtaps += 1 - numtaps % 2  # odd length, i.e. an integer delay
+    h = scipy.signal.firwin(
+        numtaps, (1 + bandwidth) / 2 * cutoff, window=('kaiser', beta))
+    h.setflags(write=False)
+    return h
+
+
+def resample_poly(
+        signal: np.ndarray, *, in_rate, out_rate, axis=-1,
+        bandwidth=0.95, attenuation=120,
+):
+    """Resample in process with a rational polyphase filter.
+
+    Alternative to `resample_sox` without a subprocess: The ratio
+    out_rate / in_rate is reduced to up / down and the signal is filtered
+    with `scipy.signal.resample_poly` and a cached, linear phase Kaiser
+    lowpass (see `_get_resample_filter`). The delay of the filter is
+    compensated and the output has ceil(T * out_rate / in_rate) samples.
+
+    Deviation from `resample_sox` (SoX, default "high" quality): Both are
+    linear phase lowpass filters with a passband up to 95 % of the lower
+    Nyquist frequency. For signal content below 90 % of the lower Nyquist
+    frequency this function deviates from the ideal (band limited)
+    resampling by less than 1e-6 relative to the signal RMS, while SoX has
+    a passband ripple of up to about 0.01 dB. Hence, the relative RMS
+    difference to SoX is in the order of 1e-3 (see
+    tests/transform_tests/test_resample.py). The results differ more in the
+    transition band (95 % to 100 % of the lower Nyquist frequency), in the
+    first and last samples (border handling) and in the number of samples
+    (SoX rounds the length).
+    No normalization is applied, because there is no clipping.
+
+    Args:
+        signal: Signal with shape (..., T, ...), e.g. (T,), (channels, T)
+            or (batch, channels, T). Integer signals are converted to
+            float64. float32 signals stay float32.
+        in_rate: Sample rate of the signal.
+        out_rate: Desired sample rate. The ratio out_rate / in_rate has to
+            be rational, e.g. integer sample rates.
+        axis: Time axis.
+        bandwidth: Passband edge relative to the lower Nyquist frequency.
+        attenuation: Stopband attenuation in dB.
+
+    Returns:
+        Resampled signal with the same dtype (float) as the input.
+
+    >>> signal = np.array([1, -1, 1, -1], dtype=np.float32)
+    >>> resample_poly(signal, in_rate=1, out_rate=1)
+    array([ 1., -1.,  1., -1.], dtype=float32)
+    >>> t = np.arange(16000) / 16000
+    >>> x = np.sin(2 * np.pi * 440 * t)
+    >>> y = resample_poly(x, in_rate=16000, out_rate=8000)
+    >>> y.shape
+    (8000,)
+    >>> np.max(np.abs(y[1000:-1000] - x[::2][1000:-1000])) < 1e-5
+    True
+    >>> resample_poly(
+    ...     np.zeros((2, 3, 441), np.float32), in_rate=44100, out_rate=16000
+    ... ).shape
+    (2, 3, 160)
+    """
+    import scipy.signal
+
+    signal = np.asarray(signal)
+    if not np.issubdtype(signal.dtype, np.floating):
+        signal = signal.astype(np.float64)
+
+    ratio = Fraction(out_rate) / Fraction(in_rate)
+    up, down = ratio.numerator, ratio.denominator
+    if up == down == 1:
+        return signal.copy()
+    h = _get_resample_filter(up, down, bandwidth, attenuation)
+    return scipy.signal.resample_poly(
+        signal, up, down, axis=axis, window=h.astype(signal.dtype),
+    ).astype(signal.dtype, copy=False)
+
+
+class SoxResampler:
+    def __init__(
+            self, *, in_rate, out_rate, normalize=True, workers=None,
+            max_pending=None,
+    ):
+        """Pool to resample many signals with `resample_sox`.
+
+        Each signal needs its own sox process (sox reads until the end of
+        stdin), but up to `workers` sox processes run concurrently: The
+        threads of the pool only wait for the processes, hence the
+        resampling of thousands of files is not serialized by fork/exec and
+        the pipe copies. At most `max_pending` signals are submitted and not
+        yet finished, i.e. `submit` blocks, when the queue is full, which
+        bounds the memory for large corpora. Normalization and dtype are
+        the same as for `resample_sox`.
+
+        Args:
+            in_rate: Default input sample rate, see `resample_sox`.
+            out_rate: Default output sample rate, see `resample_sox`.
+            normalize: See `resample_sox`.
+            workers: Number of concurrent sox processes. Default is the
+                number of CPUs.
+            max_pending: Maximum number of submitted and unfinished signals.
+                Default is 2 * workers.
+
+        >>> import shutil, pytest
+        >>> if shutil.which('sox') is None:
+        ...     pytest.skip('sox is not installed')
+        >>> signals = [np.random.normal(size=(2, 16000)) for _ in range(10)]
+        >>> with SoxResampler(in_rate=16000, out_rate=8000, workers=4) as r:
+        ...     resampled = list(r.map(signals))
+        >>> [s.shape for s in resampled[:2]]
+        [(2, 8000), (2, 8000)]
+        >>> r.throughput()['signals']
+        10
+        """
+        if workers is None:
+            workers = os.cpu_count()
+        if max_pending is None:
+            max_pending = 2 * workers
+        assert max_pending >= workers, (max_pending, workers)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.normalize = normalize
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='SoxResampler')
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._signals = 0
+        self._samples = 0
+        self._audio_seconds = 0.
+        self._start = None
+        self._end = None
+
+    def _resample(self, signal, in_rate, out_rate):
+        signal = resample_sox(
+            signal, in_rate=in_rate, out_rate=out_rate,
+            normalize=self.normalize,
+        )
+        with self._lock:
+            self._signals += 1
+            self._samples += signal.shape[-1]
+            self._audio_seconds += signal.shape[-1] / out_rate
+            self._end = time.perf_counter()
+        return signal
+
+    def submit(self, signal, *, in_rate=None, out_rate=None):
+        """Submits a signal for resampling and returns a
+        `concurrent.futures.Future` of the resampled signal.
+
+        Blocks, while `max_pending` signals are not finished.
+
+        Args:
+            signal: See `resample_sox`.
+            in_rate: Overwrites the default in_rate.
+            out_rate: Overwrites the default out_rate.
+        """
+        in_rate = self.in_rate if in_rate is None else in_rate
+        out_rate = self.out_rate if out_rate is None else out_rate
+        self._pending.acquire()
+        try:
+            with self._lock:
+                if self._start is None:
+                    self._start = time.perf_counter()
+            future = self._executor.submit(
+                self._resample, signal, in_rate, out_rate)
+        except BaseException:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
+
+    def map(self, signals):
+        """Resamples the signals and yields the results in the same order.
+
+        The signals are consumed lazily, i.e. at most `max_pending`
+        signals (submitted or finished, but not yet yielded) are in memory
+        at the same time.
+        """
+        futures = collections.deque()
+        for signal in signals:
+            if len(futures) >= self.max_pending:
+                yield futures.popleft().result()
+            futures.append(self.submit(signal))
+            while futures and futures[0].done():
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+    def throughput(self):
+        """Statistics of the finished signals.
+
+        Returns:
+            dict with the number of signals, the number of output samples,
+            the duration of the output audio in seconds, the wall clock time
+            from the first submission to the last finished signal and the
+            real time factor (audio seconds per wall clock second).
+        """
+        with self._lock:
+            if self._start is None or self._end is None:
+                wall = 0.
+            else:
+                wall = self._end - self._start
+            return {
+                'signals': self._signals,
+                'samples': self._samples,
+                'audio_seconds': self._audio_seconds,
+                'wall_seconds': wall,
+                'realtime_factor': (
+                    self._audio_seconds / wall if wall > 0 else float('nan')),
+            }
+
+    def close(self, wait=True):
+        """Waits for the submitted signals and stops the threads."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 resample = resample_sox
@@ -1,13 +1,17 @@
 """
 This file contains the STFT function and related helper functions.
 """
+import contextlib
+import itertools
 import string
 import typing
+from pathlib import Path
 from math import ceil
 import dataclasses
+import functools
 
 import numpy as np
-from numpy.fft import rfft, irfft
+from paderbox.transform.module_fft import rfft, irfft
 from scipy import signal
 
 from paderbox.array import roll_zeropad
@@ -26,6 +30,8 @@ def stft(
         fading: typing.Optional[typing.Union[bool, str]] = 'full',
         pad: bool = True,
         symmetric_window: bool = False,
+        max_frames_per_block: int = None,
+        dtype=None,
 ) -> np.array:
     """
     ToDo: Open points:
@@ -55,10 +61,35 @@ def stft(
         periodic. Since the implementation of the windows in scipy.signal have a
         curious behaviour for odd window_length. Use window(len+1)[:-1]. Since
         is equal to the behaviour of MATLAB.
+    :param max_frames_per_block: If not None, window and transform at most
+        this number of frames at once and write them into a preallocated
+        output. This bounds the memory of the intermediate windowed frames,
+        that are otherwise window_length / shift times larger than the
+        signal. The result is the same.
+    :param dtype: None or a real floating point dtype (e.g. np.float32).
+        If given, the signal and the window are converted to dtype and the
+        returned STFT has the corresponding complex dtype (e.g. complex64).
+        None keeps the default behaviour, i.e. the window is float64 and
+        the STFT complex128. Note: numpy.fft computes always in double
+        precision, use `fft_backend('scipy')` to compute in single precision.
     :return: Single channel complex STFT signal with dimensions
         AA x ... x AZ x T' times size/2+1 times BA x ... x BZ.
+
+    >>> x = np.random.normal(size=(2, 1000))
+    >>> X = stft(x, 64, 16, max_frames_per_block=10)
+    >>> X.shape
+    (2, 66, 33)
+    >>> np.array_equal(X, stft(x, 64, 16))
+    True
+    >>> stft(x.astype(np.float32), 64, 16).dtype
+    dtype('complex128')
+    >>> stft(x.astype(np.float32), 64, 16, dtype=np.float32).dtype
+    dtype('complex64')
     """
     time_signal = np.asarray(time_signal)
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        time_signal = time_signal.astype(dtype, copy=False)
 
     axis = axis % time_signal.ndim
 
@@ -69,18 +100,16 @@ def stft(
     assert fading in [None, True, False, 'full', 'half'], fading
     if fading not in [False, None]:
         pad_width = np.zeros((time_signal.ndim, 2), dtype=int)
-        if fading == 'half':
-            pad_width[axis, 0] = (window_length - shift) // 2
-            pad_width[axis, 1] = ceil((window_length - shift) / 2)
-        else:
-            pad_width[axis, :] = window_length - shift
+        pad_width[axis, :] = _fading_pad_width(window_length, shift, fading)
         time_signal = np.pad(time_signal, pad_width, mode='constant')
 
-    window = _get_window(
+    window = _get_cached_window(
         window=window,
         symmetric_window=symmetric_window,
         window_length=window_length,
     )
+    if dtype is not None:
+        window = window.astype(dtype, copy=False)
 
     time_signal_seg = segment_axis(
         time_signal,
@@ -94,12 +123,18 @@ def stft(
     mapping = letters + ',' + letters[axis + 1] + '->' + letters
 
     try:
-        # ToDo: Implement this more memory efficient
-        return rfft(
-            np.einsum(mapping, time_signal_seg, window),
-            n=size,
-            axis=axis + 1,
-        )
+        if max_frames_per_block is None:
+            return _astype(rfft(
+                np.einsum(mapping, time_signal_seg, window),
+                n=size,
+                axis=axis + 1,
+            ), _complex_dtype(dtype))
+        else:
+            return _blockwise_windowed_rfft(
+                time_signal_seg, window, size=size, axis=axis,
+                mapping=mapping, max_frames_per_block=max_frames_per_block,
+                dtype=_complex_dtype(dtype),
+            )
     except ValueError as e:
         raise ValueError(
             f'Could not calculate the stft, something does not match.\n'
@@ -111,6 +146,65 @@ def stft(
         ) from e
 
 
+def _real_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if not np.issubdtype(dtype, np.floating):
+        raise TypeError(f'dtype has to be a real floating dtype, got {dtype}')
+    return dtype
+
+
+def _complex_dtype(dtype):
+    """
+    >>> _complex_dtype(np.float32)
+    dtype('complex64')
+    >>> _complex_dtype(None)
+    """
+    if dtype is None:
+        return None
+    return np.result_type(dtype, np.complex64)
+
+
+def _astype(array, dtype):
+    """Converts array to dtype without a copy if it has already the dtype.
+    dtype None means no conversion."""
+    if dtype is None:
+        return array
+    return array.astype(dtype, copy=False)
+
+
+def _blockwise_windowed_rfft(
+        time_signal_seg, window, size, axis, mapping, max_frames_per_block,
+        dtype=None,
+):
+    """
+    Memory efficient version of
+    `rfft(np.einsum(mapping, time_signal_seg, window), n=size, axis=axis + 1)`
+    that windows and transforms at most max_frames_per_block frames at once.
+    """
+    if max_frames_per_block < 1:
+        raise ValueError(
+            f'max_frames_per_block has to be positive, '
+            f'got {max_frames_per_block}'
+        )
+    frames = time_signal_seg.shape[axis]
+
+    stft_signal = None
+    for start in range(0, max(frames, 1), max_frames_per_block):
+        index = (slice(None),) * axis + (
+            slice(start, start + max_frames_per_block),)
+        block = _astype(rfft(
+            np.einsum(mapping, time_signal_seg[index], window),
+            n=size,
+            axis=axis + 1,
+        ), dtype)
+        if stft_signal is None:
+            shape = list(block.shape)
+            shape[axis] = frames
+            stft_signal = np.empty(shape, dtype=block.dtype)
+        stft_signal[index] = block
+    return stft_signal
+
+
 def stft_with_kaldi_dimensions(
         time_signal,
         size: int = 512,
@@ -205,6 +299,69 @@ def _get_window(window, symmetric_window, window_length):
     return window
 
 
+# Number of windows and synthesis windows that are kept in memory.
+_WINDOW_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=_WINDOW_CACHE_SIZE)
+def _get_window_lru(window, symmetric_window, window_length):
+    window = _get_window(window, symmetric_window, window_length)
+    # The window is shared between all calls, hence protect it.
+    window.setflags(write=False)
+    return window
+
+
+@functools.lru_cache(maxsize=_WINDOW_CACHE_SIZE)
+def _get_synthesis_window_lru(window, symmetric_window, window_length, shift):
+    window = _biorthogonal_window_fastest(
+        _get_window_lru(window, symmetric_window, window_length), shift)
+    window.setflags(write=False)
+    return window
+
+
+def _get_cached_window(window, symmetric_window, window_length):
+    """Cached version of `_get_window`.
+
+    stft and istft are often called many times with the same parameters
+    (e.g. for short utterances). Hence, the windows are kept in a bounded LRU
+    cache (thread safe). The returned array is read-only.
+    Unhashable window callables are not cached.
+
+    >>> w = _get_cached_window('hann', False, 4)
+    >>> w
+    array([0. , 0.5, 1. , 0.5])
+    >>> w is _get_cached_window('hann', False, 4)
+    True
+    >>> w.flags.writeable
+    False
+    """
+    try:
+        return _get_window_lru(window, symmetric_window, window_length)
+    except TypeError:
+        # unhashable window
+        return _get_window(window, symmetric_window, window_length)
+
+
+def _get_cached_synthesis_window(
+        window, symmetric_window, window_length, shift
+):
+    """Cached synthesis window for istft. See `_get_cached_window`.
+
+    >>> w = _get_cached_synthesis_window('hann', False, 4, 1)
+    >>> w
+    array([0.        , 0.33333333, 0.66666667, 0.33333333])
+    >>> w is _get_cached_synthesis_window('hann', False, 4, 1)
+    True
+    """
+    try:
+        return _get_synthesis_window_lru(
+            window, symmetric_window, window_length, shift)
+    except TypeError:
+        # unhashable window
+        return _biorthogonal_window_fastest(
+            _get_window(window, symmetric_window, window_length), shift)
+
+
 def _samples_to_stft_frames(
         samples,
         size,
@@ -565,6 +722,50 @@ def _biorthogonal_window_brute_force(analysis_window, shift,
 _biorthogonal_window_fastest = _biorthogonal_window_brute_force
 
 
+def _overlap_add(frames, shift, out):
+    """
+    Adds the overlapping frames inplace to out, i.e. the inverse of
+    segment_axis with a sum instead of the overlap.
+
+    In contrast to an unbuffered `np.add.at` on the segmented view of out,
+    the frames are split in `ceil(window_length / shift)` blocks of length
+    shift. Each block does not overlap with itself in the output and can be
+    added with a single vectorized add. The blocks are added in reverse
+    order, so each sample sums the frames in increasing frame order, like
+    `np.add.at` does.
+
+    Args:
+        frames: Array with shape (..., frames, window_length).
+        shift: Hop in samples.
+        out: Array with shape (..., frames * shift + window_length - shift).
+
+    Returns:
+        out
+
+    >>> frames = np.arange(12).reshape(3, 4)
+    >>> _overlap_add(frames, 3, np.zeros(10, dtype=int))
+    array([ 0,  1,  2,  7,  5,  6, 15,  9, 10, 11])
+    >>> frames = np.ones((2, 4, 3))
+    >>> _overlap_add(frames, 2, np.zeros((2, 9)))
+    array([[1., 1., 2., 1., 2., 1., 2., 1., 1.],
+           [1., 1., 2., 1., 2., 1., 2., 1., 1.]])
+    """
+    *_, num_frames, window_length = frames.shape
+    assert out.shape[-1] == num_frames * shift + window_length - shift, (
+        out.shape, frames.shape, shift)
+    if num_frames == 0:
+        return out
+
+    for start in reversed(range(0, window_length, shift)):
+        length = min(shift, window_length - start)
+        out_seg = segment_axis(
+            out[..., start:start + (num_frames - 1) * shift + length],
+            length, shift, end=None,
+        )
+        out_seg += frames[..., start:start + length]
+    return out
+
+
 def istft(
         stft_signal,
         size: int=1024,
@@ -576,6 +777,7 @@ def istft(
         symmetric_window: bool=False,
         num_samples: int=None,
         pad: bool=True,
+        dtype=None,
 ):
     """
     Calculated the inverse short time Fourier transform to exactly reconstruct
@@ -606,9 +808,18 @@ def istft(
     :param pad: Necessary when num_samples is not None. This arguments is only
         for the forward transform nessesary and not for the inverse.
         Here it is used, to check that num_samples is valid.
+    :param dtype: None or a real floating point dtype (e.g. np.float32) for
+        the synthesis window and the returned time signal. None keeps the
+        default behaviour, i.e. float64.
 
     :return: Single channel complex STFT signal
     :return: Single channel time signal.
+
+    >>> X = stft(np.ones(1000, dtype=np.float32), 64, 16, dtype=np.float32)
+    >>> istft(X, 64, 16).dtype
+    dtype('float64')
+    >>> istft(X, 64, 16, dtype=np.float32).dtype
+    dtype('float32')
     """
     # Note: frame_axis and frequency_axis would make this function much more
     #       complicated
@@ -619,13 +830,15 @@ def istft(
     if window_length is None:
         window_length = size
 
-    window = _get_window(
+    window = _get_cached_synthesis_window(
         window=window,
         symmetric_window=symmetric_window,
         window_length=window_length,
+        shift=shift,
     )
-
-    window = _biorthogonal_window_fastest(window, shift)
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        window = window.astype(dtype, copy=False)
 
     # window = _biorthogonal_window_fastest(
     #     window, shift, use_amplitude_for_biorthogonal_window)
@@ -634,20 +847,16 @@ def istft(
 
     time_signal = np.zeros(
         (*stft_signal.shape[:-2],
-         stft_signal.shape[-2] * shift + window_length - shift))
-
-    # Get the correct view to time_signal
-    time_signal_seg = segment_axis(
-        time_signal, window_length, shift, end=None
+         stft_signal.shape[-2] * shift + window_length - shift),
+        dtype=dtype,
     )
 
-    # Unbuffered inplace add
-    np.add.at(
-        time_signal_seg,
-        ...,
-        window * np.real(
+    _overlap_add(
+        window * _astype(np.real(
             irfft(stft_signal, n=size)
-        )[..., :window_length]
+        )[..., :window_length], dtype),
+        shift,
+        time_signal,
     )
     # The [..., :window_length] is the inverse of the window padding in rfft.
 
@@ -676,10 +885,270 @@ def istft(
     return time_signal
 
 
+def stft_batch(
+        signals: typing.Sequence[np.ndarray],
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        max_frames_per_block: int = None,
+        dtype=None,
+        return_list: bool = False,
+):
+    """
+    Calculates the stft of a list of signals with different lengths with a
+    single call of `stft`, i.e. without the python overhead of one call per
+    signal.
+
+    The signals are zero padded at the end to the longest signal. The frames
+    of each signal are identical to the frames of `stft(signal)`, the frames
+    behind them are set to zero.
+
+    Args:
+        signals: List of time signals with shape (..., samples_i). Only the
+            last axis (time) may differ between the signals.
+        size, shift, window, window_length, fading, pad, symmetric_window,
+        max_frames_per_block, dtype: See `stft`.
+        return_list: If True, return a list of views on the stft of each
+            signal, else the padded stft and the number of frames per signal.
+
+    Returns:
+        Padded stft with shape (len(signals), ..., max(frames), size//2+1)
+        and an array with the number of frames of each signal, or with
+        return_list=True a list of stfts with shape (..., frames_i, size//2+1).
+
+    >>> signals = [np.random.normal(size=(2, n)) for n in [1000, 300, 512]]
+    >>> X, frames = stft_batch(signals, 64, 16)
+    >>> X.shape, frames
+    ((3, 2, 66, 33), array([66, 22, 35]))
+    >>> [x.shape for x in stft_batch(signals, 64, 16, return_list=True)]
+    [(2, 66, 33), (2, 22, 33), (2, 35, 33)]
+    >>> np.array_equal(X[1, :, :22], stft(signals[1], 64, 16))
+    True
+    """
+    if window_length is None:
+        window_length = size
+
+    signals = [np.asarray(s) for s in signals]
+    num_samples = np.array([s.shape[-1] for s in signals], dtype=int)
+    assert len(signals) > 0, signals
+
+    frames = _samples_to_stft_frames(
+        num_samples, window_length, shift, pad=pad, fading=fading
+    )
+    # segment_axis yields at least one frame, when it pads.
+    frames = np.maximum(frames, 1 if pad else 0)
+
+    padded = np.zeros(
+        (len(signals), *signals[0].shape[:-1], np.max(num_samples)),
+        dtype=np.result_type(*signals),
+    )
+    for i, s in enumerate(signals):
+        padded[i, ..., :s.shape[-1]] = s
+
+    stft_signal = stft(
+        padded, size=size, shift=shift, axis=-1, window=window,
+        window_length=window_length, fading=fading, pad=pad,
+        symmetric_window=symmetric_window,
+        max_frames_per_block=max_frames_per_block, dtype=dtype,
+    )
+    # The padding of the longest signal may yield an additional frame.
+    stft_signal = stft_signal[..., :np.max(frames), :]
+    # Without full fading, the first frame behind the last frame of a signal
+    # may contain samples of that signal.
+    for i, f in enumerate(frames):
+        stft_signal[i, ..., f:, :] = 0
+
+    if return_list:
+        return [
+            stft_signal[i, ..., :f, :] for i, f in enumerate(frames)
+        ]
+    else:
+        return stft_signal, frames
+
+
+def istft_batch(
+        stft_signals,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        frames: typing.Sequence[int] = None,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        window_length: int = None,
+        symmetric_window: bool = False,
+        num_samples: typing.Sequence[int] = None,
+        dtype=None,
+):
+    """
+    Inverse of `stft_batch`: Calculates the istft of multiple stft signals
+    with different number of frames with a single call of `istft`.
+
+    Args:
+        stft_signals: List of stft signals with shape
+            (..., frames_i, size//2+1) or a padded stft with shape
+            (batch, ..., frames, size//2+1) together with `frames`.
+        size, shift, window, fading, window_length, symmetric_window, dtype:
+            See `istft`.
+        frames: Number of valid frames of each signal, when stft_signals is
+            a padded array.
+        num_samples: None or the number of samples of each original signal.
+            When given, the signals are shortened to these lengths.
+
+    Returns:
+        List of time signals with shape (..., samples_i).
+
+    >>> signals = [np.random.normal(size=(2, n)) for n in [1000, 300, 512]]
+    >>> X, frames = stft_batch(signals, 64, 16)
+    >>> x_hat = istft_batch(X, 64, 16, frames=frames, num_samples=[1000, 300, 512])
+    >>> [x.shape for x in x_hat]
+    [(2, 1000), (2, 300), (2, 512)]
+    >>> np.allclose(x_hat[1], signals[1])
+    True
+    """
+    if window_length is None:
+        window_length = size
+
+    if frames is None:
+        stft_signals = [np.asarray(s) for s in stft_signals]
+        frames = [s.shape[-2] for s in stft_signals]
+    else:
+        stft_signals = np.asarray(stft_signals)
+        assert len(frames) == len(stft_signals), (len(frames), stft_signals.shape)
+    frames = np.array(frames, dtype=int)
+
+    # Copy to zero the frames behind the valid frames.
+    padded = np.zeros(
+        (len(stft_signals), *stft_signals[0].shape[:-2], np.max(frames),
+         stft_signals[0].shape[-1]),
+        dtype=np.result_type(*stft_signals),
+    )
+    for i, f in enumerate(frames):
+        padded[i, ..., :f, :] = stft_signals[i][..., :f, :]
+
+    time_signal = istft(
+        padded, size=size, shift=shift, window=window, fading=fading,
+        window_length=window_length, symmetric_window=symmetric_window,
+        dtype=dtype,
+    )
+
+    if num_samples is None:
+        num_samples = _stft_frames_to_samples(
+            frames, window_length, shift, fading=fading)
+    return [
+        time_signal[i, ..., :n] for i, n in enumerate(num_samples)
+    ]
+
+
+def multi_resolution_stft(
+        time_signal,
+        configs: typing.Sequence[tuple],
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        max_frames_per_block: int = None,
+        dtype=None,
+) -> dict:
+    """
+    Calculates the stft of a signal for multiple resolutions, e.g. for
+    multi-resolution spectral losses.
+
+    In contrast to one `stft` call per resolution, the signal is converted
+    and zero padded only once. Each resolution uses a strided view on the
+    shared padded signal and a cached window, so only the windowing and the
+    FFT are done per resolution. The results are identical to `stft`.
+
+    Args:
+        time_signal: Time signal with shape (..., samples).
+        configs: Sequence of `(size, shift)` or
+            `(size, shift, window_length)` tuples.
+        window, fading, pad, symmetric_window, max_frames_per_block, dtype:
+            See `stft`. They are shared by all resolutions.
+
+    Returns:
+        Dict that maps each config to the stft with shape
+        (..., frames, size // 2 + 1).
+
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> X = multi_resolution_stft(x, [(512, 128), (1024, 256), (2048, 512)])
+    >>> {k: v.shape for k, v in X.items()}
+    {(512, 128): (2, 128, 257), (1024, 256): (2, 66, 513), (2048, 512): (2, 35, 1025)}
+    >>> np.array_equal(X[(1024, 256)], stft(x, 1024, 256))
+    True
+    """
+    time_signal = np.asarray(time_signal)
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        time_signal = time_signal.astype(dtype, copy=False)
+    num_samples = time_signal.shape[-1]
+
+    parameters = {}
+    for config in configs:
+        assert len(config) in [2, 3], (
+            config, 'Expected (size, shift) or (size, shift, window_length)')
+        size, shift, window_length = (*config, config[0])[:3]
+        frames = _samples_to_stft_frames(
+            num_samples, window_length, shift, pad=pad, fading=fading)
+        # segment_axis yields at least one frame, when it pads.
+        frames = max(frames, 1 if pad else 0)
+        pad_width = _fading_pad_width(window_length, shift, fading)
+        parameters[config] = (size, shift, window_length, frames, pad_width)
+
+    # Shared signal with enough zeros in front and behind, so that the
+    # signal of each config is a view.
+    left = max([p[4][0] for p in parameters.values()], default=0)
+    length = max([
+        left - p[4][0] + max((p[3] - 1) * p[1] + p[2], 0)
+        for p in parameters.values()
+    ], default=0)
+    padded = np.zeros(
+        (*time_signal.shape[:-1], max(length, left + num_samples)),
+        dtype=time_signal.dtype,
+    )
+    padded[..., left:left + num_samples] = time_signal
+
+    letters = string.ascii_lowercase[:time_signal.ndim + 1]
+    mapping = letters + ',' + letters[-1] + '->' + letters
+
+    stft_signals = {}
+    for config, (size, shift, window_length, frames, pad_width) in \
+            parameters.items():
+        start = left - pad_width[0]
+        time_signal_seg = segment_axis(
+            padded[..., start:start + (frames - 1) * shift + window_length],
+            window_length, shift=shift, axis=-1, end='cut',
+        )[..., :frames, :]
+        window_ = _astype(_get_cached_window(
+            window=window,
+            symmetric_window=symmetric_window,
+            window_length=window_length,
+        ), dtype)
+        if max_frames_per_block is None:
+            stft_signals[config] = _astype(rfft(
+                np.einsum(mapping, time_signal_seg, window_),
+                n=size, axis=-1,
+            ), _complex_dtype(dtype))
+        else:
+            stft_signals[config] = _blockwise_windowed_rfft(
+                time_signal_seg, window_, size=size,
+                axis=time_signal.ndim - 1, mapping=mapping,
+                max_frames_per_block=max_frames_per_block,
+                dtype=_complex_dtype(dtype),
+            )
+    return stft_signals
+
+
 def stft_to_spectrogram(stft_signal):
     """
     Calculates the power spectrum (spectrogram) of an stft signal.
-    The output is guaranteed to be real.
+    The output is guaranteed to be real and has the precision of the input,
+    e.g. complex64 yields float32.
 
     :param stft_signal: Complex STFT signal with dimensions
         #time_frames times #frequency_bins.
@@ -699,6 +1168,11 @@ def spectrogram(time_signal, *args, **kwargs):
     :param args:
     :param kwargs:
     :return:
+
+    >>> spectrogram(np.ones(1000), 64, 16).dtype
+    dtype('float64')
+    >>> spectrogram(np.ones(1000), 64, 16, dtype=np.float32).dtype
+    dtype('float32')
     """
     return stft_to_spectrogram(stft(time_signal, *args, **kwargs))
 
@@ -731,6 +1205,544 @@ def get_stft_center_frequencies(size=1024, sample_rate=16000):
     return frequency_index * sample_rate / size
 
 
+def _fading_pad_width(window_length, shift, fading):
+    """Returns the number of zeros that `stft` adds in front of and behind
+    the signal for the given fading mode.
+
+    >>> _fading_pad_width(16, 4, 'full')
+    (12, 12)
+    >>> _fading_pad_width(16, 5, 'half')
+    (5, 6)
+    >>> _fading_pad_width(16, 4, None)
+    (0, 0)
+    >>> _fading_pad_width(12, 16, 'full')
+    Traceback (most recent call last):
+    ...
+    ValueError: fading requires overlapping frames, i.e. shift <= window_length, got shift=16 and window_length=12.
+    """
+    assert fading in [None, True, False, 'full', 'half'], fading
+    if fading in [None, False]:
+        return 0, 0
+    elif shift > window_length:
+        raise ValueError(
+            'fading requires overlapping frames, i.e. shift <= '
+            f'window_length, got shift={shift} and '
+            f'window_length={window_length}.'
+        )
+    elif fading == 'half':
+        return (window_length - shift) // 2, ceil((window_length - shift) / 2)
+    else:
+        return window_length - shift, window_length - shift
+
+
+class StreamingSTFT:
+    """
+    Stateful stft for chunked (e.g. real-time) processing.
+
+    Each call of `push` appends a chunk of samples to an internal buffer and
+    returns only the frames that are complete. The last
+    `window_length - shift` samples are kept for the next call. When
+    `shift > window_length`, the samples between two frames are skipped, even
+    when they arrive in later chunks. `flush`
+    finishes the signal and returns the remaining frames. The concatenation of
+    all returned frames is identical to the `stft` of the concatenated chunks.
+
+    The time axis is the last axis of the chunks, all other axes are
+    independent and have to be the same for all chunks.
+
+    >>> x = np.random.normal(size=(2, 1000))
+    >>> streaming_stft = StreamingSTFT(size=64, shift=16)
+    >>> streaming_stft.push(x[:, :10]).shape
+    (2, 0, 33)
+    >>> streaming_stft.push(x[:, 10:500]).shape
+    (2, 31, 33)
+    >>> streaming_stft.push(x[:, 500:]).shape
+    (2, 31, 33)
+    >>> streaming_stft.flush().shape
+    (2, 4, 33)
+    >>> stft(x, size=64, shift=16).shape
+    (2, 66, 33)
+    """
+    def __init__(
+            self,
+            size: int = 1024,
+            shift: int = 256,
+            *,
+            window: [str, typing.Callable] = signal.windows.blackman,
+            window_length: int = None,
+            fading: typing.Optional[typing.Union[bool, str]] = 'full',
+            pad: bool = True,
+            symmetric_window: bool = False,
+            dtype=None,
+    ):
+        """
+        The arguments are the same as for `stft`.
+        """
+        if window_length is None:
+            window_length = size
+
+        self.size = size
+        self.shift = shift
+        self.window_length = window_length
+        self.fading = fading
+        self.pad = pad
+        self.dtype = None if dtype is None else _real_dtype(dtype)
+        self.window = _astype(_get_cached_window(
+            window=window,
+            symmetric_window=symmetric_window,
+            window_length=window_length,
+        ), self.dtype)
+        self._pad_width = _fading_pad_width(window_length, shift, fading)
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state, i.e. the next chunk starts a new
+        signal."""
+        self._buffer = None
+        self._num_samples = 0
+        self._num_frames = 0
+        # Samples of future chunks, that belong to no frame (only for
+        # shift > window_length).
+        self._skip = 0
+
+    def _append(self, chunk):
+        chunk = _astype(np.asarray(chunk), self.dtype)
+        if self._buffer is None:
+            self._buffer = np.zeros(
+                (*chunk.shape[:-1], self._pad_width[0]), dtype=chunk.dtype)
+            self._num_samples = self._pad_width[0]
+        self._num_samples += chunk.shape[-1]
+        skip = min(self._skip, chunk.shape[-1])
+        self._skip -= skip
+        self._buffer = np.concatenate(
+            [self._buffer, chunk[..., skip:]], axis=-1)
+
+    def _transform(self, frames):
+        length = max((frames - 1) * self.shift + self.window_length, 0)
+        time_signal = self._buffer[..., :length]
+        if time_signal.shape[-1] < length:
+            pad_width = [(0, 0)] * (time_signal.ndim - 1)
+            pad_width.append((0, length - time_signal.shape[-1]))
+            time_signal = np.pad(time_signal, pad_width, mode='constant')
+
+        if frames > 0:
+            time_signal_seg = segment_axis(
+                time_signal, self.window_length, self.shift, end=None)
+        else:
+            time_signal_seg = np.zeros(
+                (*time_signal.shape[:-1], 0, self.window_length),
+                dtype=time_signal.dtype,
+            )
+
+        self._skip += max(frames * self.shift - self._buffer.shape[-1], 0)
+        self._buffer = self._buffer[..., frames * self.shift:]
+        self._num_frames += frames
+        return _astype(
+            rfft(time_signal_seg * self.window, n=self.size, axis=-1),
+            _complex_dtype(self.dtype),
+        )
+
+    def push(self, chunk):
+        """
+        Args:
+            chunk: Time signal with shape (..., samples).
+
+        Returns:
+            The new complete stft frames with shape (..., frames, size//2+1).
+        """
+        self._append(chunk)
+        if self._buffer.shape[-1] < self.window_length:
+            frames = 0
+        else:
+            frames = (
+                self._buffer.shape[-1] - self.window_length
+            ) // self.shift + 1
+        return self._transform(frames)
+
+    def flush(self):
+        """
+        Applies the fading at the end of the signal and returns the remaining
+        frames. Afterwards, the object is reset.
+
+        Returns:
+            The remaining stft frames with shape (..., frames, size//2+1).
+        """
+        if self._buffer is None:
+            self._append(np.zeros(0))
+        self._num_samples += self._pad_width[1]
+
+        frames = _samples_to_stft_frames(
+            self._num_samples, self.window_length, self.shift,
+            pad=self.pad, fading=None,
+        )
+        # segment_axis yields at least one frame, when it pads.
+        frames = max(frames, 1 if self.pad else 0)
+
+        ret = self._transform(frames - self._num_frames)
+        self.reset()
+        return ret
+
+
+class StreamingISTFT:
+    """
+    Stateful istft for chunked (e.g. real-time) processing.
+
+    Each call of `push` adds the new frames to the overlap-add state and
+    returns the samples that will not be changed by future frames.
+    `flush` returns the remaining samples. The concatenation of all returned
+    samples is identical to the `istft` of the concatenated frames
+    (without `num_samples`).
+
+    >>> x = np.random.normal(size=(2, 1000))
+    >>> X = stft(x, size=64, shift=16)
+    >>> streaming_istft = StreamingISTFT(size=64, shift=16)
+    >>> streaming_istft.push(X[:, :2]).shape
+    (2, 0)
+    >>> streaming_istft.push(X[:, 2:40]).shape
+    (2, 592)
+    >>> streaming_istft.push(X[:, 40:]).shape
+    (2, 416)
+    >>> streaming_istft.flush().shape
+    (2, 0)
+    """
+    def __init__(
+            self,
+            size: int = 1024,
+            shift: int = 256,
+            *,
+            window: [str, typing.Callable] = signal.windows.blackman,
+            window_length: int = None,
+            fading: typing.Optional[typing.Union[bool, str]] = 'full',
+            symmetric_window: bool = False,
+            dtype=None,
+    ):
+        """
+        The arguments are the same as for `istft`.
+        """
+        if window_length is None:
+            window_length = size
+
+        self.size = size
+        self.shift = shift
+        self.window_length = window_length
+        self.fading = fading
+        self.dtype = None if dtype is None else _real_dtype(dtype)
+        self.window = _astype(_get_cached_synthesis_window(
+            window=window,
+            symmetric_window=symmetric_window,
+            window_length=window_length,
+            shift=shift,
+        ), self.dtype)
+        self._pad_width = _fading_pad_width(window_length, shift, fading)
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state, i.e. the next frames start a new
+        signal."""
+        self._buffer = None
+        self._skip = self._pad_width[0]
+
+    def _emit(self, time_signal):
+        # Drop the samples from the fade-in
+        skip = min(self._skip, time_signal.shape[-1])
+        self._skip -= skip
+        return time_signal[..., skip:]
+
+    def push(self, stft_signal):
+        """
+        Args:
+            stft_signal: Stft frames with shape (..., frames, size//2+1).
+
+        Returns:
+            The finished time signal samples with shape (..., samples).
+        """
+        stft_signal = np.asarray(stft_signal)
+        assert stft_signal.shape[-1] == self.size // 2 + 1, stft_signal.shape
+        frames = stft_signal.shape[-2]
+
+        if self._buffer is None:
+            self._buffer = np.zeros(
+                (*stft_signal.shape[:-2], self.window_length - self.shift),
+                dtype=self.dtype,
+            )
+
+        time_signal = np.zeros(
+            (*stft_signal.shape[:-2],
+             frames * self.shift + self.window_length - self.shift),
+            dtype=self.dtype,
+        )
+        time_signal[..., :self._buffer.shape[-1]] = self._buffer
+
+        # The buffer contains the sum of the older frames. Hence, the
+        # summation order is the same as in istft.
+        _overlap_add(
+            self.window * _astype(np.real(
+                irfft(stft_signal, n=self.size)
+            )[..., :self.window_length], self.dtype),
+            self.shift,
+            time_signal,
+        )
+
+        self._buffer = time_signal[..., frames * self.shift:]
+        return self._emit(time_signal[..., :frames * self.shift])
+
+    def flush(self):
+        """
+        Removes the fade-out and returns the remaining samples. Afterwards, the
+        object is reset.
+
+        Returns:
+            The remaining time signal samples with shape (..., samples).
+        """
+        if self._buffer is None:
+            time_signal = np.zeros(
+                self.window_length - self.shift, dtype=self.dtype)
+        else:
+            time_signal = self._buffer
+        time_signal = self._emit(
+            time_signal[..., :time_signal.shape[-1] - self._pad_width[1]])
+        self.reset()
+        return time_signal
+
+
+def _iter_signal_blocks(time_signal, block_size, dtype):
+    """Yields blocks along the last axis of an audio file or an array
+    (e.g. np.memmap), so that the full signal is never in memory."""
+    if isinstance(time_signal, (str, Path)):
+        from paderbox.io.audioread import load_audio, audio_shape
+        shape = audio_shape(time_signal)
+        num_samples = shape if isinstance(shape, int) else shape[-1]
+        for start in range(0, num_samples, block_size):
+            yield load_audio(
+                time_signal, start=start,
+                stop=min(start + block_size, num_samples),
+                dtype=np.float64 if dtype is None else dtype,
+            )
+    else:
+        for start in range(0, time_signal.shape[-1], block_size):
+            yield np.asarray(time_signal[..., start:start + block_size])
+
+
+def _signal_shape(time_signal):
+    if isinstance(time_signal, (str, Path)):
+        from paderbox.io.audioread import audio_shape
+        shape = audio_shape(time_signal)
+        return (shape,) if isinstance(shape, int) else tuple(shape)
+    else:
+        return tuple(time_signal.shape)
+
+
+def _is_hdf5_path(path):
+    return Path(path).suffix in ['.h5', '.hdf5']
+
+
+def stft_to_file(
+        time_signal,
+        out,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        dtype=None,
+        block_size: int = 2**20,
+        dataset: str = 'stft',
+):
+    """
+    Out-of-core `stft` for long recordings that do not fit into memory.
+
+    The signal is read in blocks of `block_size` samples and transformed with
+    a `StreamingSTFT`, hence the frames at the block boundaries are identical
+    to the frames of `stft`. Each block of frames is directly written to
+    `out`, so the memory consumption is independent of the signal length.
+
+    Args:
+        time_signal: Path to an audio file (read with
+            `paderbox.io.load_audio`) or an array like object with shape
+            (..., samples), e.g. an `np.memmap`.
+        out: The output with shape (..., frames, size // 2 + 1). Either
+            - a path ending with `.h5` or `.hdf5`: The stft is written to the
+              dataset `dataset` of this HDF5 file (the file is created, when
+              it does not exist),
+            - another path: The stft is written to a `.npy` file, that can be
+              loaded with `np.load(..., mmap_mode='r')`, or
+            - a preallocated array like object, e.g. an `np.memmap` or an
+              `h5py.Dataset`.
+        size, shift, window, window_length, fading, pad, symmetric_window,
+        dtype: See `stft`.
+        block_size: Number of samples that are read at once.
+        dataset: Name of the HDF5 dataset, when `out` is an HDF5 file.
+
+    Returns:
+        The shape of the stft, i.e. (..., frames, size // 2 + 1).
+
+    >>> from paderbox.io.cache_dir import get_cache_dir
+    >>> file = get_cache_dir() / 'tmp_stft.npy'
+    >>> x = np.random.normal(size=(2, 10000))
+    >>> stft_to_file(x, file, size=512, shift=128, block_size=3000)
+    (2, 82, 257)
+    >>> np.testing.assert_equal(
+    ...     np.load(file, mmap_mode='r'), stft(x, size=512, shift=128))
+    """
+    if window_length is None:
+        window_length = size
+    streaming_stft = StreamingSTFT(
+        size=size,
+        shift=shift,
+        window=window,
+        window_length=window_length,
+        fading=fading,
+        pad=pad,
+        symmetric_window=symmetric_window,
+        dtype=dtype,
+    )
+
+    *independent, num_samples = _signal_shape(time_signal)
+    frames = _samples_to_stft_frames(
+        num_samples, window_length, shift, pad=pad, fading=fading)
+    # segment_axis yields at least one frame, when it pads.
+    frames = max(frames, 1 if pad else 0)
+    shape = (*independent, frames, size // 2 + 1)
+    out_dtype = _complex_dtype(streaming_stft.dtype) or np.complex128
+
+    with contextlib.ExitStack() as exit_stack:
+        if isinstance(out, (str, Path)):
+            if _is_hdf5_path(out):
+                import h5py
+                h5file = exit_stack.enter_context(h5py.File(out, 'a'))
+                if dataset in h5file:
+                    del h5file[dataset]
+                out = h5file.create_dataset(
+                    dataset, shape=shape, dtype=out_dtype)
+            else:
+                out = np.lib.format.open_memmap(
+                    out, mode='w+', dtype=out_dtype, shape=shape)
+                exit_stack.callback(out.flush)
+        assert tuple(out.shape) == shape, (out.shape, shape)
+
+        index = 0
+        for block in itertools.chain(
+                _iter_signal_blocks(
+                    time_signal, block_size, streaming_stft.dtype),
+                [None],
+        ):
+            if block is None:
+                stft_signal = streaming_stft.flush()
+            else:
+                stft_signal = streaming_stft.push(block)
+            stop = index + stft_signal.shape[-2]
+            out[..., index:stop, :] = stft_signal
+            index = stop
+        assert index == frames, (index, frames)
+    return shape
+
+
+def istft_to_file(
+        stft_signal,
+        path,
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        window_length: int = None,
+        symmetric_window: bool = False,
+        num_samples: int = None,
+        dtype=None,
+        block_frames: int = 4096,
+        dataset: str = 'stft',
+        sample_rate: int = 16000,
+        audio_dtype=np.int16,
+):
+    """
+    Out-of-core `istft`, the inverse of `stft_to_file`.
+
+    The frames are read in blocks of `block_frames` frames, transformed with
+    a `StreamingISTFT` and the samples are appended to the audio file `path`
+    with `paderbox.io.dump_audio`.
+
+    Args:
+        stft_signal: Path to a `.npy` or HDF5 file (see `stft_to_file`) or an
+            array like object with shape (..., frames, size // 2 + 1).
+            When there are independent dimensions, the product of them is
+            written as channels.
+        path: The audio file.
+        size, shift, window, fading, window_length, symmetric_window, dtype:
+            See `istft`.
+        num_samples: Crops the signal to `num_samples` samples.
+        block_frames: Number of frames that are read at once.
+        dataset: Name of the HDF5 dataset, when `stft_signal` is an HDF5 file.
+        sample_rate, audio_dtype: The sample rate and dtype of the audio
+            file. See `paderbox.io.dump_audio`.
+
+    Returns:
+        The number of samples, that are written.
+
+    >>> from paderbox.io import load_audio
+    >>> from paderbox.io.cache_dir import get_cache_dir
+    >>> file = get_cache_dir() / 'tmp_stft.npy'
+    >>> audio_file = get_cache_dir() / 'tmp_istft.wav'
+    >>> x = np.random.uniform(-0.5, 0.5, size=(2, 10000))
+    >>> stft_to_file(x, file, size=512, shift=128)
+    (2, 82, 257)
+    >>> istft_to_file(
+    ...     file, audio_file, size=512, shift=128, num_samples=10000,
+    ...     block_frames=30, audio_dtype=np.float64)
+    10000
+    >>> np.testing.assert_allclose(load_audio(audio_file), x, atol=1e-10)
+    """
+    from paderbox.io.audiowrite import dump_audio
+    if window_length is None:
+        window_length = size
+    streaming_istft = StreamingISTFT(
+        size=size,
+        shift=shift,
+        window=window,
+        window_length=window_length,
+        fading=fading,
+        symmetric_window=symmetric_window,
+        dtype=dtype,
+    )
+
+    with contextlib.ExitStack() as exit_stack:
+        if isinstance(stft_signal, (str, Path)):
+            if _is_hdf5_path(stft_signal):
+                import h5py
+                h5file = exit_stack.enter_context(h5py.File(stft_signal, 'r'))
+                stft_signal = h5file[dataset]
+            else:
+                stft_signal = np.load(stft_signal, mmap_mode='r')
+
+        *independent, frames, _ = stft_signal.shape
+        offset = 0
+        for start in itertools.chain(
+                range(0, frames, block_frames), [None]):
+            if start is None:
+                time_signal = streaming_istft.flush()
+            else:
+                time_signal = streaming_istft.push(np.asarray(
+                    stft_signal[..., start:start + block_frames, :]))
+            if num_samples is not None:
+                time_signal = time_signal[..., :num_samples - offset]
+            if independent:
+                time_signal = time_signal.reshape(
+                    np.prod(independent, dtype=int), time_signal.shape[-1])
+            if time_signal.shape[-1] == 0 and offset > 0:
+                continue
+            dump_audio(
+                time_signal, path,
+                sample_rate=sample_rate,
+                dtype=audio_dtype,
+                start=None if offset == 0 else offset,
+                normalize=False,
+            )
+            offset += time_signal.shape[-1]
+    return offset
+
+
 @dataclasses.dataclass()
 class STFT:
     """
@@ -752,7 +1764,9 @@ class STFT:
     symmetric_window: bool = False
     pad: bool = True
     fading: typing.Optional[typing.Union[bool, str]] = 'full'
-    
+    max_frames_per_block: int = None
+    dtype: typing.Any = None
+
     def __post_init__(self):
         if self.window_length is None:
             self.window_length = self.size
@@ -776,7 +1790,9 @@ class STFT:
             symmetric_window=self.symmetric_window,
             axis=-1,
             fading=self.fading,
-            pad=self.pad
+            pad=self.pad,
+            max_frames_per_block=self.max_frames_per_block,
+            dtype=self.dtype,
         )  # (..., T, F)
 
         return x
@@ -801,6 +1817,89 @@ class STFT:
             symmetric_window=self.symmetric_window,
             fading=self.fading,
             num_samples=num_samples,
+            dtype=self.dtype,
+        )
+
+    def transform_file(self, x, out, block_size=2**20, dataset='stft'):
+        """
+        Out-of-core stft of a long audio file or `np.memmap`, that writes
+        the frames directly to a `.npy` or HDF5 file. See `stft_to_file`.
+
+        Returns:
+            The shape of the stft.
+        """
+        return stft_to_file(
+            x,
+            out,
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            pad=self.pad,
+            dtype=self.dtype,
+            block_size=block_size,
+            dataset=dataset,
+        )
+
+    def inverse_file(
+            self, x, path, num_samples=None, block_frames=4096,
+            dataset='stft', sample_rate=16000, audio_dtype=np.int16,
+    ):
+        """
+        Out-of-core inverse stft, that streams the time signal to an audio
+        file. See `istft_to_file`.
+
+        Returns:
+            The number of samples, that are written.
+        """
+        return istft_to_file(
+            x,
+            path,
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            num_samples=num_samples,
+            dtype=self.dtype,
+            block_frames=block_frames,
+            dataset=dataset,
+            sample_rate=sample_rate,
+            audio_dtype=audio_dtype,
+        )
+
+    def streaming(self):
+        """
+        Returns a `StreamingSTFT` with the parameters of this object, i.e.
+        a stateful stft for chunked processing.
+        """
+        return StreamingSTFT(
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            pad=self.pad,
+            dtype=self.dtype,
+        )
+
+    def streaming_inverse(self):
+        """
+        Returns a `StreamingISTFT` with the parameters of this object, i.e.
+        a stateful istft for chunked processing.
+        """
+        return StreamingISTFT(
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            dtype=self.dtype,
         )
 
     def samples_to_frames(self, samples):
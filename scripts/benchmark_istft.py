@@ -0,0 +1,83 @@
+"""
+Compares the overlap-add in istft with the previous unbuffered np.add.at.
+
+vm
+OMP_NUM_THREADS None
+MKL_NUM_THREADS None
+
+add_at
+0.22298053100007564
+[0.2298092670000642, 0.22718277299986767, 0.21519389099989894, 0.21712641800013444, 0.21294210499991095]
+
+overlap_add
+0.07283821600003648
+[0.07028483900012361, 0.06889544399996339, 0.06904716899998675, 0.07140928499984511, 0.0696176579999701]
+
+istft
+0.5088233330000094
+[0.5029243409999253, 0.5172534000000724, 0.5118244370000866, 0.5135661920000985, 0.5073812400000861]
+
+"""
+import numpy as np
+import timeit
+import paderbox as pb
+from paderbox.array import segment_axis
+from paderbox.transform.module_stft import _overlap_add
+import os
+import socket
+
+
+B = 8
+T = 16000 * 5
+SIZE = 1024
+SHIFT = 256
+X = pb.transform.stft(np.random.normal(size=(B, T)), size=SIZE, shift=SHIFT)
+FRAMES = np.random.normal(size=(*X.shape[:-1], SIZE))
+
+
+def setup_add_at():
+    def fn(frames):
+        time_signal = np.zeros(
+            (*frames.shape[:-2], frames.shape[-2] * SHIFT + SIZE - SHIFT))
+        np.add.at(
+            segment_axis(time_signal, SIZE, SHIFT, end=None), ..., frames)
+        return time_signal
+
+    return FRAMES, fn
+
+
+def setup_overlap_add():
+    def fn(frames):
+        time_signal = np.zeros(
+            (*frames.shape[:-2], frames.shape[-2] * SHIFT + SIZE - SHIFT))
+        return _overlap_add(frames, SHIFT, time_signal)
+
+    return FRAMES, fn
+
+
+def setup_istft():
+    def fn(x_):
+        return pb.transform.istft(x_, size=SIZE, shift=SHIFT)
+
+    return X, fn
+
+
+if __name__ == '__main__':
+    print(socket.gethostname())
+    print('OMP_NUM_THREADS', os.environ.get('OMP_NUM_THREADS'))
+    print('MKL_NUM_THREADS', os.environ.get('MKL_NUM_THREADS'))
+    print()
+    repeats = 10
+
+    for name in 'add_at overlap_add istft'.split():
+        print(name)
+        t = timeit.Timer(
+            'fn(x)',
+            setup=(
+                f'from __main__ import setup_{name}; '
+                f'x, fn = setup_{name}()'
+            )
+        )
+        print(t.timeit(number=repeats))
+        print(t.repeat(number=repeats))
+        print()
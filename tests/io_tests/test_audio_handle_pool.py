@@ -0,0 +1,110 @@
+import concurrent.futures
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from paderbox.io import dump_audio, load_audio
+from paderbox.io.audio_handle_pool import (
+    AudioHandlePool,
+    audio_handle_pool,
+    get_audio_handle_pool,
+)
+
+
+def _load_in_child(file):
+    return load_audio(f'{file}::[100:200]'), get_audio_handle_pool().stats()
+
+
+_PARENT_HANDLE = None
+
+
+def _parent_handle_is_closed_in_child():
+    return _PARENT_HANDLE.closed
+
+
+class TestAudioHandlePool(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.signals = np.random.RandomState(0).uniform(
+            -0.5, 0.5, size=(3, 2, 8000)).astype(np.float32)
+        self.files = []
+        for i, signal in enumerate(self.signals):
+            file = Path(self._tmp_dir.name) / f'{i}.wav'
+            dump_audio(signal, file, dtype=np.float32, normalize=False)
+            self.files.append(str(file))
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_lru(self):
+        pool = AudioHandlePool(maxsize=2)
+        for file in self.files + self.files[2:] + self.files[:1]:
+            with pool.open(file) as f:
+                self.assertEqual(f.channels, 2)
+        self.assertEqual(
+            pool.stats(), {'hits': 1, 'misses': 4, 'evictions': 2, 'idle': 2})
+        with pool.open(self.files[0]):
+            self.assertEqual(pool.stats()['idle'], 1)
+        pool.close()
+        self.assertEqual(pool.stats()['idle'], 0)
+
+    def test_threads(self):
+        def load(i):
+            file = self.files[i % 3]
+            start = (37 * i) % 7000
+            signal = load_audio(
+                f'{file}::[{start}:{start + 1000}]', dtype=np.float32)
+            np.testing.assert_array_equal(
+                signal, self.signals[i % 3, :, start:start + 1000])
+
+        with audio_handle_pool(maxsize=4) as pool:
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                list(executor.map(load, range(500)))
+            stats = pool.stats()
+        self.assertEqual(stats['hits'] + stats['misses'], 500)
+        self.assertLessEqual(stats['idle'], 4)
+        self.assertIsNone(get_audio_handle_pool())
+
+    @unittest.skipIf(sys.platform.startswith('win'), 'requires fork')
+    def test_fork(self):
+        with audio_handle_pool() as pool:
+            load_audio(self.files[0])
+            context = multiprocessing.get_context('fork')
+            with context.Pool(1) as process_pool:
+                signal, stats = process_pool.apply(
+                    _load_in_child, (self.files[0],))
+            self.assertEqual(pool.stats()['idle'], 1)
+        # The child does not reuse the handle of the parent.
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 0)
+        np.testing.assert_array_equal(
+            signal, load_audio(self.files[0])[:, 100:200])
+
+    @unittest.skipIf(sys.platform.startswith('win'), 'requires fork')
+    def test_fork_while_locked(self):
+        global _PARENT_HANDLE
+        with audio_handle_pool() as pool:
+            load_audio(self.files[0])
+            _PARENT_HANDLE, = pool._idle[self.files[0]]
+            context = multiprocessing.get_context('fork')
+            # e.g. a loader thread holds the lock, while the main thread
+            # forks.
+            with pool._lock:
+                with context.Pool(1) as process_pool:
+                    result = process_pool.apply_async(
+                        _load_in_child, (self.files[0],))
+                    closed = process_pool.apply_async(
+                        _parent_handle_is_closed_in_child)
+                    signal, stats = result.get(timeout=20)
+                    self.assertTrue(closed.get(timeout=20))
+            self.assertEqual(stats['misses'], 1)
+            np.testing.assert_array_equal(
+                signal, load_audio(self.files[0])[:, 100:200])
+            # The parent keeps its handle.
+            self.assertFalse(_PARENT_HANDLE.closed)
+            self.assertEqual(pool.stats()['hits'], 1)
+        _PARENT_HANDLE = None
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import soundfile
+
+from paderbox.io import dump_audio, load_audio
+from paderbox.io.audioread import audio_length, audio_shape
+from paderbox.io.audio_index import (
+    AudioIndex,
+    AudioInfo,
+    audio_index,
+    get_audio_index,
+    read_audio_info,
+)
+
+
+def _info_in_child(file):
+    from paderbox.io.audio_index import _PARENT_CONNECTIONS
+    index = get_audio_index()
+    # The connection of the parent is kept alive, but not used.
+    assert index._connection is None, index._connection
+    assert len(_PARENT_CONNECTIONS) > 0, _PARENT_CONNECTIONS
+    return index.info(file), len(index)
+
+
+class TestAudioIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp_dir.name)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_read_audio_info(self):
+        signal = np.random.uniform(-0.5, 0.5, size=(6, 1001))
+        files = []
+        for subtype, channels, suffix in [
+            ('PCM_16', 1, '.wav'),
+            ('PCM_24', 2, '.wav'),
+            ('PCM_U8', 1, '.wav'),
+            ('FLOAT', 6, '.wav'),
+            ('DOUBLE', 2, '.wav'),
+            ('PCM_16', 3, '.flac'),
+            ('VORBIS', 1, '.ogg'),
+        ]:
+            file = self.tmp_dir / f'{subtype}_{channels}{suffix}'
+            soundfile.write(
+                str(file), signal[:channels].T, 8000, subtype=subtype)
+            files.append(file)
+        # WAVE_FORMAT_EXTENSIBLE header
+        file = self.tmp_dir / 'wavex.wav'
+        soundfile.write(str(file), signal[:2].T, 8000, format='WAVEX')
+        files.append(file)
+
+        for file in files:
+            with soundfile.SoundFile(str(file)) as f:
+                expected = AudioInfo(len(f), f.channels, f.samplerate)
+            self.assertEqual(read_audio_info(file), expected, file)
+
+    def test_invalidation(self):
+        file = self.tmp_dir / 'a.wav'
+        dump_audio(np.zeros(100), file, normalize=False)
+        with AudioIndex(self.tmp_dir / 'index.sqlite') as index:
+            self.assertEqual(index.info(file).frames, 100)
+            dump_audio(np.zeros(300), file, normalize=False)
+            os.utime(file, ns=(0, 10 ** 9))
+            self.assertEqual(index.update([file]), 1)
+            self.assertEqual(index.info(file).frames, 300)
+
+        # The database is persistent
+        with AudioIndex(self.tmp_dir / 'index.sqlite') as index:
+            self.assertEqual(len(index), 1)
+            self.assertEqual(index.update([file]), 0)
+
+    def test_transparent_use(self):
+        file = self.tmp_dir / 'a.wav'
+        dump_audio(
+            np.zeros((2, 16000)), file, sample_rate=8000, normalize=False)
+        with audio_index() as index:
+            self.assertEqual(audio_shape(file), (2, 16000))
+            self.assertEqual(audio_length(file, unit='seconds'), 2)
+            self.assertEqual(
+                load_audio(file, start=1, unit='seconds').shape, (2, 8000))
+            self.assertEqual(len(index), 1)
+
+    @unittest.skipIf(sys.platform.startswith('win'), 'requires fork')
+    def test_fork_while_locked(self):
+        files = [self.tmp_dir / 'a.wav', self.tmp_dir / 'b.wav']
+        for i, file in enumerate(files):
+            dump_audio(np.zeros(100 * (i + 1)), file, normalize=False)
+        with audio_index(self.tmp_dir / 'index.sqlite') as index:
+            self.assertEqual(index.info(files[0]).frames, 100)
+            connection = index.connection
+            context = multiprocessing.get_context('fork')
+            # e.g. a loader thread holds the lock, while the main thread
+            # forks.
+            with index._lock:
+                with context.Pool(1) as process_pool:
+                    info, length = process_pool.apply_async(
+                        _info_in_child, (files[1],)).get(timeout=20)
+            self.assertEqual(info.frames, 200)
+            self.assertEqual(length, 2)
+            # The parent keeps its connection.
+            self.assertIs(index.connection, connection)
+            self.assertEqual(len(index), 2)
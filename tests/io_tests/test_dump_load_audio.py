@@ -4,7 +4,7 @@ from os import system
 import numpy as np
 import soundfile
 
-from paderbox.io import load_audio
+from paderbox.io import load_audio, iter_audio_blocks
 from paderbox.io.audiowrite import dump_audio, dumps_audio
 from paderbox.testing.testfile_fetcher import get_file_path
     
@@ -109,3 +109,117 @@ class TestIOAudio:
                 load_audio(path)
         else:
             load_audio(path)
+
+
+class TestMmapLoadAudio:
+
+    @pytest.mark.parametrize("subtype", [
+        "PCM_16", "PCM_32", "FLOAT", "DOUBLE", "PCM_24", "PCM_U8",
+    ])
+    @pytest.mark.parametrize("dtype", [
+        np.float64, np.float32, np.int16, np.int32, None,
+    ])
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        dict(start=100, stop=-7),
+        dict(start=-50, frames=20),
+        dict(start=990, frames=100),
+        dict(channel=1),
+        dict(channel=[2, 0], start=3, stop=10),
+        dict(channel=slice(1, None)),
+    ])
+    def test_same_as_soundfile(self, tmp_path, subtype, dtype, kwargs):
+        file = str(tmp_path / f"{subtype}.wav")
+        signal = np.random.RandomState(0).uniform(-1, 1, size=(1000, 3))
+        soundfile.write(file, signal, 8000, subtype=subtype)
+        if dtype is None and subtype not in ("PCM_16", "FLOAT", "DOUBLE"):
+            pytest.skip("load_audio supports dtype=None only for some types")
+
+        expected = load_audio(file, dtype=dtype, **kwargs)
+        mapped, sample_rate = load_audio(
+            file, dtype=dtype, mmap=True, return_sample_rate=True, **kwargs)
+        assert sample_rate == 8000
+        assert mapped.dtype == expected.dtype
+        np.testing.assert_array_equal(mapped, expected)
+
+    def test_zero_copy(self, tmp_path):
+        file = str(tmp_path / "mono.wav")
+        signal = np.arange(100, dtype=np.int16)
+        soundfile.write(file, signal, 8000, subtype="PCM_16")
+        mapped = load_audio(file + "::[10:20]", dtype=np.int16, mmap=True)
+        assert isinstance(mapped, np.memmap)
+        assert not mapped.flags.writeable
+        np.testing.assert_array_equal(mapped, signal[10:20])
+
+
+class TestIterAudioBlocks:
+
+    @pytest.mark.parametrize("blocksize, overlap", [
+        (64, 0), (100, 0), (100, 30), (1000, 0), (1500, 10),
+    ])
+    def test_blocks(self, tmp_path, blocksize, overlap):
+        file = str(tmp_path / "audio.wav")
+        signal = np.random.RandomState(0).uniform(-1, 1, size=(1000, 2))
+        soundfile.write(file, signal, 8000, subtype="FLOAT")
+        expected = load_audio(file + "::[100:900,1]")
+
+        blocks = list(iter_audio_blocks(
+            file + "::[100:900,1]", blocksize, overlap=overlap))
+        hop = blocksize - overlap
+        assert all(b.shape == (blocksize,) for b in blocks[:-1])
+        for i, block in enumerate(blocks):
+            np.testing.assert_array_equal(
+                block, expected[i * hop:i * hop + blocksize])
+        np.testing.assert_array_equal(
+            np.concatenate([blocks[0]] + [b[overlap:] for b in blocks[1:]]),
+            expected,
+        )
+
+    def test_layout_and_fill_value(self, tmp_path):
+        file = str(tmp_path / "audio.wav")
+        signal = np.random.RandomState(0).uniform(-1, 1, size=(3, 250))
+        dump_audio(signal, file)
+        blocks = list(iter_audio_blocks(
+            file, 100, channel=[2, 0], dtype=np.float32, fill_value=0))
+        assert [b.shape for b in blocks] == [(2, 100)] * 3
+        assert blocks[0].dtype == np.float32
+        np.testing.assert_array_equal(
+            np.concatenate(blocks, axis=-1)[:, :250],
+            load_audio(file, channel=[2, 0], dtype=np.float32),
+        )
+        np.testing.assert_array_equal(blocks[-1][:, 50:], 0)
+
+
+def test_recursive_load_audio_parallel(tmp_path):
+    from paderbox.io import recursive_load_audio
+    files = []
+    for i, length in enumerate([100, 100, 200, 100]):
+        files.append(str(tmp_path / f"{i}.wav"))
+        dump_audio(np.random.uniform(-1, 1, length), files[-1])
+
+    def obj():
+        return {
+            "a": files[0],
+            "b": [files[0], files[1]],
+            "c": [files[2], (files[1], files[3])],
+            "d": (f for f in files[:2]),
+        }
+
+    desired = recursive_load_audio(obj())
+    assert desired["b"].shape == (2, 100)
+    actual = recursive_load_audio(obj(), workers=3)
+    assert type(actual["c"]) == list
+    assert actual["d"].shape == (2, 100)
+    np.testing.assert_equal(actual, desired)
+
+
+def test_dump_audio_start_keeps_subtype_and_checks_dtype(tmp_path):
+    file = tmp_path / "audio.wav"
+    dump_audio(np.zeros(100), file, dtype=np.float32, normalize=False)
+    dump_audio(
+        np.ones(10), file, dtype=np.float32, start=20, normalize=False)
+    assert get_audio_type(file) == "FLOAT"
+    np.testing.assert_array_equal(load_audio(file)[20:30], 1)
+    with pytest.raises(TypeError):
+        dump_audio(np.ones(10), file, dtype=np.uint8, start=20,
+                   normalize=False)
@@ -1,3 +1,4 @@
+import json
 import tempfile
 import pytest
 from pathlib import Path
@@ -59,3 +60,79 @@ def test_load_dump(file_name, load_fails, load_unsafe):
                 assert np.all(pb.io.load(path, unsafe=load_unsafe)['arr_0'] == obj), path
             else:
                 assert np.all(pb.io.load(path, unsafe=load_unsafe) == obj), path
+
+
+@pytest.mark.parametrize('list_to', ['list', 'array', 'dict'])
+def test_load_parallel(list_to):
+    import concurrent.futures
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for i in range(8):
+            files.append(Path(tmpdir) / f'{i}.json')
+            pb.io.dump([i, i + 1], files[-1])
+        obj = {
+            'a': files[0],
+            'b': [str(f) for f in files[1:5]],
+            'c': {'d': tuple(files[5:])},
+        }
+        desired = pb.io.load(obj, list_to=list_to)
+        with concurrent.futures.ThreadPoolExecutor(3) as executor:
+            for kwargs in [{'workers': 4}, {'executor': executor}]:
+                actual = pb.io.load(obj, list_to=list_to, **kwargs)
+                assert type(actual['c']['d']) == type(desired['c']['d'])
+                np.testing.assert_equal(actual, desired)
+
+
+def test_load_parallel_exception(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for i in range(4):
+            files.append(Path(tmpdir) / f'{i}.json')
+            pb.io.dump(i, files[-1])
+        files[1].write_text('no json')
+        obj = {
+            'a': files[0],
+            'c': {'d': [files[3], files[1], Path(tmpdir) / 'missing.json']},
+        }
+        with pytest.raises(ValueError) as excinfo:
+            pb.io.load(obj, workers=4)
+        if hasattr(excinfo.value, 'add_note'):
+            note = '\n'.join(excinfo.value.__notes__)
+            assert str(files[1]) in note
+            assert "['c']['d'][1]" in note
+
+        # Python < 3.11: The note is added to the message of a new exception.
+        # JSONDecodeError cannot be created from a message, hence the next
+        # base class (ValueError) is used.
+        monkeypatch.setattr(pb.io.wrapper_load, '_HAS_ADD_NOTE', False)
+        with pytest.raises(ValueError) as excinfo:
+            pb.io.load(obj, workers=4)
+        assert type(excinfo.value) is ValueError
+        assert str(files[1]) in str(excinfo.value)
+        assert "['c']['d'][1]" in str(excinfo.value)
+        assert isinstance(excinfo.value.__cause__, json.JSONDecodeError)
+
+        with pytest.raises(FileNotFoundError, match=r"\['missing'\]"):
+            pb.io.load({'missing': Path(tmpdir) / 'missing.json'}, workers=2)
+
+
+def test_load_parallel_single_leaf():
+    import threading
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file = Path(tmpdir) / 'x.json'
+        pb.io.dump([1, 2], file)
+        threads = []
+
+        def loader(leaf):
+            threads.append(threading.get_ident())
+            return pb.io.load(leaf)
+
+        assert pb.io.wrapper_load.recursive_load(
+            file, loader=loader, workers=4) == [1, 2]
+        # No thread pool for a single leaf
+        assert threads == [threading.get_ident()]
+
+        file.write_text('no json')
+        with pytest.raises(ValueError) as excinfo:
+            pb.io.load(file, workers=4)
+        assert ' at ' not in '\n'.join(getattr(excinfo.value, '__notes__', []))
@@ -1,3 +1,4 @@
+import itertools
 import unittest
 
 import numpy as np
@@ -60,3 +61,175 @@ class TestSTFTMethods(unittest.TestCase):
         tc.assert_almost_equal(
             mels, transform.module_fbank.hz2mel(hz, htk_mel=False),
         )
+
+
+class TestMelTransform(unittest.TestCase):
+    configs = [
+        (16000, 2048, 80), (16000, 512, 40), (16000, 512, 80), (8000, 256, 40)
+    ]
+
+    def test_banded_fbanks(self):
+        for sample_rate, stft_size, number_of_filters in self.configs:
+            fbanks = transform.module_fbank.MelTransform(
+                sample_rate, stft_size, number_of_filters).fbanks
+            banded = transform.module_fbank.BandedFilterbank(fbanks)
+            tc.assert_equal(banded.to_dense(), fbanks)
+            for n, (start, stop) in enumerate(zip(banded.start, banded.stop)):
+                tc.assert_equal(fbanks[:start, n], 0)
+                tc.assert_equal(fbanks[stop:, n], 0)
+                tc.assert_equal(
+                    banded.weights[n, :stop - start], fbanks[start:stop, n])
+
+            x = np.random.rand(3, 50, stft_size // 2 + 1)
+            tc.assert_allclose(banded(x), x @ fbanks, rtol=1e-12)
+            y = np.random.rand(3, 50, number_of_filters)
+            tc.assert_allclose(
+                banded.apply_transposed(y), y @ fbanks.T, rtol=1e-12)
+
+    def test_call_and_inverse(self):
+        for sample_rate, stft_size, number_of_filters in self.configs:
+            mel_transform = transform.module_fbank.MelTransform(
+                sample_rate, stft_size, number_of_filters)
+            x = np.random.rand(3, 50, stft_size // 2 + 1)
+            tc.assert_allclose(
+                mel_transform(x),
+                np.log(x @ mel_transform.fbanks + mel_transform.eps),
+                rtol=1e-12,
+            )
+            y = mel_transform(x)
+            ref = np.maximum(np.exp(y) @ mel_transform.ifbanks, 0)
+            tc.assert_allclose(
+                mel_transform.inverse(y), ref,
+                atol=1e-8 * np.max(np.abs(ref)),
+            )
+
+    def test_warped(self):
+        from paderbox.utils.random_utils import Uniform
+        x = np.random.rand(3, 2, 50, 257)
+        for warping_cls, independent_axis in itertools.product(
+                [transform.module_fbank.HzWarping,
+                 transform.module_fbank.MelWarping],
+                [(0,), (0, 1, 2)],
+        ):
+            warping_fn = warping_cls(
+                warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+                boundary_frequency_ratio_sampling_fn=Uniform(
+                    low=.6, high=.7),
+                highest_frequency=8000,
+            )
+            mel_transform = transform.module_fbank.MelTransform(
+                16000, 512, 40, warping_fn=warping_fn,
+                independent_axis=independent_axis, log=False,
+            )
+            size = [
+                x.shape[i] if i in independent_axis else 1
+                for i in range(x.ndim - 1)
+            ]
+            np.random.seed(0)
+            y = mel_transform(x)
+            np.random.seed(0)
+            fbanks = transform.module_fbank.get_fbanks(
+                16000, 512, 40, lowest_frequency=50, warping_fn=warping_fn,
+                size=tuple(size),
+            ).astype(np.float32)
+            fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + 1e-18)
+            ref = np.einsum('...F,...NF->...N', x, fbanks)
+            tc.assert_allclose(y, ref, rtol=1e-5)
+
+    def test_warped_quantized(self):
+        from paderbox.utils.random_utils import Uniform
+        module_fbank = transform.module_fbank
+        x = np.random.rand(3, 2, 50, 257)
+        for warping_cls, independent_axis in itertools.product(
+                [module_fbank.HzWarping, module_fbank.MelWarping],
+                [(0,), (0, 1, 2)],
+        ):
+            warping_fn = warping_cls(
+                warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+                boundary_frequency_ratio_sampling_fn=Uniform(
+                    low=.6, high=.7),
+                highest_frequency=8000,
+            )
+            kwargs = dict(
+                sample_rate=16000, stft_size=512, number_of_filters=40,
+                warping_fn=warping_fn, independent_axis=independent_axis,
+                log=False,
+            )
+            np.random.seed(0)
+            ref = module_fbank.MelTransform(**kwargs)(x)
+            np.random.seed(0)
+            y = module_fbank.MelTransform(
+                **kwargs, warp_quantization_step=1e-3)(x)
+            self.assertEqual(y.shape, ref.shape)
+            tc.assert_allclose(y, ref, rtol=0.05, atol=1e-3)
+
+            # The same warping parameters are served from the cache.
+            quantized = module_fbank.MelTransform(
+                **kwargs, warp_quantization_step=1e-2)
+            module_fbank.warped_fbanks_cache_clear()
+            np.random.seed(0)
+            y = quantized(x)
+            misses = module_fbank.warped_fbanks_cache_info().misses
+            self.assertGreater(misses, 1)
+            np.random.seed(0)
+            tc.assert_equal(quantized(x), y)
+            info = module_fbank.warped_fbanks_cache_info()
+            self.assertEqual(info.misses, misses)
+            self.assertEqual(info.hits, misses)
+
+        # A coarse grid has only a few filterbanks.
+        module_fbank.warped_fbanks_cache_clear()
+        coarse = module_fbank.MelTransform(
+            **kwargs, warp_quantization_step=.1)
+        for _ in range(5):
+            coarse(x)
+        self.assertLessEqual(
+            module_fbank.warped_fbanks_cache_info().currsize, 3 * 2)
+
+        with self.assertRaises(TypeError):
+            module_fbank.MelTransform(
+                16000, 512, 40, warping_fn=lambda f, size: f,
+                warp_quantization_step=.1,
+            )(x)
+
+    def test_fbanks_cache(self):
+        module_fbank = transform.module_fbank
+        module_fbank.fbanks_cache_clear()
+        x = np.random.normal(size=16000)
+        transform.fbank(x)
+        transform.fbank(x[:8000])
+        transform.logfbank(x)
+        info = module_fbank.fbanks_cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+
+        fbanks = module_fbank.MelTransform(16000, 512, 23, 0., 8000).fbanks
+        self.assertEqual(module_fbank.fbanks_cache_info().hits, 3)
+        with self.assertRaises(ValueError):
+            fbanks[0, 0] = 1
+        with self.assertRaises(ValueError):
+            module_fbank.MelTransform(16000, 512, 23).ifbanks[0, 0] = 1
+
+        # Different parameters are not shared
+        self.assertIsNot(
+            module_fbank.MelTransform(16000, 512, 23, eps=1e-10).fbanks,
+            fbanks,
+        )
+
+    def test_assign_fbanks(self):
+        module_fbank = transform.module_fbank
+        mel_transform = module_fbank.MelTransform(16000, 512, 40, log=False)
+        shared = module_fbank.MelTransform(16000, 512, 40).fbanks
+        fbanks = np.random.rand(257, 40)
+        mel_transform.fbanks = fbanks
+        x = np.random.rand(3, 257)
+        tc.assert_allclose(mel_transform(x), x @ fbanks, rtol=1e-12)
+        tc.assert_allclose(
+            mel_transform.ifbanks, np.linalg.pinv(fbanks.T).T, rtol=1e-8)
+        self.assertIs(module_fbank.MelTransform(16000, 512, 40).fbanks, shared)
+
+        ifbanks = np.random.rand(40, 257)
+        mel_transform.ifbanks = ifbanks
+        y = np.random.rand(3, 40)
+        tc.assert_allclose(mel_transform.inverse(y), y @ ifbanks)
+        tc.assert_allclose(mel_transform.fbanks, fbanks)
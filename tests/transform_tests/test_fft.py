@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform import fft_backend, get_fft_backend
+from paderbox.transform import stft, istft, fbank
+from paderbox.transform.module_fft import NumpyFFTBackend
+
+
+class TestFFTBackend(unittest.TestCase):
+    def setUp(self):
+        self.x = np.random.normal(size=(3, 4000))
+
+    def check_backend(self, backend, **kwargs):
+        X_ref = stft(self.x, 512, 128)
+        x_ref = istft(X_ref, 512, 128)
+        fbank_ref = fbank(self.x)
+        with fft_backend(backend, **kwargs):
+            X = stft(self.x, 512, 128)
+            x = istft(X, 512, 128)
+            fbank_ = fbank(self.x)
+        tc.assert_allclose(X, X_ref, rtol=1e-10, atol=1e-10)
+        tc.assert_allclose(x, x_ref, rtol=1e-10, atol=1e-10)
+        tc.assert_allclose(fbank_, fbank_ref, rtol=1e-10, atol=1e-10)
+
+    def test_scipy(self):
+        self.check_backend('scipy', workers=2)
+
+    def test_pyfftw(self):
+        try:
+            import pyfftw
+        except ImportError:
+            raise unittest.SkipTest('pyfftw is not installed')
+        self.check_backend('pyfftw', workers=2)
+
+    def test_context_manager_restores_backend(self):
+        with self.assertRaises(RuntimeError):
+            with fft_backend('scipy'):
+                raise RuntimeError()
+        assert get_fft_backend() == NumpyFFTBackend(), get_fft_backend()
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from paderbox.io import load_audio
 # from scipy import signal
 
@@ -19,3 +21,91 @@ class TestSTFTMethods(unittest.TestCase):
 
         tc.assert_equal(y_filtered.shape, (291, 13))
         tc.assert_isreal(y_filtered)
+
+
+class TestFeatureExtractor(unittest.TestCase):
+    def test_equal_to_functions(self):
+        x = np.random.normal(size=(2, 8000))
+        for feature, function in [
+            ('fbank', transform.fbank),
+            ('logfbank', transform.logfbank),
+            ('mfcc', transform.mfcc),
+        ]:
+            feature_extractor = transform.FeatureExtractor(feature)
+            # Shrinking and growing inputs reuse the buffers
+            for x_ in [x, x[:1, :1000], x[0, :401], x]:
+                tc.assert_allclose(
+                    feature_extractor(x_), function(x_), rtol=1e-10)
+
+    def test_deltas_and_out(self):
+        x = np.random.normal(size=4000)
+        feature_extractor = transform.FeatureExtractor('mfcc', delta_order=2)
+        expected = transform.mfcc_velocity_acceleration(x)
+        out = np.empty(expected.shape)
+        self.assertIs(feature_extractor(x, out=out), out)
+        tc.assert_allclose(out, expected, rtol=1e-10, atol=1e-10)
+        with self.assertRaises(ValueError):
+            feature_extractor(x, out=out[:-1])
+
+
+class TestStreamingFeatureExtractor(unittest.TestCase):
+    def test_equal_to_offline(self):
+        x = np.random.normal(size=(2, 6000))
+        for feature, delta_order, delta_axis in [
+            ('fbank', 0, -1),
+            ('logfbank', 1, -2),
+            ('mfcc', 2, -1),
+            ('mfcc', 2, -2),
+        ]:
+            kwargs = dict(delta_order=delta_order, delta_axis=delta_axis)
+            streaming = transform.StreamingFeatureExtractor(feature, **kwargs)
+            chunks = np.split(x, [0, 100, 500, 510, 3000], axis=-1)
+            y = np.concatenate(
+                [streaming.push(chunk) for chunk in chunks]
+                + [streaming.flush()],
+                axis=-2,
+            )
+            expected = transform.FeatureExtractor(feature, **kwargs)(x)
+            tc.assert_allclose(y, expected, rtol=1e-10, atol=1e-10)
+
+    def test_velocity_acceleration_over_time(self):
+        x = np.random.normal(size=4000)
+        mfcc = transform.mfcc(x)
+        delta = transform.module_mfcc.delta
+        expected = np.concatenate([
+            mfcc,
+            delta(mfcc, order=1, axis=-2),
+            delta(mfcc, order=2, axis=-2),
+        ], axis=-1)
+        streaming = transform.StreamingFeatureExtractor(
+            'mfcc', delta_order=2, delta_axis=-2)
+        frames = [streaming.push(x[i:i + 160]) for i in range(0, 4000, 160)]
+        # The deltas delay the output by look_ahead frames.
+        self.assertEqual(
+            sum(f.shape[-2] for f in frames),
+            expected.shape[-2] - streaming.look_ahead - 1,
+        )
+        y = np.concatenate(frames + [streaming.flush()], axis=-2)
+        tc.assert_allclose(y, expected, rtol=1e-10, atol=1e-10)
+
+
+class TestDelta(unittest.TestCase):
+    def test_multiple_orders(self):
+        delta = transform.module_mfcc.delta
+        data = np.random.rand(2, 60, 13)
+        for axis, trim in [(-1, True), (-2, True), (1, False), (0, True)]:
+            deltas = delta(data, order=(1, 2, 3), axis=axis, trim=trim)
+            for i, order in enumerate((1, 2, 3)):
+                tc.assert_allclose(
+                    deltas[i], delta(data, order=order, axis=axis, trim=trim))
+
+    def test_kaldi_style_velocity(self):
+        # Regression formula of Kaldi/HTK with repeated edge frames
+        delta = transform.module_mfcc.delta
+        data = np.random.rand(30, 5)
+        padded = np.pad(data, [(4, 4), (0, 0)], mode='edge')
+        expected = sum(
+            n * (padded[4 + n:34 + n] - padded[4 - n:34 - n])
+            for n in range(1, 5)
+        ) / (2 * sum(n ** 2 for n in range(1, 5)))
+        tc.assert_allclose(delta(data, order=1, axis=0), expected, atol=1e-12)
@@ -0,0 +1,58 @@
+import json
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+import paderbox.transform as transform
+
+
+class TestRunningMeanVariance(unittest.TestCase):
+    def test_update_and_merge(self):
+        data = 1e4 + np.random.normal(size=(3, 500, 13))
+        statistics = [transform.RunningMeanVariance(axis=(0, 1))]
+        for batch in np.split(data, [50, 51, 300], axis=1):
+            statistics.append(
+                transform.RunningMeanVariance(axis=(0, 1)).update(batch))
+        merged = statistics[0]
+        for other in statistics[1:]:
+            merged.merge(other)
+        self.assertEqual(merged.count(), 1500)
+        tc.assert_allclose(merged.mean(), np.mean(data, axis=(0, 1)))
+        tc.assert_allclose(
+            merged.variance(), np.var(data, axis=(0, 1)), rtol=1e-9)
+        tc.assert_allclose(
+            merged.apply(data.copy()),
+            transform.normalize_mean_variance(data, axis=(0, 1)),
+            atol=1e-8,
+        )
+
+    def test_keys_and_serialize(self):
+        data = np.random.normal(size=(100, 5)).astype(np.float32)
+        statistics = transform.RunningMeanVariance()
+        statistics.update(data[:40], key='spk1')
+        statistics.update(data[40:], key='spk2')
+        restored = transform.RunningMeanVariance.deserialize(
+            json.loads(json.dumps(statistics.serialize())))
+        self.assertEqual(sorted(restored.keys()), ['spk1', 'spk2'])
+        normalized = data[:40].copy()
+        self.assertIs(restored.apply(normalized, key='spk1'), normalized)
+        tc.assert_allclose(
+            normalized, transform.normalize_mean_variance(data[:40]),
+            atol=1e-5,
+        )
+        with self.assertRaises(KeyError):
+            restored.apply(data, key='spk3')
+
+    def test_feature_extractor(self):
+        x = np.random.normal(size=(4, 4000))
+        features = transform.FeatureExtractor('mfcc')(x)
+        statistics = transform.RunningMeanVariance(axis=(0, 1))
+        statistics.update(features)
+        normalized = transform.FeatureExtractor(
+            'mfcc', normalizer=statistics)(x)
+        tc.assert_allclose(
+            normalized,
+            transform.normalize_mean_variance(features, axis=(0, 1)),
+            atol=1e-8,
+        )
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_phase_features import (
+    get_phase_features,
+    transform_to_baseband,
+)
+
+
+def _reference_baseband(X, size, shift):
+    X = X.copy()
+    T, _, F = X.shape
+    for t in range(T):
+        for f in range(F):
+            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
+    return X
+
+
+def _wrapped_difference(a, b):
+    return np.angle(np.exp(1j * (a - b)))
+
+
+class TestPhaseFeatures(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.X = rng.normal(size=(2, 50, 3, 65)) \
+            + 1j * rng.normal(size=(2, 50, 3, 65))
+
+    def test_transform_to_baseband(self):
+        reference = _reference_baseband(self.X[1], 128, 32)
+        tc.assert_allclose(
+            transform_to_baseband(self.X[1], 128, 32), reference, atol=1e-10)
+        tc.assert_allclose(
+            transform_to_baseband(self.X, 128, 32)[1], reference, atol=1e-10)
+
+        X = self.X[1].copy()
+        out = transform_to_baseband(X, 128, 32, out=X)
+        self.assertIs(out, X)
+        tc.assert_allclose(X, reference, atol=1e-10)
+
+    def test_get_phase_features(self):
+        X = self.X[0]
+        phase, delta, delta_delta = get_phase_features(X, 128, 32)
+        reference = np.angle(_reference_baseband(X, 128, 32))
+        tc.assert_allclose(
+            _wrapped_difference(phase, reference), 0, atol=1e-10)
+        tc.assert_allclose(delta[0], 0)
+        tc.assert_allclose(
+            _wrapped_difference(delta[1:], reference[1:] - reference[:-1]),
+            0, atol=1e-10,
+        )
+        tc.assert_array_less(np.abs(delta), np.pi + 1e-10)
+        tc.assert_allclose(delta_delta[0], 0)
+        tc.assert_allclose(delta_delta[1:], delta[1:] - delta[:-1])
+
+    def test_leading_dims_and_time_axis(self):
+        batched = get_phase_features(self.X, 128, 32)
+        single = get_phase_features(self.X[1], 128, 32)
+        without_channel = get_phase_features(
+            self.X[:, :, 2], 128, 32, time_axis=-2)
+        for b, s, w in zip(batched, single, without_channel):
+            self.assertEqual(b.shape, self.X.shape)
+            tc.assert_allclose(b[1], s)
+            tc.assert_allclose(b[:, :, 2], w)
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_phase_reconstruction import fast_griffin_lim
+from paderbox.transform.module_phase_reconstruction import griffin_lim
+from paderbox.transform.module_phase_reconstruction import griffin_lim_batch
+
+
+class TestGriffinLimBatch(unittest.TestCase):
+    lengths = [16000, 8000, 3001]
+
+    def magnitudes(self, stft):
+        return [
+            np.abs(stft(np.random.normal(size=(2, n)))) for n in self.lengths
+        ]
+
+    def test_equals_fast_griffin_lim(self):
+        for stft in [
+            STFT(shift=200, size=1024, window_length=800, fading=False),
+            STFT(shift=128, size=512),
+            STFT(shift=160, size=512, window_length=400, fading='half'),
+        ]:
+            x = self.magnitudes(stft)
+            for alpha, batch_size in [(0, 4), (0.99, 2)]:
+                audio = griffin_lim_batch(
+                    x, stft, alpha=alpha, iterations=10,
+                    rng=np.random.default_rng(1), batch_size=batch_size,
+                )
+                rng = np.random.default_rng(1)
+                for a, x_ in zip(audio, x):
+                    tc.assert_allclose(
+                        a,
+                        fast_griffin_lim(
+                            x_, stft, alpha=alpha, iterations=10, rng=rng),
+                        atol=1e-10,
+                    )
+
+    def test_tolerance(self):
+        stft = STFT(shift=128, size=512)
+        x = self.magnitudes(stft)
+        # Every spectral convergence is below the tolerance after the first
+        # iteration
+        tc.assert_equal(
+            griffin_lim_batch(x, stft, iterations=100, tolerance=10, rng=0),
+            griffin_lim_batch(x, stft, iterations=1, rng=0),
+        )
+        audio = griffin_lim_batch(
+            x, stft, alpha=0.99, iterations=30, tolerance=0.1, rng=0)
+        tc.assert_equal(
+            [a.shape[-1] for a in audio],
+            [stft.frames_to_samples(x_.shape[-2]) for x_ in x],
+        )
+
+    def test_zero_iterations(self):
+        stft = STFT(shift=160, size=512, window_length=400)
+        x = self.magnitudes(stft)
+        audio = griffin_lim_batch(x, stft, iterations=0, rng=0)
+        # The istft of the random phase initialization
+        rng = np.random.default_rng(0)
+        for a, x_ in zip(audio, x):
+            angle = rng.uniform(low=-np.pi, high=np.pi, size=x_.shape)
+            tc.assert_allclose(a, stft.inverse(x_ * np.exp(1.0j * angle)))
+        tc.assert_equal(
+            [a.shape for a in audio],
+            [a.shape for a in griffin_lim_batch(x, stft, iterations=1)],
+        )
+
+    def test_rng(self):
+        stft = STFT(shift=128, size=512)
+        x = np.abs(stft(np.random.normal(size=4000)))
+        tc.assert_equal(
+            griffin_lim(x, stft, iterations=2, rng=3),
+            griffin_lim(x, stft, iterations=2, rng=3),
+        )
+        tc.assert_equal(
+            fast_griffin_lim(x, stft, iterations=2, rng=3),
+            fast_griffin_lim(x, stft, iterations=2, rng=3),
+        )
@@ -0,0 +1,93 @@
+import shutil
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_resample import (
+    resample_poly, resample_sox, SoxResampler
+)
+
+
+def _sum_of_sines(frequencies, phases, sample_rate, num_samples):
+    t = np.arange(num_samples) / sample_rate
+    return np.sum(np.sin(
+        2 * np.pi * frequencies[:, None] * t + phases[:, None]
+    ), axis=0)
+
+
+class TestResamplePoly(unittest.TestCase):
+    rates = [
+        (16000, 8000), (8000, 16000), (48000, 16000), (16000, 44100),
+        (44100, 48000),
+    ]
+
+    def _band_limited(self, in_rate, out_rate, seconds=1):
+        rng = np.random.RandomState(0)
+        nyquist = min(in_rate, out_rate) / 2
+        frequencies = rng.uniform(50, 0.9 * nyquist, size=10)
+        phases = rng.uniform(0, 2 * np.pi, size=10)
+        x = _sum_of_sines(frequencies, phases, in_rate, seconds * in_rate)
+        reference = _sum_of_sines(
+            frequencies, phases, out_rate, seconds * out_rate)
+        return x, reference
+
+    def test_band_limited(self):
+        for in_rate, out_rate in self.rates:
+            x, reference = self._band_limited(in_rate, out_rate)
+            y = resample_poly(x, in_rate=in_rate, out_rate=out_rate)
+            self.assertEqual(y.shape, reference.shape)
+            interior = slice(out_rate // 10, -out_rate // 10)
+            error = y[interior] - reference[interior]
+            self.assertLess(
+                np.sqrt(np.mean(error ** 2) / np.mean(reference ** 2)), 1e-6)
+
+    def test_batched_and_float32(self):
+        x = np.random.normal(size=(2, 3, 1600))
+        y = resample_poly(
+            x.astype(np.float32), in_rate=16000, out_rate=44100)
+        self.assertEqual(y.dtype, np.float32)
+        self.assertEqual(y.shape, (2, 3, 4410))
+        tc.assert_allclose(
+            y[1, 2], resample_poly(x[1, 2], in_rate=16000, out_rate=44100),
+            atol=1e-5,
+        )
+        tc.assert_allclose(
+            resample_poly(x, in_rate=16000, out_rate=8000, axis=1)[:, :, 0],
+            resample_poly(x[:, :, 0], in_rate=16000, out_rate=8000),
+        )
+
+    @unittest.skipIf(shutil.which('sox') is None, 'sox is not installed')
+    def test_deviation_from_sox(self):
+        for in_rate, out_rate in self.rates:
+            x, _ = self._band_limited(in_rate, out_rate)
+            x = 0.05 * x.astype(np.float32)
+            y = resample_poly(x, in_rate=in_rate, out_rate=out_rate)
+            y_sox = resample_sox(
+                x, in_rate=in_rate, out_rate=out_rate, normalize=False)
+            interior = slice(out_rate // 10, -out_rate // 10)
+            error = y[interior] - y_sox[interior]
+            self.assertLess(
+                np.sqrt(np.mean(error ** 2) / np.mean(y_sox ** 2)), 3e-3)
+
+
+@unittest.skipIf(shutil.which('sox') is None, 'sox is not installed')
+class TestSoxResampler(unittest.TestCase):
+    def test_equal_to_resample_sox_and_ordered(self):
+        signals = [
+            np.random.normal(size=(2, 1000 + 100 * i)).astype(np.float32)
+            for i in range(12)
+        ]
+        with SoxResampler(
+                in_rate=16000, out_rate=8000, workers=3, max_pending=4
+        ) as resampler:
+            resampled = list(resampler.map(signals))
+            future = resampler.submit(signals[0], out_rate=16000)
+            tc.assert_equal(future.result(), signals[0])
+        for signal, y in zip(signals, resampled):
+            self.assertEqual(y.dtype, np.float32)
+            tc.assert_equal(
+                y, resample_sox(signal, in_rate=16000, out_rate=8000))
+        throughput = resampler.throughput()
+        self.assertEqual(throughput['signals'], 13)
+        self.assertGreater(throughput['realtime_factor'], 0)
@@ -1,4 +1,6 @@
+import tempfile
 import unittest
+from pathlib import Path
 
 import numpy as np
 from scipy import signal
@@ -14,10 +16,18 @@ from paderbox.transform.module_stft import _samples_to_stft_frames
 from paderbox.transform.module_stft import _stft_frames_to_samples
 from paderbox.transform.module_stft import get_stft_center_frequencies
 from paderbox.transform.module_stft import istft
+from paderbox.transform.module_stft import istft_batch
+from paderbox.transform.module_stft import istft_to_file
+from paderbox.transform.module_stft import multi_resolution_stft
 from paderbox.transform.module_stft import spectrogram_to_energy_per_frame
 from paderbox.transform.module_stft import stft
+from paderbox.transform.module_stft import stft_batch
+from paderbox.transform.module_stft import stft_to_file
 from paderbox.transform.module_stft import stft_to_spectrogram
 from paderbox.transform.module_stft import stft_with_kaldi_dimensions
+from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import StreamingSTFT
+from paderbox.transform.module_stft import StreamingISTFT
 from paderbox.utils.matlab import Mlab
 from numpy.fft import rfft
 import numpy
@@ -371,3 +381,345 @@ class TestSTFTModule(unittest.TestCase):
 
     def test_against_scipy_with_fixed_parameters(self):
         pass
+
+
+class TestStreamingSTFT(unittest.TestCase):
+    def _chunks(self, length, number_of_chunks=5):
+        borders = np.sort(np.random.randint(0, length + 1, number_of_chunks))
+        return list(zip([0, *borders], [*borders, length]))
+
+    def test_streaming_stft_equals_stft(self):
+        x = np.random.normal(size=(2, 3000))
+        for fading in ['full', 'half', None]:
+            for pad in [True, False]:
+                for size, shift, window_length in [
+                    (512, 128, None), (512, 160, 400), (151, 67, None),
+                ]:
+                    kwargs = dict(
+                        size=size, shift=shift, window_length=window_length,
+                        fading=fading,
+                    )
+                    streaming_stft = StreamingSTFT(pad=pad, **kwargs)
+                    X = np.concatenate([
+                        *[streaming_stft.push(x[..., start:stop])
+                          for start, stop in self._chunks(x.shape[-1])],
+                        streaming_stft.flush(),
+                    ], axis=-2)
+                    tc.assert_equal(X, stft(x, pad=pad, **kwargs))
+
+    def test_streaming_stft_shift_larger_than_window_length(self):
+        for num_samples in [50, 3000]:
+            x = np.random.normal(size=(2, num_samples))
+            for pad in [True, False]:
+                for size, shift, window_length in [
+                    (16, 16, 12), (64, 100, 40), (151, 67, 30),
+                ]:
+                    kwargs = dict(
+                        size=size, shift=shift, window_length=window_length,
+                        fading=None, pad=pad,
+                    )
+                    # Many short chunks, that fall into the gaps between the
+                    # frames.
+                    for chunks in [
+                        [(i, i + 5) for i in range(0, num_samples, 5)],
+                        self._chunks(num_samples, 20),
+                    ]:
+                        streaming_stft = StreamingSTFT(**kwargs)
+                        X = np.concatenate([
+                            *[streaming_stft.push(x[..., start:stop])
+                              for start, stop in chunks],
+                            streaming_stft.flush(),
+                        ], axis=-2)
+                        tc.assert_equal(X, stft(x, **kwargs))
+
+                    # Fading needs overlapping frames, stft rejects it.
+                    for fading in ['full', 'half']:
+                        kwargs['fading'] = fading
+                        with self.assertRaises(ValueError):
+                            stft(x, **kwargs)
+                        with self.assertRaises(ValueError):
+                            StreamingSTFT(**kwargs)
+
+    def test_streaming_istft_equals_istft(self):
+        x = np.random.normal(size=(2, 3000))
+        for fading in ['full', 'half', None]:
+            for size, shift, window_length in [
+                (512, 128, None), (512, 160, 400), (151, 67, None),
+            ]:
+                kwargs = dict(
+                    size=size, shift=shift, window_length=window_length,
+                    fading=fading,
+                )
+                X = stft(x, **kwargs)
+                streaming_istft = StreamingISTFT(**kwargs)
+                x_hat = np.concatenate([
+                    *[streaming_istft.push(X[..., start:stop, :])
+                      for start, stop in self._chunks(X.shape[-2])],
+                    streaming_istft.flush(),
+                ], axis=-1)
+                tc.assert_equal(x_hat, istft(X, **kwargs))
+
+    def test_streaming_from_stft_module(self):
+        x = np.random.normal(size=(1000,))
+        stft_module = STFT(shift=160, size=512, window_length=400)
+        streaming_stft = stft_module.streaming()
+        X = np.concatenate(
+            [streaming_stft.push(x[:500]), streaming_stft.push(x[500:]),
+             streaming_stft.flush()],
+        )
+        tc.assert_equal(X, stft_module(x))
+
+        streaming_istft = stft_module.streaming_inverse()
+        x_hat = np.concatenate(
+            [streaming_istft.push(X[:3]), streaming_istft.push(X[3:]),
+             streaming_istft.flush()],
+        )
+        tc.assert_equal(x_hat, stft_module.inverse(X))
+
+
+class TestOverlapAdd(unittest.TestCase):
+    def test_overlap_add_equals_add_at(self):
+        from paderbox.array import segment_axis
+        from paderbox.transform.module_stft import _overlap_add
+
+        for shape, shift in [
+            ((3, 20, 512), 128),  # integer ratio
+            ((2, 2, 20, 400), 160),  # non-integer ratio
+            ((7, 151), 67),
+            ((4, 64), 64),  # no overlap
+            ((0, 64), 16),  # no frames
+        ]:
+            frames = np.random.normal(size=shape)
+            *independent, num_frames, window_length = shape
+            expected = np.zeros(
+                (*independent, num_frames * shift + window_length - shift))
+            np.add.at(
+                segment_axis(expected, window_length, shift, end=None),
+                ...,
+                frames,
+            )
+            actual = _overlap_add(frames, shift, np.zeros_like(expected))
+            tc.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+class TestBlockwiseSTFT(unittest.TestCase):
+    def test_blockwise_stft_equals_stft(self):
+        x = np.random.normal(size=(2, 3, 2000))
+        for axis in [-1, 1, 0]:
+            x_ = np.moveaxis(x, -1, axis)
+            for max_frames_per_block in [1, 7, 1000]:
+                for kwargs in [
+                    dict(size=512, shift=128),
+                    dict(size=512, shift=160, window_length=400,
+                         fading=None, pad=False),
+                ]:
+                    tc.assert_equal(
+                        stft(x_, axis=axis,
+                             max_frames_per_block=max_frames_per_block,
+                             **kwargs),
+                        stft(x_, axis=axis, **kwargs),
+                    )
+
+    def test_blockwise_stft_without_frames(self):
+        x = np.random.normal(size=(2, 400))
+        tc.assert_equal(
+            stft(x, 512, 128, fading=None, pad=False, max_frames_per_block=4),
+            stft(x, 512, 128, fading=None, pad=False),
+        )
+
+
+class TestSinglePrecisionSTFT(unittest.TestCase):
+    def test_float32_roundtrip(self):
+        from paderbox.transform import fft_backend
+
+        x = np.random.uniform(-1, 1, size=(2, 4000)).astype(np.float32)
+        for backend in ['numpy', 'scipy']:
+            with fft_backend(backend):
+                for max_frames_per_block in [None, 5]:
+                    X = stft(x, 512, 128, dtype=np.float32,
+                             max_frames_per_block=max_frames_per_block)
+                    assert X.dtype == np.complex64, X.dtype
+                    tc.assert_allclose(X, stft(x, 512, 128), atol=1e-4)
+                    assert stft_to_spectrogram(X).dtype == np.float32
+
+                    x_hat = istft(X, 512, 128, dtype=np.float32,
+                                  num_samples=x.shape[-1])
+                    assert x_hat.dtype == np.float32, x_hat.dtype
+                    tc.assert_allclose(x_hat, x, atol=1e-5)
+
+    def test_default_dtype_is_unchanged(self):
+        x = np.random.uniform(-1, 1, size=(4000,)).astype(np.float32)
+        X = stft(x, 512, 128)
+        assert X.dtype == np.complex128, X.dtype
+        assert istft(X.astype(np.complex64), 512, 128).dtype == np.float64
+
+    def test_float32_stft_module(self):
+        x = np.random.uniform(-1, 1, size=(4000,)).astype(np.float32)
+        stft_module = STFT(128, 512, dtype=np.float32)
+        X = stft_module(x)
+        assert X.dtype == np.complex64, X.dtype
+        assert stft_module.inverse(X).dtype == np.float32
+
+        streaming_stft = stft_module.streaming()
+        X_streaming = np.concatenate(
+            [streaming_stft.push(x[:1000]), streaming_stft.push(x[1000:]),
+             streaming_stft.flush()])
+        tc.assert_equal(X_streaming, X)
+
+        streaming_istft = stft_module.streaming_inverse()
+        x_streaming = np.concatenate(
+            [streaming_istft.push(X[:10]), streaming_istft.push(X[10:]),
+             streaming_istft.flush()])
+        tc.assert_equal(x_streaming, stft_module.inverse(X))
+
+
+class TestBatchSTFT(unittest.TestCase):
+    def test_stft_batch_equals_stft(self):
+        lengths = [3000, 100, 1201, 512, 2047]
+        signals = [np.random.normal(size=(2, n)) for n in lengths]
+        for kwargs in [
+            dict(size=512, shift=128),
+            dict(size=512, shift=128, fading='half'),
+            dict(size=512, shift=160, window_length=400, fading=None),
+        ]:
+            X, frames = stft_batch(signals, **kwargs)
+            for i, s in enumerate(signals):
+                X_ref = stft(s, **kwargs)
+                tc.assert_equal(frames[i], X_ref.shape[-2])
+                # stft yields at least one frame, when it pads
+                tc.assert_equal(frames[i], max(_samples_to_stft_frames(
+                    s.shape[-1], kwargs.get('window_length', 512),
+                    kwargs['shift'], fading=kwargs.get('fading', 'full'),
+                ), 1))
+                tc.assert_equal(X[i, :, :frames[i]], X_ref)
+                tc.assert_equal(X[i, :, frames[i]:], 0)
+
+            for X_, s in zip(
+                    stft_batch(signals, return_list=True, **kwargs), signals
+            ):
+                tc.assert_equal(X_, stft(s, **kwargs))
+
+    def test_istft_batch_equals_istft(self):
+        lengths = [3000, 1201, 512, 2047]
+        signals = [np.random.normal(size=(2, n)) for n in lengths]
+        for kwargs in [
+            dict(size=512, shift=128),
+            dict(size=512, shift=160, window_length=400, fading='half'),
+        ]:
+            stft_signals = [stft(s, **kwargs) for s in signals]
+            x_hat = istft_batch(stft_signals, **kwargs)
+            for x_, X_ in zip(x_hat, stft_signals):
+                tc.assert_allclose(x_, istft(X_, **kwargs), atol=1e-10)
+
+            X, frames = stft_batch(signals, **kwargs)
+            x_hat = istft_batch(
+                X, frames=frames, num_samples=lengths, **kwargs)
+            for x_, s in zip(x_hat, signals):
+                tc.assert_allclose(
+                    x_, istft(stft(s, **kwargs), **kwargs)[..., :s.shape[-1]],
+                    atol=1e-10,
+                )
+
+
+class TestOutOfCoreSTFT(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stft_to_npy_from_memmap(self):
+        x = np.random.normal(size=(3, 20000))
+        memmap = np.lib.format.open_memmap(
+            self.tmp / 'x.npy', mode='w+', dtype=x.dtype, shape=x.shape)
+        memmap[...] = x
+        for kwargs in [
+            dict(size=512, shift=128),
+            dict(size=512, shift=160, window_length=400, fading='half'),
+            dict(size=256, shift=64, fading=None, pad=False),
+            dict(size=256, shift=300, window_length=200, fading=None),
+            dict(size=256, shift=300, window_length=200, fading=None,
+                 pad=False),
+        ]:
+            # block_size is not a multiple of shift to test the stitching
+            shape = stft_to_file(
+                memmap, self.tmp / 'X.npy', block_size=1001, **kwargs)
+            X = np.load(self.tmp / 'X.npy', mmap_mode='r')
+            tc.assert_equal(shape, X.shape)
+            tc.assert_equal(X, stft(x, **kwargs))
+
+    def test_stft_to_hdf5_from_audio_file(self):
+        from paderbox.io import dump_audio
+        x = np.random.uniform(-0.5, 0.5, size=(2, 20000))
+        dump_audio(
+            x, self.tmp / 'x.wav', dtype=np.float64, normalize=False)
+
+        stft_to_file(
+            self.tmp / 'x.wav', self.tmp / 'X.h5', size=512, shift=128,
+            block_size=777, dataset='foo',
+        )
+        import h5py
+        with h5py.File(self.tmp / 'X.h5', 'r') as f:
+            tc.assert_equal(f['foo'][...], stft(x, size=512, shift=128))
+
+        # Overwrites an existing dataset
+        STFT(shift=128, size=256).transform_file(
+            self.tmp / 'x.wav', self.tmp / 'X.h5', dataset='foo')
+        with h5py.File(self.tmp / 'X.h5', 'r') as f:
+            tc.assert_equal(f['foo'][...], stft(x, size=256, shift=128))
+
+    def test_istft_to_file(self):
+        x = np.random.uniform(-0.5, 0.5, size=(2, 20000))
+        stft_ = STFT(shift=160, size=512, window_length=400)
+        stft_.transform_file(x, self.tmp / 'X.h5')
+        for block_frames in [1, 7, 4096]:
+            num_samples = stft_.inverse_file(
+                self.tmp / 'X.h5', self.tmp / 'x.wav',
+                num_samples=x.shape[-1], block_frames=block_frames,
+                audio_dtype=np.float64,
+            )
+            tc.assert_equal(num_samples, x.shape[-1])
+            tc.assert_allclose(
+                load_audio(self.tmp / 'x.wav'), x, atol=1e-10)
+
+        # Without num_samples, the result is identical to istft
+        X = stft_(x)
+        istft_to_file(
+            X[0], self.tmp / 'x.wav', size=512, shift=160,
+            window_length=400, block_frames=10, audio_dtype=np.float64,
+        )
+        tc.assert_equal(
+            load_audio(self.tmp / 'x.wav'), stft_.inverse(X[0]))
+
+
+class TestMultiResolutionSTFT(unittest.TestCase):
+    configs = [(512, 128), (1024, 256), (2048, 512), (512, 160, 400)]
+
+    def test_equals_stft(self):
+        for shape in [(2, 16000), (3, 1, 900), (100,)]:
+            x = np.random.normal(size=shape)
+            for kwargs in [
+                dict(),
+                dict(fading='half'),
+                dict(fading=None, pad=False),
+                dict(window='hann', dtype=np.float32),
+                dict(max_frames_per_block=7),
+            ]:
+                if shape[-1] < 2048 and kwargs.get('pad') is False:
+                    # stft can not cut a signal shorter than the window
+                    continue
+                X = multi_resolution_stft(x, self.configs, **kwargs)
+                tc.assert_equal(list(X.keys()), self.configs)
+                for config in self.configs:
+                    size, shift, window_length = (*config, config[0])[:3]
+                    X_ref = stft(
+                        x, size, shift, window_length=window_length,
+                        **kwargs,
+                    )
+                    tc.assert_equal(X[config].dtype, X_ref.dtype)
+                    tc.assert_equal(X[config], X_ref)
+
+    def test_invalid_config(self):
+        with self.assertRaises(AssertionError):
+            multi_resolution_stft(np.zeros(1000), [(512,)])